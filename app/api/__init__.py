@@ -1,3 +1,4 @@
 from app.api.tasks import router as tasks_router
+from app.api.standup import router as standup_router
 
-__all__ = ["tasks_router"]
+__all__ = ["tasks_router", "standup_router"]
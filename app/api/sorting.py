@@ -0,0 +1,120 @@
+import base64
+import json
+from collections.abc import Mapping
+from datetime import datetime
+from enum import Enum
+from typing import Any, List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import and_, false, or_
+
+
+# Public sort names mapped to stored columns
+SORT_FIELDS = {
+    "priority": "priority_rank",
+    "due_date": "due_date",
+    "created_at": "created_at",
+    "updated_at": "updated_at",
+    "title": "title",
+    "status": "status",
+    "id": "id",
+}
+
+DATETIME_FIELDS = {"due_date", "created_at", "updated_at"}
+
+SortKeys = List[Tuple[str, bool]]
+
+
+def parse_sort(sort: Optional[str]) -> SortKeys:
+    """Parse ``-priority,due_date`` into (column, descending) pairs.
+
+    ``id`` is always appended as a tiebreaker so the order is total, which
+    keyset pagination relies on.
+    """
+    keys = []
+    for part in (sort or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name = part.lstrip("+-")
+        if name not in SORT_FIELDS:
+            raise HTTPException(status_code=400, detail=f"Invalid sort field: {name}")
+        keys.append((SORT_FIELDS[name], part.startswith("-")))
+
+    if not any(column == "id" for column, _ in keys):
+        keys.append(("id", False))
+    return keys
+
+
+def apply_sort(statement, columns, keys: SortKeys, cursor: Optional[str] = None):
+    """Add ORDER BY (and the keyset predicate for ``cursor``) to a statement"""
+    if cursor:
+        values = decode_cursor(cursor, keys)
+        statement = statement.where(_keyset_after(columns, keys, values))
+
+    return statement.order_by(*[
+        columns[name].desc() if descending else columns[name].asc()
+        for name, descending in keys
+    ])
+
+
+def encode_cursor(row: Any, keys: SortKeys) -> str:
+    """Build an opaque cursor pointing just after ``row``"""
+    values = []
+    for name, _ in keys:
+        value = row[name] if isinstance(row, Mapping) else getattr(row, name)
+        if isinstance(value, Enum):
+            value = value.value
+        elif isinstance(value, datetime):
+            value = value.isoformat()
+        values.append(value)
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def decode_cursor(cursor: str, keys: SortKeys) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise ValueError("cursor does not match sort")
+        return [
+            datetime.fromisoformat(value) if name in DATETIME_FIELDS and value is not None else value
+            for (name, _), value in zip(keys, values)
+        ]
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _keyset_after(columns, keys: SortKeys, values: list):
+    """Rows strictly after ``values`` in the given order.
+
+    Follows SQLite's NULL ordering (NULLs sort first ascending, last
+    descending). The first key also gets a plain range bound so the index
+    can seek to the cursor position instead of filtering from the start.
+    """
+    clause = None
+    for (name, descending), value in reversed(list(zip(keys, values))):
+        column = columns[name]
+        after = _column_after(column, descending, value)
+        if clause is not None:
+            equal = column.is_(None) if value is None else column == value
+            after = or_(after, and_(equal, clause))
+        clause = after
+
+    first_name, first_descending = keys[0]
+    first_column, first_value = columns[first_name], values[0]
+    if first_value is not None and not getattr(first_column, "nullable", True):
+        seek = first_column <= first_value if first_descending else first_column >= first_value
+        clause = and_(seek, clause)
+    return clause
+
+
+def _column_after(column, descending: bool, value):
+    if descending:
+        if value is None:
+            return false()
+        if not getattr(column, "nullable", True):
+            return column < value
+        return or_(column < value, column.is_(None))
+    if value is None:
+        return column.is_not(None)
+    return column > value
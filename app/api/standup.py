@@ -0,0 +1,32 @@
+from datetime import date, datetime, timezone
+
+from fastapi import APIRouter, Depends, Query
+from sqlmodel import Session
+
+from app.database import get_session, standup_tasks
+from app.skills import StandupReporterSkill
+
+
+router = APIRouter(prefix="/standup", tags=["standup"])
+
+
+@router.get("")
+def get_standup(
+    date: date | None = Query(None, description="Report date (YYYY-MM-DD, UTC); defaults to today"),
+    limit: int = Query(50, ge=1, le=500, description="Maximum titles listed per section"),
+    session: Session = Depends(get_session)
+):
+    """Generate a standup report from tasks changed in the reporting window"""
+    report_date = date or datetime.now(timezone.utc).date()
+    tasks = standup_tasks(session, report_date, limit)
+
+    result = StandupReporterSkill().generate_from_task_groups(
+        tasks["completed"], tasks["in_progress"], tasks["blocked"],
+        report_date=report_date, counts=tasks["counts"]
+    )
+    return {
+        **result,
+        "completed": tasks["completed"],
+        "in_progress": tasks["in_progress"],
+        "blocked": tasks["blocked"],
+    }
@@ -1,20 +1,76 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import delete, or_, union_all
 from sqlmodel import Session, select
-from typing import List
+from typing import List, Optional
 from datetime import datetime, timezone
 
-from app.models import Task, TaskCreate, TaskUpdate, TaskRead, TaskStatus, TaskPriority
-from app.database import get_session
+from app.models import (
+    Task, TaskArchive, TaskDependency, TaskDependencyCreate, TaskCreate, TaskUpdate, TaskRead,
+    PrioritizedTaskRead, TaskStatus, TaskPriority
+)
+from app.database import (
+    get_session, get_write_batcher, WriteBatcher, archived_columns, top_prioritized_tasks
+)
+from app.api.sorting import SortKeys, apply_sort, encode_cursor, parse_sort
+from app.skills import TaskPrioritizerSkill
 
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
 
-@router.post("/", response_model=TaskRead, status_code=201)
-def create_task(task: TaskCreate, session: Session = Depends(get_session)):
-    """Create a new task"""
+def _create_task(session: Session, task: TaskCreate) -> Task:
     db_task = Task.model_validate(task)
     session.add(db_task)
+    return db_task
+
+
+def _update_task(session: Session, task_id: int, task_update: TaskUpdate) -> Task:
+    db_task = session.get(Task, task_id)
+    if not db_task:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    task_data = task_update.model_dump(exclude_unset=True)
+    for key, value in task_data.items():
+        setattr(db_task, key, value)
+
+    db_task.updated_at = datetime.now(timezone.utc)
+    session.add(db_task)
+    return db_task
+
+
+def _delete_task(session: Session, task_id: int) -> None:
+    task = session.get(Task, task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    session.exec(delete(TaskDependency).where(
+        or_(TaskDependency.task_id == task_id, TaskDependency.depends_on_id == task_id)
+    ))
+    session.delete(task)
+
+
+def _creates_cycle(session: Session, task_id: int, depends_on_id: int) -> bool:
+    """Whether ``depends_on_id`` already depends on ``task_id``, directly or transitively"""
+    reachable = select(TaskDependency.depends_on_id.label("id")).where(
+        TaskDependency.task_id == depends_on_id
+    ).cte("reachable", recursive=True)
+    reachable = reachable.union(
+        select(TaskDependency.depends_on_id).join(reachable, TaskDependency.task_id == reachable.c.id)
+    )
+    return session.exec(select(reachable.c.id).where(reachable.c.id == task_id).limit(1)).first() is not None
+
+
+@router.post("/", response_model=TaskRead, status_code=201)
+def create_task(
+    task: TaskCreate,
+    session: Session = Depends(get_session),
+    batcher: Optional[WriteBatcher] = Depends(get_write_batcher)
+):
+    """Create a new task"""
+    if batcher:
+        return batcher.submit(lambda s: _create_task(s, task))
+
+    db_task = _create_task(session, task)
     session.commit()
     session.refresh(db_task)
     return db_task
@@ -22,29 +78,132 @@ def create_task(task: TaskCreate, session: Session = Depends(get_session)):
 
 @router.get("/", response_model=List[TaskRead])
 def get_tasks(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     status: TaskStatus | None = None,
     priority: TaskPriority | None = None,
+    include_archived: bool = False,
+    sort: str | None = Query(None, description="Comma-separated fields, '-' for descending, e.g. -priority,due_date"),
+    cursor: str | None = Query(None, description="Keyset cursor from the X-Next-Cursor header"),
+    session: Session = Depends(get_session)
+):
+    """Get all tasks with optional filtering, sorting and keyset pagination"""
+    keys = parse_sort(sort) if sort or cursor or include_archived else None
+
+    if include_archived:
+        tasks = _get_tasks_with_archive(session, skip, limit, status, priority, keys, cursor)
+    else:
+        statement = select(Task)
+
+        if status:
+            statement = statement.where(Task.status == status)
+        if priority:
+            statement = statement.where(Task.priority == priority)
+        if keys:
+            statement = apply_sort(statement, Task.__table__.c, keys, cursor)
+
+        statement = statement.offset(skip).limit(limit)
+        tasks = session.exec(statement).all()
+
+    if keys and len(tasks) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(tasks[-1], keys)
+    return tasks
+
+
+def _get_tasks_with_archive(
+    session: Session,
+    skip: int,
+    limit: int,
+    status: TaskStatus | None,
+    priority: TaskPriority | None,
+    keys: SortKeys,
+    cursor: str | None
+):
+    """Query the hot and archive tables as one result set"""
+    parts = []
+    for model in (Task, TaskArchive):
+        statement = select(*archived_columns(model))
+        if status:
+            statement = statement.where(model.status == status)
+        if priority:
+            statement = statement.where(model.priority == priority)
+        parts.append(statement)
+
+    combined = union_all(*parts).subquery()
+    statement = apply_sort(select(*combined.c), combined.c, keys, cursor)
+    statement = statement.offset(skip).limit(limit)
+    return session.exec(statement).mappings().all()
+
+
+@router.get("/prioritized", response_model=List[PrioritizedTaskRead])
+def get_prioritized_tasks(
+    limit: int = Query(10, ge=1, le=100),
+    status: TaskStatus | None = None,
     session: Session = Depends(get_session)
 ):
-    """Get all tasks with optional filtering"""
-    statement = select(Task)
+    """Get the top tasks ranked by the prioritizer's score, computed in SQL.
+
+    The status filter can use the status index; ordering by the score
+    expression with a LIMIT lets the database keep only the top N rows.
+    """
+    score = TaskPrioritizerSkill().sql_priority_score(
+        Task.priority, Task.status, Task.due_date, Task.tags, Task.description
+    ).label("priority_score")
 
+    statement = select(Task, score)
     if status:
         statement = statement.where(Task.status == status)
-    if priority:
-        statement = statement.where(Task.priority == priority)
+    statement = statement.order_by(score.desc(), Task.id).limit(limit)
 
-    statement = statement.offset(skip).limit(limit)
-    tasks = session.exec(statement).all()
-    return tasks
+    return [
+        PrioritizedTaskRead.model_validate({**task.model_dump(), "priority_score": task_score})
+        for task, task_score in session.exec(statement).all()
+    ]
+
+
+@router.get("/suggested", response_model=List[PrioritizedTaskRead])
+def get_suggested_tasks(
+    max_tasks: int = Query(5, ge=1, le=100),
+    session: Session = Depends(get_session)
+):
+    """Suggest the open tasks to focus on next.
+
+    Reads the incrementally maintained priority index: only tasks whose
+    urgency bucket changed since the last call are re-scored, then the top
+    entries are read in index order.
+    """
+    return [
+        PrioritizedTaskRead.model_validate({**task.model_dump(), "priority_score": score})
+        for task, score in top_prioritized_tasks(session, max_tasks)
+    ]
+
+
+@router.get("/schedule")
+def get_schedule(session: Session = Depends(get_session)):
+    """Schedule open tasks around their dependencies.
+
+    Returns a topological order with critical path timings and slack, and
+    reports dependency cycles. Dependencies on closed tasks are satisfied.
+    """
+    tasks = session.exec(
+        select(Task).where(Task.status.in_((TaskStatus.TODO, TaskStatus.IN_PROGRESS))).order_by(Task.id)
+    ).all()
+    dependencies = session.exec(select(TaskDependency.task_id, TaskDependency.depends_on_id)).all()
+
+    return TaskPrioritizerSkill().schedule_tasks([task.model_dump() for task in tasks], dependencies)
 
 
 @router.get("/{task_id}", response_model=TaskRead)
-def get_task(task_id: int, session: Session = Depends(get_session)):
+def get_task(
+    task_id: int,
+    include_archived: bool = False,
+    session: Session = Depends(get_session)
+):
     """Get a specific task by ID"""
     task = session.get(Task, task_id)
+    if not task and include_archived:
+        task = session.get(TaskArchive, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     return task
@@ -54,31 +213,83 @@ def get_task(task_id: int, session: Session = Depends(get_session)):
 def update_task(
     task_id: int,
     task_update: TaskUpdate,
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_session),
+    batcher: Optional[WriteBatcher] = Depends(get_write_batcher)
 ):
     """Update a task"""
-    db_task = session.get(Task, task_id)
-    if not db_task:
-        raise HTTPException(status_code=404, detail="Task not found")
-
-    task_data = task_update.model_dump(exclude_unset=True)
-    for key, value in task_data.items():
-        setattr(db_task, key, value)
+    if batcher:
+        return batcher.submit(lambda s: _update_task(s, task_id, task_update))
 
-    db_task.updated_at = datetime.now(timezone.utc)
-    session.add(db_task)
+    db_task = _update_task(session, task_id, task_update)
     session.commit()
     session.refresh(db_task)
     return db_task
 
 
 @router.delete("/{task_id}", status_code=204)
-def delete_task(task_id: int, session: Session = Depends(get_session)):
+def delete_task(
+    task_id: int,
+    session: Session = Depends(get_session),
+    batcher: Optional[WriteBatcher] = Depends(get_write_batcher)
+):
     """Delete a task"""
-    task = session.get(Task, task_id)
-    if not task:
+    if batcher:
+        batcher.submit(lambda s: _delete_task(s, task_id))
+        return None
+
+    _delete_task(session, task_id)
+    session.commit()
+    return None
+
+
+@router.get("/{task_id}/dependencies", response_model=List[TaskRead])
+def get_task_dependencies(task_id: int, session: Session = Depends(get_session)):
+    """Get the tasks a task depends on"""
+    if not session.get(Task, task_id):
         raise HTTPException(status_code=404, detail="Task not found")
 
-    session.delete(task)
+    statement = (
+        select(Task)
+        .join(TaskDependency, TaskDependency.depends_on_id == Task.id)
+        .where(TaskDependency.task_id == task_id)
+        .order_by(Task.id)
+    )
+    return session.exec(statement).all()
+
+
+@router.post("/{task_id}/dependencies", response_model=List[TaskRead], status_code=201)
+def add_task_dependency(
+    task_id: int,
+    dependency: TaskDependencyCreate,
+    session: Session = Depends(get_session)
+):
+    """Make a task depend on another task"""
+    depends_on_id = dependency.depends_on_id
+    if not session.get(Task, task_id) or not session.get(Task, depends_on_id):
+        raise HTTPException(status_code=404, detail="Task not found")
+    if task_id == depends_on_id:
+        raise HTTPException(status_code=400, detail="A task cannot depend on itself")
+    if session.get(TaskDependency, (task_id, depends_on_id)):
+        raise HTTPException(status_code=409, detail="Dependency already exists")
+    if _creates_cycle(session, task_id, depends_on_id):
+        raise HTTPException(status_code=409, detail="Dependency would create a cycle")
+
+    session.add(TaskDependency(task_id=task_id, depends_on_id=depends_on_id))
+    session.commit()
+    return get_task_dependencies(task_id, session)
+
+
+@router.delete("/{task_id}/dependencies/{depends_on_id}", status_code=204)
+def remove_task_dependency(
+    task_id: int,
+    depends_on_id: int,
+    session: Session = Depends(get_session)
+):
+    """Remove a dependency between two tasks"""
+    dependency = session.get(TaskDependency, (task_id, depends_on_id))
+    if not dependency:
+        raise HTTPException(status_code=404, detail="Dependency not found")
+
+    session.delete(dependency)
     session.commit()
     return None
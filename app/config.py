@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Dict, List
 
 
 class Settings(BaseSettings):
@@ -12,6 +12,31 @@ class Settings(BaseSettings):
     cors_allow_methods: List[str] = ["GET", "POST", "PUT", "DELETE", "OPTIONS"]
     cors_allow_headers: List[str] = ["*"]
 
+    # Write batching (group commit) settings
+    write_batching_enabled: bool = False
+    write_batch_max_latency_ms: float = 5.0
+    write_batch_max_size: int = 64
+
+    # Admission control settings
+    admission_control_enabled: bool = False
+    admission_read_limit: int = 64
+    admission_write_limit: int = 16
+    admission_queue_size: int = 100
+    admission_queue_timeout_ms: float = 1000.0
+    admission_retry_after_seconds: int = 1
+    admission_route_limits: Dict[str, int] = {}
+    admission_exempt_paths: List[str] = ["/health", "/docs", "/openapi.json"]
+
+    # Archival of completed/cancelled tasks
+    archive_enabled: bool = False
+    archive_after_days: int = 30
+    archive_batch_size: int = 500
+    archive_interval_seconds: float = 3600.0
+
+    # Workload capture for the index advisor
+    workload_capture_enabled: bool = False
+    workload_max_fingerprints: int = 1000
+
     class Config:
         env_file = ".env"
         case_sensitive = False
@@ -1,3 +1,38 @@
 from app.database.connection import engine, create_db_and_tables, get_session
+from app.database.batching import WriteBatcher, write_batcher, get_write_batcher
+from app.database.archive import TaskArchiver, task_archiver, archive_closed_tasks, archived_columns
+from app.database.priority_index import (
+    ensure_priority_index,
+    rebuild_priority_index,
+    refresh_priority_index,
+    top_prioritized_tasks,
+)
+from app.database.standup import standup_tasks
+from app.database.workload import (
+    WorkloadRecorder,
+    fingerprint,
+    get_workload_recorder,
+    workload_recorder,
+)
 
-__all__ = ["engine", "create_db_and_tables", "get_session"]
+__all__ = [
+    "engine",
+    "create_db_and_tables",
+    "get_session",
+    "WriteBatcher",
+    "write_batcher",
+    "get_write_batcher",
+    "TaskArchiver",
+    "task_archiver",
+    "archive_closed_tasks",
+    "archived_columns",
+    "ensure_priority_index",
+    "rebuild_priority_index",
+    "refresh_priority_index",
+    "top_prioritized_tasks",
+    "standup_tasks",
+    "WorkloadRecorder",
+    "fingerprint",
+    "get_workload_recorder",
+    "workload_recorder",
+]
@@ -0,0 +1,130 @@
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import delete, insert, literal, or_
+from sqlmodel import Session, select
+
+from app.config import settings
+from app.database.connection import engine
+from app.models import Task, TaskArchive, TaskDependency, TaskStatus
+
+
+logger = logging.getLogger(__name__)
+
+CLOSED_STATUSES = (TaskStatus.COMPLETED, TaskStatus.CANCELLED)
+
+
+def archived_columns(model) -> list:
+    """Columns shared by the hot and archive tables, in a stable order"""
+    return [model.__table__.c[name] for name in Task.__table__.c.keys()]
+
+
+def archive_closed_tasks(
+    session: Session,
+    older_than: timedelta,
+    batch_size: int = 500,
+    max_batches: Optional[int] = None,
+    now: Optional[datetime] = None
+) -> int:
+    """Move tasks closed for longer than ``older_than`` into the archive table.
+
+    Each batch is copied and deleted in its own transaction so writers are
+    never blocked for long. Returns the number of archived tasks.
+    """
+    cutoff = (now or datetime.now(timezone.utc)) - older_than
+    archived_at = now or datetime.now(timezone.utc)
+    columns = archived_columns(Task)
+    total = 0
+    batches = 0
+
+    while max_batches is None or batches < max_batches:
+        ids = session.exec(
+            select(Task.id)
+            .where(Task.status.in_(CLOSED_STATUSES), Task.updated_at < cutoff)
+            .order_by(Task.id)
+            .limit(batch_size)
+        ).all()
+        if not ids:
+            break
+
+        session.exec(
+            insert(TaskArchive).from_select(
+                [c.name for c in columns] + ["archived_at"],
+                select(*columns, literal(archived_at)).where(Task.id.in_(ids))
+            )
+        )
+        session.exec(delete(TaskDependency).where(
+            or_(TaskDependency.task_id.in_(ids), TaskDependency.depends_on_id.in_(ids))
+        ))
+        session.exec(delete(Task).where(Task.id.in_(ids)))
+        session.commit()
+
+        total += len(ids)
+        batches += 1
+        if len(ids) < batch_size:
+            break
+
+    return total
+
+
+class TaskArchiver:
+    """Background thread that periodically archives closed tasks"""
+
+    def __init__(
+        self,
+        bind,
+        older_than: timedelta,
+        batch_size: int = 500,
+        interval_seconds: float = 3600.0
+    ):
+        self.bind = bind
+        self.older_than = older_than
+        self.batch_size = batch_size
+        self.interval = interval_seconds
+        self.last_run_archived = 0
+        self.total_archived = 0
+        # Most recent failure of a background run, kept for inspection
+        self.last_error: Optional[BaseException] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def run_once(self) -> int:
+        """Archive everything currently eligible"""
+        with Session(self.bind) as session:
+            archived = archive_closed_tasks(session, self.older_than, self.batch_size)
+        self.last_run_archived = archived
+        self.total_archived += archived
+        return archived
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="task-archiver", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                self.last_error = e
+                logger.exception("Archiving closed tasks failed")
+            self._stop.wait(self.interval)
+
+
+task_archiver = TaskArchiver(
+    engine,
+    older_than=timedelta(days=settings.archive_after_days),
+    batch_size=settings.archive_batch_size,
+    interval_seconds=settings.archive_interval_seconds,
+)
@@ -0,0 +1,196 @@
+import logging
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlmodel import Session
+
+from app.config import settings
+from app.database.connection import engine
+
+
+logger = logging.getLogger(__name__)
+
+Operation = Callable[[Session], Any]
+
+
+class WriteBatcher:
+    """Coalesces concurrent write operations into group commits.
+
+    Callers submit an operation (a callable that receives a session) and block
+    until it has been committed. A background worker collects operations for at
+    most ``max_latency_ms`` or ``max_batch_size`` items and commits them in a
+    single transaction. Each caller receives its own result or exception.
+    """
+
+    def __init__(self, bind, max_latency_ms: float = 5.0, max_batch_size: int = 64):
+        self.bind = bind
+        self.max_latency = max_latency_ms / 1000.0
+        self.max_batch_size = max(1, max_batch_size)
+        self._queue: "queue.Queue[Optional[Tuple[Operation, Future]]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        # Held while starting or stopping the worker and while queueing, so
+        # nothing is queued behind the stop sentinel
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {"batches": 0, "operations": 0, "failed_operations": 0, "fallbacks": 0}
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the background commit worker"""
+        with self._lock:
+            if self.running:
+                return
+            self._thread = threading.Thread(target=self._worker, name="write-batcher", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Flush pending operations and stop the worker"""
+        with self._lock:
+            if not self.running:
+                return
+            self._queue.put(None)
+            self._thread.join(timeout)
+            self._thread = None
+
+    def submit(self, operation: Operation) -> Any:
+        """Queue an operation and wait for its committed result"""
+        future: Future = Future()
+        with self._lock:
+            queued = self.running
+            if queued:
+                self._queue.put((operation, future))
+        if not queued:
+            self._run_batch([(operation, future)])
+        return future.result()
+
+    def stats(self) -> Dict[str, int]:
+        """Return counters describing committed batches"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        return {**stats, "queue_depth": self._queue.qsize()}
+
+    def _count(self, **increments: int):
+        # The worker and inline submits update the counters concurrently
+        with self._stats_lock:
+            for name, value in increments.items():
+                self._stats[name] += value
+
+    def _worker(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is None:
+                break
+
+            batch = [item]
+            deadline = time.monotonic() + self.max_latency
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            try:
+                self._run_batch(batch)
+            except BaseException:
+                # The batch's callers have their errors; keep serving the rest
+                logger.exception("Write batch aborted")
+
+    def _run_batch(self, batch: List[Tuple[Operation, Future]]):
+        """Commit a batch in one transaction.
+
+        An operation that raises is reported to its caller and dropped, and the
+        rest of the batch is replayed, so the outcome matches running the
+        surviving operations one after another. Anything else that escapes
+        (a ``BaseException`` such as ``KeyboardInterrupt``) fails every future
+        still unresolved before it propagates.
+        """
+        try:
+            self._commit_batch(batch)
+        finally:
+            unresolved = [future for _, future in batch if not future.done()]
+            if unresolved:
+                cause = sys.exc_info()[1]
+                self._count(failed_operations=len(unresolved))
+                for future in unresolved:
+                    error = RuntimeError("Write batch aborted before the operation completed")
+                    error.__cause__ = cause
+                    future.set_exception(error)
+
+    def _commit_batch(self, batch: List[Tuple[Operation, Future]]):
+        pending = list(batch)
+
+        while pending:
+            results = []
+            failed_index = None
+            failure = None
+
+            with Session(self.bind, expire_on_commit=False) as session:
+                for index, (operation, _) in enumerate(pending):
+                    try:
+                        results.append(operation(session))
+                        session.flush()
+                    except Exception as e:
+                        failed_index, failure = index, e
+                        break
+
+                if failed_index is None:
+                    try:
+                        session.commit()
+                    except Exception:
+                        session.rollback()
+                        self._count(fallbacks=1)
+                        self._run_individually(pending)
+                        return
+                else:
+                    session.rollback()
+
+            if failed_index is None:
+                for (_, future), result in zip(pending, results):
+                    future.set_result(result)
+                self._count(batches=1, operations=len(pending))
+                return
+
+            pending[failed_index][1].set_exception(failure)
+            self._count(failed_operations=1)
+            del pending[failed_index]
+
+    def _run_individually(self, batch: List[Tuple[Operation, Future]]):
+        for operation, future in batch:
+            with Session(self.bind, expire_on_commit=False) as session:
+                try:
+                    result = operation(session)
+                    session.commit()
+                except Exception as e:
+                    session.rollback()
+                    self._count(failed_operations=1)
+                    future.set_exception(e)
+                else:
+                    self._count(batches=1, operations=1)
+                    future.set_result(result)
+
+
+write_batcher = WriteBatcher(
+    engine,
+    max_latency_ms=settings.write_batch_max_latency_ms,
+    max_batch_size=settings.write_batch_max_size,
+)
+
+
+def get_write_batcher() -> Optional[WriteBatcher]:
+    """Return the shared batcher when write batching is enabled"""
+    return write_batcher if settings.write_batching_enabled else None
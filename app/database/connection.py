@@ -1,12 +1,47 @@
+from typing import List, Optional, Tuple
+
 from sqlmodel import SQLModel, create_engine, Session
 from app.config import settings
+from app.models.task import PRIORITY_RANK, TaskPriority
 
 
 engine = create_engine(settings.database_url, echo=settings.debug_mode)
 
+# Enum columns store member names ('HIGH'), not values
+_RANK_BY_NAME = " ".join(f"WHEN '{priority.name}' THEN {rank}" for priority, rank in PRIORITY_RANK.items())
+
+# Columns added after the first release as (table, column, DDL, backfill
+# statement). create_all never alters an existing table, so databases
+# created before a column existed get it here
+ADDED_COLUMNS: List[Tuple[str, str, str, Optional[str]]] = [
+    (
+        "task", "priority_rank", f"INTEGER NOT NULL DEFAULT {PRIORITY_RANK[TaskPriority.MEDIUM]}",
+        f"UPDATE task SET priority_rank = CASE priority {_RANK_BY_NAME} ELSE priority_rank END",
+    ),
+    ("task", "effort_hours", "FLOAT DEFAULT NULL", None),
+]
+
+
+def create_db_and_tables(bind=None):
+    bind = bind or engine
+    SQLModel.metadata.create_all(bind)
+    with bind.begin() as connection:
+        migrate_schema(connection)
+
+
+def migrate_schema(connection):
+    """Bring tables created by an older schema up to date; safe to re-run"""
+    for table, column, ddl, backfill in ADDED_COLUMNS:
+        existing = {row[1] for row in connection.exec_driver_sql(f"PRAGMA table_info({table})")}
+        if existing and column not in existing:
+            connection.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}")
+            if backfill:
+                connection.exec_driver_sql(backfill)
 
-def create_db_and_tables():
-    SQLModel.metadata.create_all(engine)
+    # Nor does it add indexes to a table that already exists
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
 
 
 def get_session():
@@ -0,0 +1,132 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, event, func, insert, inspect, update
+from sqlmodel import Session, select
+
+from app.models import Task, TaskPriorityEntry, TaskStatus
+from app.models.scoring import next_urgency_transition, reference_clock, score_task
+
+
+OPEN_STATUSES = (TaskStatus.TODO, TaskStatus.IN_PROGRESS)
+
+_index_table = TaskPriorityEntry.__table__
+
+
+def _scoring_fields(task: Task) -> Dict:
+    # The database keeps due dates as naive wall-clock times; score them the
+    # same way here so index entries match scores of reloaded rows
+    due_date = task.due_date
+    if due_date is not None and due_date.tzinfo is not None:
+        due_date = due_date.replace(tzinfo=None)
+    return {
+        "priority": task.priority,
+        "status": task.status,
+        "due_date": due_date,
+        "tags": task.tags,
+        "description": task.description,
+    }
+
+
+def index_entry(task: Task, now: Optional[datetime] = None) -> Optional[Tuple[float, Optional[datetime]]]:
+    """(score, next_transition_at) for an open task, None for a closed one"""
+    if task.status not in OPEN_STATUSES:
+        return None
+    fields = _scoring_fields(task)
+    return score_task(fields, now), next_urgency_transition(fields["due_date"], now)
+
+
+SCORING_FIELDS = ("priority", "status", "due_date", "tags", "description")
+
+
+@event.listens_for(Task, "after_insert")
+def _index_new_task(mapper, connection, target: Task):
+    entry = index_entry(target)
+    if entry:
+        score, next_transition_at = entry
+        connection.execute(insert(_index_table).values(
+            task_id=target.id, score=score, next_transition_at=next_transition_at
+        ))
+
+
+@event.listens_for(Task, "after_update")
+def _reindex_task(mapper, connection, target: Task):
+    # Edits that leave every scoring field alone (a title, a timestamp)
+    # keep the existing entry
+    state = inspect(target)
+    if not any(state.attrs[field].history.has_changes() for field in SCORING_FIELDS):
+        return
+
+    entry = index_entry(target)
+    if entry is None:
+        connection.execute(delete(_index_table).where(_index_table.c.task_id == target.id))
+        return
+    score, next_transition_at = entry
+    updated = connection.execute(
+        update(_index_table)
+        .where(_index_table.c.task_id == target.id)
+        .values(score=score, next_transition_at=next_transition_at)
+    ).rowcount
+    if not updated:
+        connection.execute(insert(_index_table).values(
+            task_id=target.id, score=score, next_transition_at=next_transition_at
+        ))
+
+
+@event.listens_for(Task, "after_delete")
+def _unindex_task(mapper, connection, target: Task):
+    connection.execute(delete(_index_table).where(_index_table.c.task_id == target.id))
+
+
+def refresh_priority_index(session: Session, now: Optional[datetime] = None) -> int:
+    """Re-score only tasks whose urgency bucket boundary has passed"""
+    _, now_naive = reference_clock(now)
+    stale = session.exec(
+        select(Task)
+        .join(TaskPriorityEntry, TaskPriorityEntry.task_id == Task.id)
+        .where(TaskPriorityEntry.next_transition_at < now_naive)
+    ).all()
+
+    if not stale:
+        return 0
+
+    rows = []
+    for task in stale:
+        score, next_transition_at = index_entry(task, now)
+        rows.append({"task_id": task.id, "score": score, "next_transition_at": next_transition_at})
+    # Bulk UPDATE by primary key: one executemany for every stale entry
+    session.execute(update(TaskPriorityEntry), rows)
+    session.commit()
+    return len(rows)
+
+
+def top_prioritized_tasks(session: Session, k: int, now: Optional[datetime] = None) -> List[Tuple[Task, float]]:
+    """Top k open tasks by score, read from the index"""
+    refresh_priority_index(session, now)
+    statement = (
+        select(Task, TaskPriorityEntry.score)
+        .join(TaskPriorityEntry, TaskPriorityEntry.task_id == Task.id)
+        .order_by(TaskPriorityEntry.score.desc(), TaskPriorityEntry.task_id)
+        .limit(k)
+    )
+    return list(session.exec(statement).all())
+
+
+def rebuild_priority_index(session: Session, now: Optional[datetime] = None) -> int:
+    """Recompute the whole index from the task table"""
+    session.exec(delete(TaskPriorityEntry))
+    count = 0
+    for task in session.exec(select(Task).where(Task.status.in_(OPEN_STATUSES))):
+        score, next_transition_at = index_entry(task, now)
+        session.add(TaskPriorityEntry(task_id=task.id, score=score, next_transition_at=next_transition_at))
+        count += 1
+    session.commit()
+    return count
+
+
+def ensure_priority_index(session: Session) -> int:
+    """Build the index for databases created before it existed"""
+    indexed = session.exec(select(func.count()).select_from(TaskPriorityEntry)).one()
+    if indexed:
+        return 0
+    return rebuild_priority_index(session)
@@ -0,0 +1,54 @@
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, or_
+from sqlmodel import Session, select
+
+from app.models import Task, TaskArchive, TaskStatus
+
+
+OPEN_STATUSES = (TaskStatus.TODO, TaskStatus.IN_PROGRESS)
+
+
+def day_window(day: date):
+    """The [start, end) bounds of a UTC day, as stored in ``updated_at``"""
+    start = datetime.combine(day, time.min)
+    return start, start + timedelta(days=1)
+
+
+def standup_tasks(session: Session, day: date, limit: Optional[int] = 50) -> Dict[str, object]:
+    """Select the tasks a standup for ``day`` reports on.
+
+    Completed tasks come from the previous UTC day, read from the hot and
+    archive tables through their (status, updated_at) indexes, so only the
+    rows in the window are touched. In-progress and blocked tasks are the
+    current open work, reached through the status index. Title lists are
+    capped at ``limit``; counts are exact.
+    """
+    start, end = day_window(day - timedelta(days=1))
+
+    completed: List[str] = []
+    completed_count = 0
+    for model in (Task, TaskArchive):
+        window = (model.status == TaskStatus.COMPLETED, model.updated_at >= start, model.updated_at < end)
+        completed_count += session.exec(select(func.count()).select_from(model).where(*window)).one()
+        if limit is None or len(completed) < limit:
+            statement = select(model.title).where(*window).order_by(model.updated_at)
+            if limit is not None:
+                statement = statement.limit(limit - len(completed))
+            completed.extend(session.exec(statement).all())
+
+    blocked_filter = func.lower(Task.tags).contains("blocked")
+    groups = {
+        "in_progress": (Task.status == TaskStatus.IN_PROGRESS, or_(Task.tags.is_(None), ~blocked_filter)),
+        "blocked": (Task.status.in_(OPEN_STATUSES), blocked_filter),
+    }
+
+    result = {"completed": completed, "counts": {"completed": completed_count}}
+    for name, conditions in groups.items():
+        statement = select(Task.title).where(*conditions).order_by(Task.priority_rank.desc(), Task.id)
+        if limit is not None:
+            statement = statement.limit(limit)
+        result[name] = session.exec(statement).all()
+        result["counts"][name] = session.exec(select(func.count()).select_from(Task).where(*conditions)).one()
+    return result
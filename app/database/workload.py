@@ -0,0 +1,188 @@
+import json
+import re
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import event
+
+from app.config import settings
+from app.database.connection import engine
+from app.models.statements import statement_kind
+
+
+_COMMENT = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.?])-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?\b")
+_PARAMETER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_VALUES_ROWS = re.compile(r"\(\?\+\)(?:\s*,\s*\(\?\+\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+# SQLAlchemy emits the same text for every execution of a compiled
+# statement, so most lookups hit
+@lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> str:
+    """Statement with literals, parameter lists and whitespace normalized.
+
+    Statements that differ only in their values share a fingerprint, so
+    ``IN (?, ?)`` and ``IN (?, ?, ?)`` count as one query.
+    """
+    text = _COMMENT.sub(" ", statement)
+    text = _STRING.sub("?", text)
+    text = _NUMBER.sub("?", text)
+    text = _PARAMETER_LIST.sub("(?+)", text)
+    text = _VALUES_ROWS.sub("(?+)", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+class WorkloadRecorder:
+    """Records the statements an engine runs, grouped by fingerprint.
+
+    Each fingerprint keeps its execution count, cumulative and worst
+    latency, rows written, and the first statement and parameters seen so
+    the workload can be replayed, e.g. by the Database Optimizer Skill's
+    index advisor.
+    """
+
+    def __init__(self, bind, max_fingerprints: int = 1000):
+        self.bind = bind
+        self.max_fingerprints = max_fingerprints
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._dropped = 0
+        self._attached = False
+
+    @property
+    def attached(self) -> bool:
+        return self._attached
+
+    def attach(self):
+        """Start recording statements executed through the engine"""
+        if self._attached:
+            return
+        event.listen(self.bind, "before_cursor_execute", self._before_execute)
+        event.listen(self.bind, "after_cursor_execute", self._after_execute)
+        self._attached = True
+
+    def detach(self):
+        if not self._attached:
+            return
+        event.remove(self.bind, "before_cursor_execute", self._before_execute)
+        event.remove(self.bind, "after_cursor_execute", self._after_execute)
+        self._attached = False
+
+    def record(
+        self,
+        statement: str,
+        parameters: Any,
+        elapsed_ms: float,
+        executemany: bool = False,
+        rowcount: int = -1
+    ):
+        """Add one execution; ``executemany`` counts once per parameter set"""
+        key = fingerprint(statement)
+        executions = len(parameters) if executemany and parameters else 1
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if len(self._entries) >= self.max_fingerprints:
+                    self._dropped += executions
+                    return
+                sample = parameters[0] if executemany and parameters else parameters
+                entry = self._entries[key] = {
+                    "fingerprint": key,
+                    "kind": statement_kind(statement),
+                    "statement": statement,
+                    "params": _json_safe(sample),
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "rows_written": 0,
+                }
+            entry["count"] += executions
+            entry["total_ms"] += elapsed_ms
+            entry["max_ms"] = max(entry["max_ms"], elapsed_ms / executions)
+            if entry["kind"] == "write" and rowcount > 0:
+                entry["rows_written"] += rowcount
+
+    def snapshot(self, limit: Optional[int] = None, samples: bool = True) -> List[Dict[str, Any]]:
+        """Fingerprints by cumulative latency, most expensive first.
+
+        ``samples=False`` leaves out the sample statement and its bound
+        parameters, which hold user data; fingerprints have literals replaced.
+        """
+        with self._lock:
+            entries = [dict(entry) for entry in self._entries.values()]
+        if not samples:
+            for entry in entries:
+                del entry["statement"], entry["params"]
+        entries.sort(key=lambda entry: entry["total_ms"], reverse=True)
+        for entry in entries:
+            entry["mean_ms"] = round(entry["total_ms"] / entry["count"], 4)
+            entry["total_ms"] = round(entry["total_ms"], 3)
+            entry["max_ms"] = round(entry["max_ms"], 3)
+        return entries[:limit] if limit is not None else entries
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "fingerprints": len(self._entries),
+                "statements": sum(entry["count"] for entry in self._entries.values()),
+                "dropped": self._dropped,
+            }
+
+    def reset(self):
+        with self._lock:
+            self._entries.clear()
+            self._dropped = 0
+
+    def save(self, path: str):
+        """Write the snapshot as JSON for later analysis"""
+        with open(path, "w") as f:
+            json.dump(self.snapshot(), f, indent=2)
+
+    @staticmethod
+    def load(path: str) -> List[Dict[str, Any]]:
+        with open(path) as f:
+            return json.load(f)
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany):
+        # Statements without an execution context are the dialect's own
+        # setup queries
+        if context is not None:
+            context._workload_start = time.perf_counter()
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "_workload_start", None)
+        if start is None:
+            return
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.record(statement, parameters, elapsed_ms, executemany, getattr(cursor, "rowcount", -1))
+
+
+def _json_safe(parameters: Any) -> Any:
+    if parameters is None:
+        return []
+    if isinstance(parameters, dict):
+        return {key: _json_value(value) for key, value in parameters.items()}
+    if isinstance(parameters, Sequence) and not isinstance(parameters, (str, bytes)):
+        return [_json_value(value) for value in parameters]
+    return [_json_value(parameters)]
+
+
+def _json_value(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, bytes):
+        return value.hex()
+    return str(value)
+
+
+workload_recorder = WorkloadRecorder(engine, max_fingerprints=settings.workload_max_fingerprints)
+
+
+def get_workload_recorder() -> Optional[WorkloadRecorder]:
+    """Return the shared recorder when workload capture is enabled"""
+    return workload_recorder if settings.workload_capture_enabled else None
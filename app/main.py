@@ -1,16 +1,36 @@
 from fastapi import FastAPI
+from sqlmodel import Session
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
-from app.database import create_db_and_tables
-from app.api import tasks_router
+from app.database import (
+    engine, create_db_and_tables, get_write_batcher, get_workload_recorder, task_archiver, ensure_priority_index
+)
+from app.api import tasks_router, standup_router
 from app.config import settings
+from app.middleware import AdmissionControlMiddleware, admission_controller
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     create_db_and_tables()
+    with Session(engine) as session:
+        ensure_priority_index(session)
+    batcher = get_write_batcher()
+    if batcher:
+        batcher.start()
+    if settings.archive_enabled:
+        task_archiver.start()
+    recorder = get_workload_recorder()
+    if recorder:
+        recorder.attach()
     yield
+    if recorder:
+        recorder.detach()
+    if settings.archive_enabled:
+        task_archiver.stop()
+    if batcher:
+        batcher.stop()
 
 
 app = FastAPI(
@@ -20,6 +40,9 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+if settings.admission_control_enabled:
+    app.add_middleware(AdmissionControlMiddleware, controller=admission_controller)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins,
@@ -29,6 +52,7 @@ app.add_middleware(
 )
 
 app.include_router(tasks_router)
+app.include_router(standup_router)
 
 
 @app.get("/")
@@ -43,3 +67,24 @@ def root():
 @app.get("/health")
 def health_check():
     return {"status": "healthy"}
+
+
+@app.get("/health/admission")
+def admission_stats():
+    return {
+        "enabled": settings.admission_control_enabled,
+        **admission_controller.stats()
+    }
+
+
+@app.get("/health/workload")
+def workload_stats(limit: int = 50):
+    recorder = get_workload_recorder()
+    if recorder is None:
+        return {"enabled": False}
+    return {
+        "enabled": True,
+        **recorder.stats(),
+        # Sample parameters are user data; only the advisor gets them
+        "top": recorder.snapshot(limit, samples=False),
+    }
@@ -0,0 +1,13 @@
+from app.middleware.admission import (
+    AdmissionController,
+    AdmissionControlMiddleware,
+    ConcurrencyBudget,
+    admission_controller,
+)
+
+__all__ = [
+    "AdmissionController",
+    "AdmissionControlMiddleware",
+    "ConcurrencyBudget",
+    "admission_controller",
+]
@@ -0,0 +1,164 @@
+import asyncio
+from collections import deque
+from typing import Dict, List, Optional
+
+from starlette.responses import JSONResponse
+
+from app.config import settings
+
+
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class ConcurrencyBudget:
+    """Concurrency limit with a bounded FIFO wait queue"""
+
+    def __init__(self, name: str, limit: int, queue_size: int, queue_timeout_ms: float):
+        self.name = name
+        self.limit = max(1, limit)
+        self.queue_size = max(0, queue_size)
+        self.queue_timeout = queue_timeout_ms / 1000.0
+        self.active = 0
+        self.admitted = 0
+        self.shed_queue_full = 0
+        self.shed_timeout = 0
+        self._waiters: deque = deque()
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(1 for waiter in self._waiters if not waiter.done())
+
+    async def acquire(self) -> bool:
+        """Wait for a slot; return False if the request should be shed"""
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            self.admitted += 1
+            return True
+
+        if self.queue_depth >= self.queue_size:
+            self.shed_queue_full += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._discard(waiter)
+            self.shed_timeout += 1
+            return False
+        except BaseException:
+            self._discard(waiter)
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+
+        self.admitted += 1
+        return True
+
+    def release(self):
+        """Hand the slot to the next waiter, or free it"""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def _discard(self, waiter: asyncio.Future):
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "limit": self.limit,
+            "active": self.active,
+            "queue_depth": self.queue_depth,
+            "queue_size": self.queue_size,
+            "admitted": self.admitted,
+            "shed_queue_full": self.shed_queue_full,
+            "shed_timeout": self.shed_timeout,
+            "shed_total": self.shed_queue_full + self.shed_timeout,
+        }
+
+
+class AdmissionController:
+    """Selects the concurrency budget for each request"""
+
+    def __init__(
+        self,
+        read_limit: int = 64,
+        write_limit: int = 16,
+        queue_size: int = 100,
+        queue_timeout_ms: float = 1000.0,
+        retry_after_seconds: int = 1,
+        route_limits: Optional[Dict[str, int]] = None,
+        exempt_paths: Optional[List[str]] = None,
+    ):
+        self.retry_after_seconds = retry_after_seconds
+        self.exempt_paths = list(exempt_paths or [])
+        self.read = ConcurrencyBudget("read", read_limit, queue_size, queue_timeout_ms)
+        self.write = ConcurrencyBudget("write", write_limit, queue_size, queue_timeout_ms)
+        self.routes = {
+            prefix: ConcurrencyBudget(prefix, limit, queue_size, queue_timeout_ms)
+            for prefix, limit in (route_limits or {}).items()
+        }
+        self._route_prefixes = sorted(self.routes, key=len, reverse=True)
+
+    def is_exempt(self, path: str) -> bool:
+        return any(path.startswith(prefix) for prefix in self.exempt_paths)
+
+    def budget_for(self, method: str, path: str) -> ConcurrencyBudget:
+        """Longest matching route prefix wins, otherwise read/write by method"""
+        for prefix in self._route_prefixes:
+            if path.startswith(prefix):
+                return self.routes[prefix]
+        return self.read if method in READ_METHODS else self.write
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {
+            "read": self.read.stats(),
+            "write": self.write.stats(),
+            "routes": {prefix: budget.stats() for prefix, budget in self.routes.items()},
+        }
+
+
+class AdmissionControlMiddleware:
+    """ASGI middleware that sheds load with 503 + Retry-After when overloaded"""
+
+    def __init__(self, app, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.controller.is_exempt(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        budget = self.controller.budget_for(scope["method"], scope["path"])
+        if not await budget.acquire():
+            response = JSONResponse(
+                {"detail": "Server is overloaded, please retry later"},
+                status_code=503,
+                headers={"Retry-After": str(self.controller.retry_after_seconds)},
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            budget.release()
+
+
+admission_controller = AdmissionController(
+    read_limit=settings.admission_read_limit,
+    write_limit=settings.admission_write_limit,
+    queue_size=settings.admission_queue_size,
+    queue_timeout_ms=settings.admission_queue_timeout_ms,
+    retry_after_seconds=settings.admission_retry_after_seconds,
+    route_limits=settings.admission_route_limits,
+    exempt_paths=settings.admission_exempt_paths,
+)
@@ -1,3 +1,27 @@
-from app.models.task import Task, TaskCreate, TaskUpdate, TaskRead, TaskStatus, TaskPriority
+from app.models.task import (
+    Task,
+    TaskArchive,
+    TaskPriorityEntry,
+    TaskDependency,
+    TaskDependencyCreate,
+    TaskCreate,
+    TaskUpdate,
+    TaskRead,
+    PrioritizedTaskRead,
+    TaskStatus,
+    TaskPriority,
+)
 
-__all__ = ["Task", "TaskCreate", "TaskUpdate", "TaskRead", "TaskStatus", "TaskPriority"]
+__all__ = [
+    "Task",
+    "TaskArchive",
+    "TaskPriorityEntry",
+    "TaskDependency",
+    "TaskDependencyCreate",
+    "TaskCreate",
+    "TaskUpdate",
+    "TaskRead",
+    "PrioritizedTaskRead",
+    "TaskStatus",
+    "TaskPriority",
+]
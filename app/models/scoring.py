@@ -0,0 +1,114 @@
+"""
+Task scoring weights and thresholds.
+
+Shared by the Task Prioritizer skill and the database priority index, so
+neither layer has to import the other to score a task the same way.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Sequence, Tuple
+
+
+PRIORITY_SCORES = {
+    "urgent": 100,
+    "high": 75,
+    "medium": 50,
+    "low": 25
+}
+DEFAULT_PRIORITY_SCORE = 50
+
+IN_PROGRESS_BONUS = 20
+
+TAG_KEYWORD_BONUSES = (("urgent", 30), ("critical", 25), ("blocked", -40))
+DESCRIPTION_KEYWORD_BONUSES = (("asap", 20), ("deadline", 15))
+
+# (max days until due, urgency score); overdue and far-off tasks are handled separately
+URGENCY_BUCKETS = ((0, 45), (1, 40), (3, 30), (7, 20), (14, 10))
+OVERDUE_URGENCY = 50
+DISTANT_URGENCY = 5
+
+
+def parse_due_date(due_date) -> datetime:
+    """Parse an ISO string (``Z`` suffix allowed) or pass a datetime through"""
+    if isinstance(due_date, str):
+        return datetime.fromisoformat(due_date.replace('Z', '+00:00'))
+    return due_date
+
+
+def urgency_for_days(days: int) -> int:
+    """Map whole days until due to an urgency score"""
+    if days < 0:
+        return OVERDUE_URGENCY
+    for max_days, score in URGENCY_BUCKETS:
+        if days <= max_days:
+            return score
+    return DISTANT_URGENCY
+
+
+def keyword_bonus(text: str, table: Sequence[Tuple[str, int]]) -> int:
+    """Sum the bonuses of every keyword contained in ``text``"""
+    lowered = text.lower()
+    return sum(bonus for keyword, bonus in table if keyword in lowered)
+
+
+def reference_clock(now: Optional[datetime] = None) -> Tuple[datetime, datetime]:
+    """Return the same instant as (aware UTC, naive local) datetimes.
+
+    Aware due dates are compared with the first and naive ones with the
+    second, mirroring ``datetime.now(due.tzinfo)`` in the scalar scorer.
+    """
+    if now is None:
+        now = datetime.now(timezone.utc)
+    if now.tzinfo is None:
+        now = now.astimezone()
+    return now.astimezone(timezone.utc), now.astimezone().replace(tzinfo=None)
+
+
+def due_urgency(due_date, now_aware: datetime, now_naive: datetime) -> Tuple[int, bool]:
+    """(urgency score, overdue) for a due date; missing or unparseable dates score 0"""
+    if not due_date:
+        return 0, False
+    try:
+        due = parse_due_date(due_date)
+        now = now_aware if due.tzinfo else now_naive
+        return urgency_for_days((due - now).days), due < now
+    except Exception:
+        return 0, False
+
+
+def score_task(task: Dict, now: Optional[datetime] = None,
+               priority_scores: Optional[Dict[str, int]] = None) -> float:
+    """Priority score of one task dict at the reference time ``now``"""
+    priority = task.get("priority", "medium")
+    key = priority.lower() if isinstance(priority, str) else ""
+    score = 0.0 + (priority_scores or PRIORITY_SCORES).get(key, DEFAULT_PRIORITY_SCORE)
+
+    score += due_urgency(task.get("due_date"), *reference_clock(now))[0]
+    if task.get("tags"):
+        score += keyword_bonus(task["tags"], TAG_KEYWORD_BONUSES)
+    if task.get("description"):
+        score += keyword_bonus(task["description"], DESCRIPTION_KEYWORD_BONUSES)
+    if task.get("status") == "in_progress":
+        score += IN_PROGRESS_BONUS
+    return score
+
+
+def next_urgency_transition(due_date, now: Optional[datetime] = None) -> Optional[datetime]:
+    """First urgency bucket boundary at or after now for a due date.
+
+    None means the urgency never changes with time (no due date, or
+    already overdue).
+    """
+    if not due_date:
+        return None
+
+    now_aware, now_naive = reference_clock(now)
+    try:
+        due = parse_due_date(due_date)
+        current = now_aware if due.tzinfo else now_naive
+        boundaries = [due - timedelta(days=max_days + 1) for max_days, _ in reversed(URGENCY_BUCKETS)]
+        boundaries.append(due)
+        return next((b for b in boundaries if b >= current), None)
+
+    except Exception:
+        return None
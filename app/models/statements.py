@@ -0,0 +1,16 @@
+"""
+SQL statement classification shared by the workload recorder and the
+Database Optimizer skill.
+"""
+
+WRITE_KEYWORDS = ("INSERT", "UPDATE", "DELETE", "REPLACE")
+
+
+def statement_kind(statement: str) -> str:
+    """``read``, ``write`` or ``other`` (DDL, PRAGMA, transaction control)"""
+    keyword = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    if keyword in ("SELECT", "WITH"):
+        return "read"
+    if keyword in WRITE_KEYWORDS:
+        return "write"
+    return "other"
@@ -1,3 +1,4 @@
+from sqlalchemy import Index, event
 from sqlmodel import SQLModel, Field
 from typing import Optional
 from datetime import datetime, timezone
@@ -18,6 +19,15 @@ class TaskPriority(str, Enum):
     URGENT = "urgent"
 
 
+# Numeric rank stored alongside the priority so it can be sorted and indexed
+PRIORITY_RANK = {
+    TaskPriority.LOW: 1,
+    TaskPriority.MEDIUM: 2,
+    TaskPriority.HIGH: 3,
+    TaskPriority.URGENT: 4,
+}
+
+
 class TaskBase(SQLModel):
     title: str = Field(min_length=1, max_length=200)
     description: Optional[str] = Field(default=None, max_length=1000)
@@ -25,14 +35,67 @@ class TaskBase(SQLModel):
     priority: TaskPriority = Field(default=TaskPriority.MEDIUM)
     due_date: Optional[datetime] = None
     tags: Optional[str] = Field(default=None, max_length=200)
+    effort_hours: Optional[float] = Field(default=None, ge=0)
 
 
 class Task(TaskBase, table=True):
+    # AUTOINCREMENT keeps ids of archived tasks from being reused
+    __table_args__ = {"sqlite_autoincrement": True}
+
     id: Optional[int] = Field(default=None, primary_key=True)
+    priority_rank: int = Field(default=PRIORITY_RANK[TaskPriority.MEDIUM])
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 
+class TaskArchive(TaskBase, table=True):
+    """Completed/cancelled tasks moved out of the hot task table"""
+    __tablename__ = "task_archive"
+
+    id: int = Field(primary_key=True)
+    priority_rank: int = Field(default=PRIORITY_RANK[TaskPriority.MEDIUM])
+    created_at: datetime
+    updated_at: datetime
+    archived_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc), index=True)
+
+
+class TaskPriorityEntry(SQLModel, table=True):
+    """Precomputed priority score of an open task.
+
+    ``next_transition_at`` is when the task's due-date urgency bucket next
+    changes; its index acts as a time-ordered queue of pending re-scores.
+    """
+    __tablename__ = "task_priority_index"
+
+    task_id: int = Field(primary_key=True)
+    score: float
+    next_transition_at: Optional[datetime] = Field(default=None, index=True)
+
+
+class TaskDependency(SQLModel, table=True):
+    """Edge meaning ``task_id`` cannot start before ``depends_on_id`` is done"""
+    __tablename__ = "task_dependency"
+
+    task_id: int = Field(foreign_key="task.id", primary_key=True)
+    depends_on_id: int = Field(foreign_key="task.id", primary_key=True, index=True)
+
+
+# Composite indexes for the common orderings; "-priority,due_date,id" (and its
+# reverse) is read straight from the index without a sort step
+Index("ix_task_rank_due_id", Task.priority_rank.desc(), Task.due_date, Task.id)
+Index("ix_task_status_rank_due_id", Task.status, Task.priority_rank.desc(), Task.due_date, Task.id)
+Index("ix_task_due_id", Task.due_date, Task.id)
+Index("ix_task_status_updated", Task.status, Task.updated_at)
+Index("ix_task_archive_status_updated", TaskArchive.status, TaskArchive.updated_at)
+Index("ix_task_priority_index_score", TaskPriorityEntry.score.desc(), TaskPriorityEntry.task_id)
+
+
+@event.listens_for(Task, "before_insert")
+@event.listens_for(Task, "before_update")
+def _sync_priority_rank(mapper, connection, target: Task):
+    target.priority_rank = PRIORITY_RANK[TaskPriority(target.priority)]
+
+
 class TaskCreate(TaskBase):
     pass
 
@@ -44,9 +107,18 @@ class TaskUpdate(SQLModel):
     priority: Optional[TaskPriority] = None
     due_date: Optional[datetime] = None
     tags: Optional[str] = Field(default=None, max_length=200)
+    effort_hours: Optional[float] = Field(default=None, ge=0)
+
+
+class TaskDependencyCreate(SQLModel):
+    depends_on_id: int
 
 
 class TaskRead(TaskBase):
     id: int
     created_at: datetime
     updated_at: datetime
+
+
+class PrioritizedTaskRead(TaskRead):
+    priority_score: float
@@ -4,17 +4,102 @@ Automates code review by analyzing Python files for common issues,
 style violations, and potential bugs.
 """
 
-import ast
+import hashlib
+import heapq
+import json
 import os
-from typing import List, Dict
-from pathlib import Path
+import re
+import subprocess
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, as_completed, wait
+from itertools import islice
+from typing import Iterable, Iterator, List, Dict, Mapping, Optional, Sequence, Tuple
+
+from app.skills.disk_cache import DiskCache, default_cache_dir
+from app.skills.review_rules import ReviewEngine, registry
+from app.skills.source_tree import DEFAULT_MAX_FILE_SIZE, iter_python_files
+
+
+# Bump whenever a check is added or changed; cached reviews from other
+# versions are never read again and age out of the cache
+RULES_VERSION = 2
+
+# A file modified this recently may change again within the same mtime
+# tick, so its cache entry is validated by content hash rather than stat
+RACY_WINDOW_NS = 2_000_000_000
+
+# (mtime_ns or None, size, sha256) of a reviewed file
+Fingerprint = Tuple[Optional[int], int, str]
+
+# Inclusive (first, last) line ranges in the new version of a file
+LineRanges = List[Tuple[int, int]]
+
+HUNK_HEADER = re.compile(r"^@@ -\d+(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+# Reported wherever they are: the rest of the file cannot be checked
+WHOLE_FILE_ISSUES = {"syntax_error"}
+
+
+def content_digest(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8", "surrogateescape")).hexdigest()
+
+
+class ReviewCache:
+    """Review issues per file, reused while the file and rules are unchanged.
+
+    A file whose mtime and size match its entry is not opened at all; one
+    whose stat changed is hashed and only re-reviewed if its content did.
+    """
+
+    def __init__(self, cache: Optional[DiskCache] = None):
+        self.cache = cache or DiskCache(
+            os.path.join(default_cache_dir(), "reviews.sqlite3"),
+            max_entries=200_000,
+            max_bytes=256 * 1024 * 1024
+        )
+
+    @staticmethod
+    def key(file_path: str, rules: Sequence[str] = ()) -> str:
+        return json.dumps(["review", RULES_VERSION, sorted(rules), os.path.abspath(file_path)])
+
+    def lookup(self, paths: Sequence[str], rules: Sequence[str] = ()) -> List[Tuple[bool, Optional[Dict]]]:
+        """``(fresh, entry)`` per path; fresh entries can be used without reading the file"""
+        keys = [self.key(path, rules) for path in paths]
+        entries = self.cache.get_many(keys)
+
+        found = []
+        for path, key in zip(paths, keys):
+            entry = entries.get(key)
+            fresh = False
+            if entry is not None and entry["mtime_ns"] is not None:
+                try:
+                    stat = os.stat(path)
+                    fresh = entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size
+                except OSError:
+                    pass
+            found.append((fresh, entry))
+        return found
+
+    def store(self, items: Iterable[Tuple[str, Fingerprint, List[Dict]]], rules: Sequence[str] = ()):
+        self.cache.set_many(
+            (self.key(path, rules), {"mtime_ns": mtime_ns, "size": size, "sha256": digest, "issues": issues})
+            for path, (mtime_ns, size, digest), issues in items
+        )
 
 
 class CodeReviewSkill:
     """Automated code review skill for Python files"""
 
-    def __init__(self):
+    def __init__(
+        self,
+        cache: Optional[ReviewCache] = None,
+        enabled_rules: Optional[Iterable[str]] = None,
+        disabled_rules: Iterable[str] = (),
+        timed: bool = False
+    ):
         self.issues = []
+        self.cache = cache
+        self.engine = ReviewEngine(registry.select(enabled_rules, disabled_rules), timed)
 
     def review_file(self, file_path: str) -> Dict[str, any]:
         """Review a single Python file"""
@@ -26,100 +111,67 @@ class CodeReviewSkill:
         if not file_path.endswith('.py'):
             return {"error": "Only Python files are supported"}
 
-        with open(file_path, 'r') as f:
-            content = f.read()
-
-        try:
-            tree = ast.parse(content)
-            self._analyze_ast(tree)
-        except SyntaxError as e:
-            self.issues.append({
-                "type": "syntax_error",
-                "severity": "critical",
-                "line": e.lineno,
-                "message": str(e)
-            })
-
-        self._check_style(content)
+        result = self._review_paths([file_path])[0]
+        # Issues are collected per call so one instance can review files
+        # concurrently; self.issues keeps the last file's issues
+        self.issues = result.get("issues", [])
+        return result
 
+    @staticmethod
+    def _file_result(file_path: str, issues: List[Dict]) -> Dict[str, any]:
         return {
             "file": file_path,
-            "total_issues": len(self.issues),
-            "issues": self.issues,
+            "total_issues": len(issues),
+            "issues": issues,
             "status": "reviewed"
         }
 
-    def _analyze_ast(self, tree: ast.AST):
-        """Analyze AST for code issues"""
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                if len(node.args.args) > 5:
-                    self.issues.append({
-                        "type": "too_many_parameters",
-                        "severity": "medium",
-                        "line": node.lineno,
-                        "message": f"Function '{node.name}' has {len(node.args.args)} parameters (max recommended: 5)"
-                    })
-
-                if not ast.get_docstring(node):
-                    self.issues.append({
-                        "type": "missing_docstring",
-                        "severity": "low",
-                        "line": node.lineno,
-                        "message": f"Function '{node.name}' missing docstring"
-                    })
-
-            elif isinstance(node, ast.Try):
-                if len(node.handlers) == 0:
-                    self.issues.append({
-                        "type": "empty_exception_handler",
-                        "severity": "high",
-                        "line": node.lineno,
-                        "message": "Try block without exception handlers"
-                    })
-
-                for handler in node.handlers:
-                    if handler.type is None:
-                        self.issues.append({
-                            "type": "bare_except",
-                            "severity": "high",
-                            "line": handler.lineno,
-                            "message": "Bare except clause (catches all exceptions)"
-                        })
-
-    def _check_style(self, content: str):
-        """Check style guidelines"""
-        lines = content.split('\n')
-
-        for i, line in enumerate(lines, 1):
-            if len(line) > 120:
-                self.issues.append({
-                    "type": "line_too_long",
-                    "severity": "low",
-                    "line": i,
-                    "message": f"Line exceeds 120 characters ({len(line)} chars)"
-                })
-
-            if line.strip().startswith('import ') or line.strip().startswith('from '):
-                if i > 1 and lines[i-2].strip() and not (
-                    lines[i-2].strip().startswith('import ') or
-                    lines[i-2].strip().startswith('from ')
-                ):
-                    self.issues.append({
-                        "type": "import_not_at_top",
-                        "severity": "medium",
-                        "line": i,
-                        "message": "Imports should be at the top of the file"
-                    })
-
-    def review_directory(self, directory_path: str) -> Dict[str, any]:
-        """Review all Python files in a directory"""
-        results = []
-        path = Path(directory_path)
-
-        for py_file in path.rglob('*.py'):
-            result = self.review_file(str(py_file))
-            results.append(result)
+    def _review_path(
+        self,
+        file_path: str,
+        known_digest: Optional[str] = None,
+        fingerprint: bool = False
+    ) -> Tuple[Optional[List[Dict]], Optional[Fingerprint]]:
+        """Issues for one file, plus its fingerprint when ``fingerprint``.
+
+        Issues are None when the content hashes to ``known_digest``.
+        """
+        stat = os.stat(file_path) if fingerprint else None
+        with open(file_path, 'r') as f:
+            content = f.read()
+        if not fingerprint:
+            return self._review_content(content), None
+
+        digest = content_digest(content)
+        issues = None if digest == known_digest else self._review_content(content)
+        mtime_ns = stat.st_mtime_ns if time.time_ns() - stat.st_mtime_ns > RACY_WINDOW_NS else None
+        return issues, (mtime_ns, stat.st_size, digest)
+
+    def _review_content(self, content: str) -> List[Dict]:
+        return self.engine.review(content)
+
+    def rule_report(self) -> List[Dict[str, any]]:
+        """Per-rule call counts, issues found and time spent (needs ``timed=True``)"""
+        return self.engine.report()
+
+    def review_directory(
+        self,
+        directory_path: str,
+        max_workers: Optional[int] = 1,
+        executor: Optional[Executor] = None,
+        exclude: Sequence[str] = (),
+        max_file_size: Optional[int] = DEFAULT_MAX_FILE_SIZE,
+        respect_gitignore: bool = True
+    ) -> Dict[str, any]:
+        """Review all Python files in a directory.
+
+        With ``max_workers`` other than 1 (None means one per CPU) files are
+        reviewed over a process pool in chunks of similar total size.
+        Results are in path order either way. Files are found as by
+        ``iter_python_files``.
+        """
+        paths = sorted(iter_python_files(directory_path, exclude, max_file_size, respect_gitignore))
+        results = self._review_paths(paths, max_workers or os.cpu_count() or 1, executor)
 
         total_issues = sum(r.get('total_issues', 0) for r in results)
 
@@ -130,6 +182,319 @@ class CodeReviewSkill:
             "results": results
         }
 
+    def iter_review_directory(
+        self,
+        directory_path: str,
+        max_workers: Optional[int] = 1,
+        executor: Optional[Executor] = None,
+        exclude: Sequence[str] = (),
+        max_file_size: Optional[int] = DEFAULT_MAX_FILE_SIZE,
+        respect_gitignore: bool = True,
+        batch_size: int = 64
+    ) -> Iterator[Dict[str, any]]:
+        """Yield each file's result as soon as it is ready.
+
+        Files are discovered while reviewing, in batches of ``batch_size``,
+        and at most two batches per worker are in flight, so memory stays
+        flat and the first results arrive before the walk finishes. Results
+        come in completion order.
+        """
+        workers = max_workers or os.cpu_count() or 1
+        inline = workers == 1 and executor is None
+        fingerprint = self.cache is not None
+        files = enumerate(iter_python_files(directory_path, exclude, max_file_size, respect_gitignore))
+
+        pool = None if inline else executor or ProcessPoolExecutor(max_workers=workers)
+        in_flight: Dict[Future, Tuple[Dict[int, str], Dict[int, List[Dict]]]] = {}
+        try:
+            while True:
+                batch = list(islice(files, batch_size))
+                if not batch:
+                    break
+
+                paths = dict(batch)
+                hits, jobs, known = self._lookup(batch)
+                for _, result in hits:
+                    yield result
+                if not jobs:
+                    continue
+
+                if inline:
+                    for _, result in self._completed(self._review_jobs(jobs, fingerprint), paths, known):
+                        yield result
+                    continue
+
+                future = pool.submit(_review_chunk, jobs, fingerprint, self.engine.rule_names, self.engine.timed)
+                in_flight[future] = (paths, known)
+                if len(in_flight) >= workers * 2:
+                    yield from self._drain(in_flight)
+
+            while in_flight:
+                yield from self._drain(in_flight)
+        finally:
+            if pool is not None and executor is None:
+                pool.shutdown(cancel_futures=True)
+
+    def _drain(self, in_flight: Dict[Future, tuple]) -> Iterator[Dict[str, any]]:
+        """Wait for at least one in-flight batch and yield its results"""
+        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+        for future in done:
+            paths, known = in_flight.pop(future)
+            reviewed, timings = future.result()
+            self.engine.merge_timings(timings)
+            for _, result in self._completed(reviewed, paths, known):
+                yield result
+
+    def review_diff(
+        self,
+        diff: Optional[str] = None,
+        base_ref: Optional[str] = None,
+        repo_path: str = ".",
+        max_workers: Optional[int] = 1
+    ) -> Dict[str, any]:
+        """Review only the lines a change touches.
+
+        Takes a unified diff, or a ``base_ref`` to diff the working tree of
+        ``repo_path`` against (from its merge base with HEAD). Each changed
+        Python file is reviewed whole, so rules keep their context, and its
+        issues are filtered to the added or modified lines.
+        """
+        if diff is None and base_ref is None:
+            return {"error": "Either diff or base_ref is required"}
+
+        if diff is None:
+            try:
+                repo_path, diff = git_diff(repo_path, base_ref)
+            except (subprocess.CalledProcessError, OSError) as e:
+                stderr = getattr(e, "stderr", None)
+                return {"error": f"git diff failed: {(stderr or str(e)).strip()}"}
+
+        changed = {
+            path: ranges for path, ranges in parse_unified_diff(diff).items()
+            if path.endswith('.py') and ranges
+        }
+        paths = sorted(changed)
+        results = self._review_paths(
+            [os.path.join(repo_path, path) for path in paths], max_workers or os.cpu_count() or 1
+        )
+
+        for path, result in zip(paths, results):
+            result["changed_lines"] = changed[path]
+            if "issues" in result:
+                result["issues"] = [
+                    issue for issue in result["issues"]
+                    if issue["type"] in WHOLE_FILE_ISSUES or _in_ranges(issue["line"], changed[path])
+                ]
+                result["total_issues"] = len(result["issues"])
+
+        return {
+            "base_ref": base_ref,
+            "files_reviewed": len(results),
+            "total_issues": sum(r.get('total_issues', 0) for r in results),
+            "results": results
+        }
+
+    def _review_paths(
+        self,
+        paths: List[str],
+        workers: int = 1,
+        executor: Optional[Executor] = None
+    ) -> List[Dict[str, any]]:
+        """Results for ``paths`` in order, served from the cache where possible"""
+        results = [None] * len(paths)
+        hits, jobs, known = self._lookup(list(enumerate(paths)))
+        for i, result in hits:
+            results[i] = result
+
+        fingerprint = self.cache is not None
+        if workers == 1 and executor is None:
+            reviewed = self._review_jobs(jobs, fingerprint)
+        else:
+            reviewed = self._review_parallel(jobs, fingerprint, workers, executor)
+
+        for i, result in self._completed(reviewed, paths, known):
+            results[i] = result
+        return results
+
+    def _lookup(
+        self,
+        batch: List[Tuple[int, str]]
+    ) -> Tuple[List[Tuple[int, Dict]], List[tuple], Dict[int, List[Dict]]]:
+        """Split ``(i, path)`` pairs into cached results, review jobs, and cached issues to reuse by hash"""
+        if self.cache is None:
+            return [], [(i, path, None) for i, path in batch], {}
+
+        hits, jobs, known = [], [], {}
+        cached = self.cache.lookup([path for _, path in batch], self.engine.rule_names)
+        for (i, path), (fresh, entry) in zip(batch, cached):
+            if fresh:
+                hits.append((i, self._file_result(path, entry["issues"])))
+            elif entry:
+                jobs.append((i, path, entry["sha256"]))
+                known[i] = entry["issues"]
+            else:
+                jobs.append((i, path, None))
+        return hits, jobs, known
+
+    def _completed(
+        self,
+        reviewed: Iterable[tuple],
+        paths: Mapping[int, str],
+        known: Mapping[int, List[Dict]]
+    ) -> Iterator[Tuple[int, Dict[str, any]]]:
+        """Turn raw reviews into results, writing them to the cache"""
+        updates = []
+        try:
+            for i, issues, stamp, error in reviewed:
+                path = paths[i]
+                if error:
+                    yield i, {"file": path, "error": error}
+                    continue
+                if issues is None:
+                    issues = known[i]
+                if self.cache is not None:
+                    updates.append((path, stamp, issues))
+                yield i, self._file_result(path, issues)
+        finally:
+            if updates:
+                self.cache.store(updates, self.engine.rule_names)
+
+    def _review_jobs(self, jobs: List[Tuple[int, str, Optional[str]]], fingerprint: bool) -> Iterator[tuple]:
+        for i, path, known_digest in jobs:
+            try:
+                issues, stamp = self._review_path(path, known_digest, fingerprint)
+            except (OSError, UnicodeDecodeError) as e:
+                yield i, None, None, f"Could not read file: {e}"
+                continue
+            yield i, issues, stamp, None
+
+    def _review_parallel(
+        self,
+        jobs: List[Tuple[int, str, Optional[str]]],
+        fingerprint: bool,
+        workers: int,
+        executor: Optional[Executor]
+    ) -> Iterator[tuple]:
+        owned = executor is None
+        pool = executor or ProcessPoolExecutor(max_workers=workers)
+        try:
+            futures = [
+                pool.submit(_review_chunk, chunk, fingerprint, self.engine.rule_names, self.engine.timed)
+                for chunk in balanced_chunks(jobs, workers * 4)
+                if chunk
+            ]
+            for future in as_completed(futures):
+                reviewed, timings = future.result()
+                self.engine.merge_timings(timings)
+                yield from reviewed
+        finally:
+            if owned:
+                pool.shutdown(cancel_futures=True)
+
+
+def parse_unified_diff(diff: str) -> Dict[str, LineRanges]:
+    """Added or modified line ranges per file in a unified diff.
+
+    Paths are those of the new version; deleted files are left out and a
+    file with only removals maps to an empty list.
+    """
+    changed: Dict[str, LineRanges] = {}
+    ranges = None
+    line = old_left = new_left = 0
+
+    for text in diff.splitlines():
+        # Inside a hunk every line is content, even one starting "+++"
+        if old_left or new_left:
+            if text.startswith("+"):
+                if ranges is not None:
+                    if ranges and ranges[-1][1] == line - 1:
+                        ranges[-1] = (ranges[-1][0], line)
+                    else:
+                        ranges.append((line, line))
+                line += 1
+                new_left -= 1
+            elif text.startswith("-"):
+                old_left -= 1
+            elif text.startswith(" ") or text == "":
+                line += 1
+                old_left -= 1
+                new_left -= 1
+            continue
+
+        if text.startswith("+++ "):
+            path = _diff_path(text[4:])
+            ranges = changed.setdefault(path, []) if path is not None else None
+            continue
+
+        match = HUNK_HEADER.match(text)
+        if match:
+            old_count, start, new_count = match.groups()
+            line = int(start)
+            old_left = int(old_count) if old_count is not None else 1
+            new_left = int(new_count) if new_count is not None else 1
+
+    return changed
+
+
+def git_diff(repo_path: str, base_ref: str) -> Tuple[str, str]:
+    """``(repository root, diff)`` of the working tree against the merge base of ``base_ref`` and HEAD"""
+    def git(*args):
+        return subprocess.run(
+            ["git", "-C", repo_path, *args], capture_output=True, text=True, check=True
+        ).stdout
+
+    root = git("rev-parse", "--show-toplevel").strip()
+    merge_base = git("merge-base", base_ref, "HEAD").strip()
+    return root, git("diff", "--unified=0", "--no-color", "--no-ext-diff", merge_base, "--", "*.py")
+
+
+def _diff_path(header: str) -> Optional[str]:
+    path = header.split("\t", 1)[0].strip()
+    if path.startswith('"') and path.endswith('"'):
+        path = path[1:-1].encode("latin-1", "backslashreplace").decode("unicode_escape").encode("latin-1").decode()
+    if path == "/dev/null":
+        return None
+    return path[2:] if path.startswith("b/") else path
+
+
+def _in_ranges(line: Optional[int], ranges: LineRanges) -> bool:
+    return line is not None and any(first <= line <= last for first, last in ranges)
+
+
+def balanced_chunks(jobs: List[tuple], count: int) -> List[List[tuple]]:
+    """Split jobs (tuples whose second item is a path) into ``count`` chunks of similar total size.
+
+    Largest files are placed first, each into the currently lightest chunk,
+    so one chunk of big files does not hold up the whole pool.
+    """
+    sizes = []
+    for j, job in enumerate(jobs):
+        try:
+            size = os.path.getsize(job[1])
+        except OSError:
+            size = 0
+        sizes.append((size, j))
+    sizes.sort(reverse=True)
+
+    chunks = [[] for _ in range(max(1, count))]
+    heap = [(0, c) for c in range(len(chunks))]
+    for size, j in sizes:
+        load, c = heapq.heappop(heap)
+        chunks[c].append(jobs[j])
+        heapq.heappush(heap, (load + size + 1, c))
+    return chunks
+
+
+def _review_chunk(
+    chunk: List[Tuple[int, str, Optional[str]]],
+    fingerprint: bool,
+    rules: List[str],
+    timed: bool
+) -> Tuple[List[tuple], Dict[str, Dict[str, float]]]:
+    """Worker entry point: review a chunk of files with the caller's rules"""
+    reviewer = CodeReviewSkill(enabled_rules=rules, timed=timed)
+    return list(reviewer._review_jobs(chunk, fingerprint)), reviewer.engine.timings
+
 
 def main():
     """Example usage"""
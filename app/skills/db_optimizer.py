@@ -5,7 +5,13 @@ and provides optimization recommendations.
 """
 
 import re
-from typing import List, Dict, Tuple
+import sqlite3
+from concurrent.futures import Executor
+from typing import Any, Iterable, List, Dict, Optional, Sequence, Tuple, Union
+
+from app.skills.index_advisor import IndexAdvisor
+from app.skills.orm_patterns import scan_package, scan_source
+from app.skills.query_plan import PlanAnalysis, ensure_statistics, explain, open_database, time_query
 
 
 class DatabaseOptimizerSkill:
@@ -39,6 +45,92 @@ class DatabaseOptimizerSkill:
             "status": "analyzed"
         }
 
+    def analyze_query_plan(
+        self,
+        query: str,
+        database: Any,
+        params: Sequence = (),
+        copy: bool = True,
+        runs: int = 5
+    ) -> Dict[str, any]:
+        """Analyze a query from its real SQLite plan; see ``analyze_query_plans``"""
+        return self.analyze_query_plans([(query, params)], database, copy, runs)[0]
+
+    def analyze_query_plans(
+        self,
+        queries: Iterable[Union[str, Tuple[str, Sequence]]],
+        database: Any,
+        copy: bool = True,
+        runs: int = 5
+    ) -> List[Dict[str, any]]:
+        """Analyze queries with ``EXPLAIN QUERY PLAN`` against a real schema.
+
+        ``database`` is a path, ``sqlite:///`` URL, ``sqlite3`` connection or
+        SQLAlchemy engine. By default one in-memory copy is made (with
+        ANALYZE run on it if it has no statistics) and each query is also
+        timed on that copy's data; with ``copy=False`` a path is opened
+        read-only. Findings use the ``analyze_query`` recommendation schema.
+        """
+        connection, is_copy, close = open_database(database, copy)
+        try:
+            if is_copy:
+                ensure_statistics(connection)
+            return [self._analyze_plan(connection, *_query_and_params(item), runs) for item in queries]
+        finally:
+            close()
+
+    def advise_indexes(
+        self,
+        workload: Iterable[Dict[str, Any]],
+        database: Any,
+        max_candidates: int = 10,
+        runs: int = 5,
+        min_gain: float = 0.1
+    ) -> Dict[str, any]:
+        """Propose indexes for a captured workload and measure each one.
+
+        ``workload`` holds fingerprints as recorded by ``WorkloadRecorder``:
+        a sample ``statement`` and ``params``, ``count`` and ``kind``. The
+        indexes suggested by the read plans are built one at a time on an
+        in-memory copy of ``database``; each reports before/after latency
+        per statement on its table, size, build time and the extra time
+        its writes take. A candidate is recommended when the time its reads
+        save across the workload exceeds that write cost and one read gets
+        at least ``min_gain`` faster.
+        """
+        connection, _, close = open_database(database, copy=True)
+        try:
+            ensure_statistics(connection)
+            return IndexAdvisor(connection, workload, runs, min_gain).advise(max_candidates)
+        finally:
+            close()
+
+    def _analyze_plan(self, connection: sqlite3.Connection, query: str, params: Sequence, runs: int) -> Dict[str, any]:
+        try:
+            plan = explain(connection, query, params)
+        except sqlite3.Error as e:
+            return {"query": _shorten(query), "error": str(e)}
+
+        analysis = PlanAnalysis(connection, query, plan).run()
+        self.recommendations = analysis.recommendations
+
+        try:
+            timing = time_query(connection, query, params, runs) if runs else None
+        except sqlite3.Error as e:
+            timing = {"error": str(e)}
+
+        return {
+            "query": _shorten(query),
+            "optimization_score": self._calculate_optimization_score(),
+            "total_recommendations": len(self.recommendations),
+            "recommendations": self.recommendations,
+            "plan": plan,
+            "indexes_used": analysis.indexes_used,
+            "estimated_rows": analysis.estimated_rows,
+            "timing": timing,
+            "status": "analyzed"
+        }
+
     def _check_select_star(self, query: str):
         """Check for SELECT * usage"""
         if re.search(r'SELECT\s+\*', query, re.IGNORECASE):
@@ -163,6 +255,12 @@ class DatabaseOptimizerSkill:
                 "example": "select(Task.id, Task.title)"
             })
 
+        try:
+            self.recommendations.extend(scan_source(code))
+        except (SyntaxError, ValueError):
+            # Fragments that do not parse still get the checks above
+            pass
+
         return {
             "code_snippet": code[:100] + "..." if len(code) > 100 else code,
             "total_recommendations": len(self.recommendations),
@@ -170,6 +268,48 @@ class DatabaseOptimizerSkill:
             "status": "analyzed"
         }
 
+    def scan_codebase(
+        self,
+        path: str,
+        max_workers: Optional[int] = 1,
+        executor: Optional[Executor] = None,
+        exclude: Sequence[str] = ()
+    ) -> Dict[str, any]:
+        """Find N+1 queries, Python-side filtering and per-item commits in a package.
+
+        Files are parsed, not imported; see ``orm_patterns`` for what is
+        reported. With ``max_workers`` other than 1 (None means one per CPU)
+        files are scanned over a process pool.
+        """
+        findings, errors, files = [], [], 0
+        for file_path, file_findings, error in scan_package(path, max_workers, executor, exclude):
+            files += 1
+            findings.extend(file_findings)
+            if error:
+                errors.append({"file": file_path, "error": error})
+
+        by_type: Dict[str, int] = {}
+        for item in findings:
+            by_type[item["type"]] = by_type.get(item["type"], 0) + 1
+
+        return {
+            "path": path,
+            "files_scanned": files,
+            "total_findings": len(findings),
+            "by_type": by_type,
+            "findings": findings,
+            "errors": errors,
+            "status": "analyzed"
+        }
+
+
+def _query_and_params(item: Union[str, Tuple[str, Sequence]]) -> Tuple[str, Sequence]:
+    return (item, ()) if isinstance(item, str) else (item[0], item[1])
+
+
+def _shorten(query: str) -> str:
+    return query[:100] + "..." if len(query) > 100 else query
+
 
 def main():
     """Example usage"""
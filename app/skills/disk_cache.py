@@ -0,0 +1,199 @@
+"""
+Persistent key/value cache shared by the skills.
+
+Entries are JSON documents in a single SQLite file, evicted least recently
+used first once the entry count or total size exceeds its limit. SQLite
+handles locking, so several processes can share one cache file.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+# Cache files with another layout are dropped and recreated on open
+SCHEMA_VERSION = 3
+
+# Stays well under SQLite's bound-parameter limit
+_BATCH = 500
+
+
+def default_cache_dir() -> str:
+    """``$XDG_CACHE_HOME/task-management`` (``~/.cache`` by default)"""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "task-management")
+
+
+class DiskCache:
+    """LRU-evicted JSON cache stored in one SQLite file"""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_entries: int = 10_000,
+        max_bytes: int = 64 * 1024 * 1024
+    ):
+        self.path = path or os.path.join(default_cache_dir(), "cache.sqlite3")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        # WAL keeps the file consistent; a crash only loses the last writes
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+    def _create_schema(self):
+        # Recency lives apart from the values: SQLite rewrites a whole row on
+        # update, so touching an entry must not rewrite its (large) value
+        with self._transaction(immediate=True):
+            version = self._connection.execute("PRAGMA user_version").fetchone()[0]
+            if version != SCHEMA_VERSION:
+                self._connection.execute("DROP TABLE IF EXISTS entries")
+                self._connection.execute("DROP TABLE IF EXISTS entry_values")
+                self._connection.execute("DROP TABLE IF EXISTS usage")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, size INTEGER NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS ix_entries_accessed ON entries (accessed)")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS entry_values (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+            # Entry count and total size in one row, kept current by triggers
+            # so a write need not sum the whole table; every process sharing
+            # the file sees the same totals
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS usage ("
+                "id INTEGER PRIMARY KEY CHECK (id = 0), entries INTEGER NOT NULL, bytes INTEGER NOT NULL)"
+            )
+            self._connection.execute("INSERT OR IGNORE INTO usage VALUES (0, 0, 0)")
+            self._connection.execute(
+                "CREATE TRIGGER IF NOT EXISTS entries_added AFTER INSERT ON entries BEGIN "
+                "UPDATE usage SET entries = entries + 1, bytes = bytes + NEW.size; END"
+            )
+            self._connection.execute(
+                "CREATE TRIGGER IF NOT EXISTS entries_removed AFTER DELETE ON entries BEGIN "
+                "UPDATE usage SET entries = entries - 1, bytes = bytes - OLD.size; END"
+            )
+            self._connection.execute(
+                "CREATE TRIGGER IF NOT EXISTS entries_resized AFTER UPDATE OF size ON entries BEGIN "
+                "UPDATE usage SET bytes = bytes + NEW.size - OLD.size; END"
+            )
+            self._connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, marking it recently used"""
+        with self._lock:
+            row = self._connection.execute("SELECT value FROM entry_values WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self._stats["misses"] += 1
+                return None
+            self._connection.execute("UPDATE entries SET accessed = ? WHERE key = ?", (time.time(), key))
+            self._stats["hits"] += 1
+        return json.loads(row[0])
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Return the cached values among ``keys`` in one transaction"""
+        keys = list(keys)
+        found = {}
+        now = time.time()
+        with self._lock, self._transaction():
+            for start in range(0, len(keys), _BATCH):
+                batch = keys[start:start + _BATCH]
+                marks = ",".join("?" * len(batch))
+                found.update(self._connection.execute(
+                    f"SELECT key, value FROM entry_values WHERE key IN ({marks})", batch
+                ))
+            self._connection.executemany(
+                "UPDATE entries SET accessed = ? WHERE key = ?", [(now, key) for key in found]
+            )
+            self._stats["hits"] += len(found)
+            self._stats["misses"] += len(keys) - len(found)
+        return {key: json.loads(value) for key, value in found.items()}
+
+    def set(self, key: str, value: Any):
+        """Store a JSON-serializable value and evict down to the limits"""
+        self.set_many([(key, value)])
+
+    def set_many(self, items: Iterable[Tuple[str, Any]]):
+        """Store several values in one transaction, evicting once at the end"""
+        now = time.time()
+        rows: List[Tuple[str, str]] = [
+            (key, json.dumps(value, separators=(",", ":"))) for key, value in items
+        ]
+        with self._lock, self._transaction():
+            # An upsert rather than INSERT OR REPLACE: the rows REPLACE deletes
+            # do not fire delete triggers
+            self._connection.executemany(
+                "INSERT INTO entries (key, size, accessed) VALUES (?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET size = excluded.size, accessed = excluded.accessed",
+                [(key, len(data), now) for key, data in rows]
+            )
+            self._connection.executemany("INSERT OR REPLACE INTO entry_values (key, value) VALUES (?, ?)", rows)
+            self._evict()
+
+    def delete(self, key: str):
+        with self._lock, self._transaction():
+            self._connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._connection.execute("DELETE FROM entry_values WHERE key = ?", (key,))
+
+    def clear(self):
+        with self._lock, self._transaction():
+            self._connection.execute("DELETE FROM entries")
+            self._connection.execute("DELETE FROM entry_values")
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss/eviction counters and current usage"""
+        with self._lock:
+            entries, size = self._usage()
+        return {**self._stats, "entries": entries, "bytes": size}
+
+    def close(self):
+        self._connection.close()
+
+    def _transaction(self, immediate: bool = False) -> "_Transaction":
+        return _Transaction(self._connection, immediate)
+
+    def _usage(self) -> Tuple[int, int]:
+        return self._connection.execute("SELECT entries, bytes FROM usage").fetchone()
+
+    def _evict(self):
+        entries, size = self._usage()
+        if entries <= self.max_entries and size <= self.max_bytes:
+            return
+
+        victims = []
+        for key, entry_size in self._connection.execute("SELECT key, size FROM entries ORDER BY accessed"):
+            if entries <= self.max_entries and size <= self.max_bytes:
+                break
+            victims.append((key,))
+            entries -= 1
+            size -= entry_size
+
+        self._connection.executemany("DELETE FROM entries WHERE key = ?", victims)
+        self._connection.executemany("DELETE FROM entry_values WHERE key = ?", victims)
+        self._stats["evictions"] += len(victims)
+
+
+class _Transaction:
+    """Explicit BEGIN/COMMIT on an autocommit connection, rolled back on error"""
+
+    def __init__(self, connection: sqlite3.Connection, immediate: bool):
+        self.connection = connection
+        self.immediate = immediate
+
+    def __enter__(self):
+        self.connection.execute("BEGIN IMMEDIATE" if self.immediate else "BEGIN")
+
+    def __exit__(self, exc_type, exc, tb):
+        self.connection.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
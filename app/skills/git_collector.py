@@ -0,0 +1,284 @@
+"""
+Concurrent ``git log`` collection for standup reports.
+
+Runs one ``git log`` subprocess per repository on the asyncio event loop,
+bounded by a semaphore, so total wall time tracks the slowest repository
+rather than the sum of all of them.
+
+Reading a repository is written once, in ``read_commits``, as a generator
+of git commands; ``run_git_steps`` drives it with blocking subprocesses
+and ``GitCommitCollector`` drives it on the event loop.
+"""
+
+import asyncio
+import json
+import os
+import subprocess
+from datetime import date
+from typing import Any, Dict, Generator, Iterator, List, Optional, Sequence, Tuple
+
+from app.skills.disk_cache import DiskCache, default_cache_dir
+
+
+# Unit separator; cannot appear in author names or commit subjects
+FIELD_SEPARATOR = "\x1f"
+LOG_FORMAT = "%H%x1f%an%x1f%ae%x1f%s"
+
+GitResult = Tuple[int, str, str]
+GitSteps = Generator[List[str], GitResult, List[Dict[str, str]]]
+
+
+class GitError(Exception):
+    """A git command failed"""
+
+
+def day_bounds(day: date, last_day: Optional[date] = None) -> Tuple[str, str]:
+    """``--since``/``--until`` values covering whole local calendar days"""
+    return f"{day:%Y-%m-%d} 00:00", f"{last_day or day:%Y-%m-%d} 23:59:59"
+
+
+def git_log_command(
+    repo_path: str,
+    day: date,
+    authors: Sequence[str] = (),
+    log_format: str = LOG_FORMAT,
+    revision: Optional[str] = None,
+    last_day: Optional[date] = None
+) -> List[str]:
+    """Build the ``git log`` argv for one repository, from ``day`` through ``last_day``.
+
+    Authors are matched as fixed strings (several are OR-ed by git), so
+    names containing regex characters filter correctly.
+    """
+    since, until = day_bounds(day, last_day)
+    command = [
+        "git", "-C", repo_path, "log",
+        f"--since={since}",
+        f"--until={until}",
+        f"--pretty=format:{log_format}",
+    ]
+    if authors:
+        command.append("--fixed-strings")
+        command.extend(f"--author={author}" for author in authors)
+    if revision:
+        command.append(revision)
+    return command
+
+
+def parse_log_line(line: str) -> Optional[Dict[str, str]]:
+    parts = line.split(FIELD_SEPARATOR, 3)
+    if len(parts) != 4 or not parts[3].strip():
+        return None
+    sha, author, email, subject = parts
+    return {"sha": sha, "author": author, "email": email, "subject": subject}
+
+
+def parse_log(stdout: str) -> List[Dict[str, str]]:
+    return [commit for commit in map(parse_log_line, stdout.splitlines()) if commit]
+
+
+class CommitCache:
+    """Commits per (repository, day, authors), tagged with the HEAD they were read at"""
+
+    def __init__(self, cache: Optional[DiskCache] = None):
+        self.cache = cache or DiskCache(os.path.join(default_cache_dir(), "commits.sqlite3"))
+
+    @staticmethod
+    def key(repo_path: str, day: date, authors: Sequence[str]) -> str:
+        return json.dumps(["commits", os.path.realpath(repo_path), day.isoformat(), sorted(authors)])
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self.cache.get(key)
+
+    def put(self, key: str, head: str, commits: List[Dict[str, str]]):
+        self.cache.set(key, {"head": head, "commits": commits})
+
+
+def read_commits(
+    repo_path: str,
+    day: date,
+    authors: Sequence[str] = (),
+    cache: Optional[CommitCache] = None
+) -> GitSteps:
+    """Steps to read ``day``'s commits, as a generator of git commands.
+
+    Yields argv lists, receives ``(returncode, stdout, stderr)`` for each
+    and returns the commits. With a cache, an unchanged HEAD costs one
+    ``git rev-parse``; a HEAD that moved forward only logs the new
+    commits, and a rewritten history is read again in full.
+    """
+    revision = None
+    cached = None
+    key = CommitCache.key(repo_path, day, authors)
+
+    if cache is not None:
+        code, stdout, _ = yield ["git", "-C", repo_path, "rev-parse", "--verify", "-q", "HEAD"]
+        revision = stdout.strip() if code == 0 else None
+
+    if revision:
+        cached = cache.get(key)
+        if cached and cached["head"] == revision:
+            return cached["commits"]
+        if cached:
+            code, _, _ = yield ["git", "-C", repo_path, "merge-base", "--is-ancestor", cached["head"], revision]
+            if code == 0:
+                revision = f"{cached['head']}..{revision}"
+            else:
+                cached = None
+
+    code, stdout, stderr = yield git_log_command(repo_path, day, authors, revision=revision)
+    if code != 0:
+        raise GitError(stderr.strip() or f"git exited with {code}")
+
+    commits = parse_log(stdout)
+    if cached:
+        commits.extend(cached["commits"])
+    if revision:
+        cache.put(key, revision.rpartition("..")[2], commits)
+    return commits
+
+
+def iter_git_log(
+    repo_path: str,
+    day: date,
+    last_day: Optional[date] = None,
+    authors: Sequence[str] = ()
+) -> Iterator[Dict[str, str]]:
+    """Stream commits from ``git log`` as they are read from the pipe.
+
+    Memory stays constant however long the range is. Closing the
+    generator early stops git.
+    """
+    process = subprocess.Popen(
+        git_log_command(repo_path, day, authors, last_day=last_day),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        errors="replace",
+    )
+    try:
+        for line in process.stdout:
+            commit = parse_log_line(line.rstrip("\n"))
+            if commit:
+                yield commit
+
+        stderr = process.stderr.read()
+        if process.wait() != 0:
+            raise GitError(stderr.strip() or f"git exited with {process.returncode}")
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        process.stdout.close()
+        process.stderr.close()
+
+
+def run_git_steps(steps: GitSteps) -> List[Dict[str, str]]:
+    """Drive ``read_commits`` with blocking subprocesses"""
+    try:
+        command = next(steps)
+        while True:
+            result = subprocess.run(command, capture_output=True, text=True, shell=False)
+            command = steps.send((result.returncode, result.stdout, result.stderr))
+    except StopIteration as done:
+        return done.value
+
+
+class GitCommitCollector:
+    """Collects commits from many repositories concurrently"""
+
+    def __init__(self, max_concurrency: int = 16, timeout: float = 10.0, cache: Optional[CommitCache] = None):
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout = timeout
+        self.cache = cache
+
+    async def collect(
+        self,
+        repo_paths: Sequence[str],
+        day: date,
+        authors: Optional[Sequence[str]] = None,
+        current_user: bool = False
+    ) -> Dict[str, list]:
+        """Collect commits made on ``day`` across ``repo_paths``.
+
+        ``authors`` restricts the log to those names; ``current_user``
+        restricts each repository to its own ``git config user.name``.
+        A repository that fails or exceeds ``timeout`` is reported in
+        ``errors`` without affecting the others.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        results = await asyncio.gather(*[
+            self._collect_repo(semaphore, path, day, authors, current_user)
+            for path in repo_paths
+        ])
+
+        commits, errors = [], []
+        for repo_commits, error in results:
+            commits.extend(repo_commits)
+            if error:
+                errors.append(error)
+        return {"commits": commits, "errors": errors}
+
+    async def resolve_author(self, repo_path: str, deadline: Optional[float] = None) -> Optional[str]:
+        """The ``user.name`` git would use in ``repo_path``"""
+        code, stdout, _ = await self._run(["git", "-C", repo_path, "config", "user.name"], deadline)
+        name = stdout.strip()
+        return name if code == 0 and name else None
+
+    async def _collect_repo(
+        self,
+        semaphore: asyncio.Semaphore,
+        repo_path: str,
+        day: date,
+        authors: Optional[Sequence[str]],
+        current_user: bool
+    ) -> Tuple[List[Dict[str, str]], Optional[Dict[str, str]]]:
+        repo = os.path.basename(os.path.normpath(repo_path)) or repo_path
+        async with semaphore:
+            # The timeout covers all git calls for the repository, and starts
+            # once it gets a concurrency slot
+            deadline = asyncio.get_running_loop().time() + self.timeout
+            try:
+                names = list(authors or ())
+                if current_user:
+                    author = await self.resolve_author(repo_path, deadline)
+                    if not author:
+                        return [], {"repo": repo_path, "error": "user.name is not configured"}
+                    names = [author]
+
+                commits = await self._run_steps(read_commits(repo_path, day, names, self.cache), deadline)
+            except asyncio.TimeoutError:
+                return [], {"repo": repo_path, "error": f"timed out after {self.timeout:g}s"}
+            except (GitError, OSError) as e:
+                return [], {"repo": repo_path, "error": str(e)}
+
+        for commit in commits:
+            commit["repo"] = repo
+        return commits, None
+
+    async def _run_steps(self, steps: GitSteps, deadline: float) -> List[Dict[str, str]]:
+        try:
+            command = next(steps)
+            while True:
+                command = steps.send(await self._run(command, deadline))
+        except StopIteration as done:
+            return done.value
+
+    async def _run(self, command: List[str], deadline: Optional[float] = None) -> Tuple[int, str, str]:
+        loop = asyncio.get_running_loop()
+        timeout = self.timeout if deadline is None else max(0.0, deadline - loop.time())
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+        except asyncio.TimeoutError:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+            await process.wait()
+            raise
+        return process.returncode, stdout.decode(errors="replace"), stderr.decode(errors="replace")
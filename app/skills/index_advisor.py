@@ -0,0 +1,211 @@
+"""
+Workload-driven index advice for the Database Optimizer Skill.
+
+Takes a captured workload (fingerprints with a sample statement,
+parameters and execution count), collects the indexes suggested by the
+plans of its reads, and evaluates each candidate on a scratch copy of the
+database: the candidate is built, every statement touching its table is
+re-timed, and the index is dropped again before the next one.
+"""
+
+import re
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, List, Tuple
+
+from app.models.statements import statement_kind
+from app.skills.query_plan import (
+    TABLE_REFERENCE,
+    PlanAnalysis,
+    create_index_sql,
+    explain,
+    table_columns,
+    table_indexes,
+    time_query,
+)
+
+
+# Name the candidate is built under on the scratch copy
+CANDIDATE_INDEX = "ix_advisor_candidate"
+
+# Per-execution differences smaller than this are timing noise
+NOISE_FLOOR_MS = 0.05
+
+Candidate = Tuple[str, Tuple[str, ...]]
+
+
+class IndexAdvisor:
+    """Proposes and measures candidate indexes for a workload on a scratch connection"""
+
+    def __init__(
+        self,
+        connection: sqlite3.Connection,
+        workload: Iterable[Dict[str, Any]],
+        runs: int = 5,
+        min_gain: float = 0.1
+    ):
+        self.connection = connection
+        self.runs = runs
+        self.min_gain = min_gain
+        self.skipped: List[Dict[str, str]] = []
+        self.entries = self._replayable(workload)
+
+    def advise(self, max_candidates: int = 10) -> Dict[str, Any]:
+        baseline = self._baseline()
+        candidates = self._candidates(baseline)[:max_candidates]
+        evaluated = [self._evaluate(table, columns, baseline) for table, columns in candidates]
+        evaluated.sort(key=lambda candidate: candidate.get("net_saved_ms", float("-inf")), reverse=True)
+
+        return {
+            "fingerprints": len(self.entries) + len(self.skipped),
+            "replayed": len(self.entries),
+            "skipped": self.skipped,
+            "baseline": [
+                {
+                    "fingerprint": entry["fingerprint"],
+                    "count": entry["count"],
+                    "median_ms": baseline[entry["fingerprint"]],
+                }
+                for entry in self.entries
+            ],
+            "candidates": evaluated,
+            "recommended": [candidate["ddl"] for candidate in evaluated if candidate.get("recommended")],
+            "status": "analyzed"
+        }
+
+    def _replayable(self, workload: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        entries = []
+        for entry in workload:
+            statement = entry.get("statement", "")
+            key = entry.get("fingerprint") or statement
+            kind = entry.get("kind") or statement_kind(statement)
+            if kind not in ("read", "write"):
+                continue
+            params = entry.get("params") or []
+            if statement.count("?") != len(params) and not isinstance(params, dict):
+                self.skipped.append({"fingerprint": key, "reason": "sample parameters do not match the statement"})
+                continue
+            try:
+                explain(self.connection, statement, params)
+            except sqlite3.Error as e:
+                self.skipped.append({"fingerprint": key, "reason": str(e)})
+                continue
+            entries.append({
+                **entry,
+                "fingerprint": key,
+                "kind": kind,
+                "params": params,
+                "count": entry.get("count", 1),
+                "tables": self._tables(statement),
+            })
+        return entries
+
+    def _baseline(self) -> Dict[str, float]:
+        """Median latency per fingerprint; statements that fail on replay are skipped"""
+        baseline, replayed = {}, []
+        for entry in self.entries:
+            try:
+                baseline[entry["fingerprint"]] = self._time(entry)
+            except sqlite3.Error as e:
+                # e.g. an INSERT whose sample row already exists
+                self.skipped.append({"fingerprint": entry["fingerprint"], "reason": str(e)})
+                continue
+            replayed.append(entry)
+        self.entries = replayed
+        return baseline
+
+    def _tables(self, statement: str) -> List[str]:
+        tables = []
+        for match in TABLE_REFERENCE.finditer(statement):
+            table = match["table"]
+            if table not in tables and table_columns(self.connection, table):
+                tables.append(table)
+        return tables
+
+    def _time(self, entry: Dict[str, Any]) -> float:
+        return time_query(self.connection, entry["statement"], entry["params"], self.runs)["median_ms"]
+
+    def _candidates(self, baseline: Dict[str, float]) -> List[Candidate]:
+        """Indexes suggested by the read plans, weighted by the time their queries take overall"""
+        weights: Dict[Candidate, float] = {}
+        for entry in self.entries:
+            if entry["kind"] != "read":
+                continue
+            analysis = PlanAnalysis(
+                self.connection, entry["statement"], explain(self.connection, entry["statement"], entry["params"])
+            ).run()
+            for table, columns in analysis.candidate_indexes():
+                known = table_columns(self.connection, table)
+                if not columns or any(column not in known for column in columns):
+                    continue
+                weight = baseline[entry["fingerprint"]] * entry["count"]
+                weights[(table, columns)] = weights.get((table, columns), 0.0) + weight
+        return sorted(weights, key=weights.get, reverse=True)
+
+    def _evaluate(self, table: str, columns: Tuple[str, ...], baseline: Dict[str, float]) -> Dict[str, Any]:
+        ddl = create_index_sql(table, columns)
+        existing = len(table_indexes(self.connection, table))
+        pages_before = self._used_pages()
+        try:
+            start = time.perf_counter()
+            self.connection.execute(f"CREATE INDEX {CANDIDATE_INDEX} ON {table} ({', '.join(columns)})")
+            build_ms = (time.perf_counter() - start) * 1000
+        except sqlite3.Error as e:
+            return {"ddl": ddl, "table": table, "columns": list(columns), "error": str(e), "recommended": False}
+
+        try:
+            self.connection.execute(f"ANALYZE {CANDIDATE_INDEX}")
+            size_bytes = (self._used_pages() - pages_before) * self._page_size()
+            statements = [
+                self._compare(entry, baseline[entry["fingerprint"]])
+                for entry in self.entries if table in entry["tables"]
+            ]
+        finally:
+            self.connection.execute(f"DROP INDEX {CANDIDATE_INDEX}")
+
+        # Only reads whose plan picked the index and got measurably faster
+        # count as savings; the rest differ by timing noise alone
+        improved = [
+            s for s in statements
+            if s["kind"] == "read" and s["uses_index"] and s["before_ms"] - s["after_ms"] >= NOISE_FLOOR_MS
+        ]
+        writes = [s for s in statements if s["kind"] == "write"]
+        read_saved_ms = sum(s["count"] * (s["before_ms"] - s["after_ms"]) for s in improved)
+        write_extra_ms = sum(s["count"] * max(0.0, s["after_ms"] - s["before_ms"]) for s in writes)
+        best_gain = max(((s["before_ms"] - s["after_ms"]) / s["before_ms"] for s in improved), default=0.0)
+
+        return {
+            "ddl": ddl,
+            "table": table,
+            "columns": list(columns),
+            "build_ms": round(build_ms, 3),
+            "size_bytes": size_bytes,
+            "statements": statements,
+            "read_saved_ms": round(read_saved_ms, 3),
+            "write_amplification": {
+                "writes": sum(s["count"] for s in writes),
+                "extra_ms": round(write_extra_ms, 3),
+                # B-trees each inserted or deleted row touches: the table plus its indexes
+                "btrees_per_row": {"before": existing + 1, "after": existing + 2},
+            },
+            "net_saved_ms": round(read_saved_ms - write_extra_ms, 3),
+            "recommended": read_saved_ms > write_extra_ms and best_gain >= self.min_gain,
+        }
+
+    def _compare(self, entry: Dict[str, Any], before_ms: float) -> Dict[str, Any]:
+        plan = explain(self.connection, entry["statement"], entry["params"])
+        return {
+            "fingerprint": entry["fingerprint"],
+            "kind": entry["kind"],
+            "count": entry["count"],
+            "before_ms": before_ms,
+            "after_ms": self._time(entry),
+            "uses_index": any(re.search(rf"\b{CANDIDATE_INDEX}\b", step["detail"]) for step in plan),
+        }
+
+    def _used_pages(self) -> int:
+        pages = self.connection.execute("PRAGMA page_count").fetchone()[0]
+        return pages - self.connection.execute("PRAGMA freelist_count").fetchone()[0]
+
+    def _page_size(self) -> int:
+        return self.connection.execute("PRAGMA page_size").fetchone()[0]
@@ -0,0 +1,400 @@
+"""
+AST scanner for SQLModel/SQLAlchemy access patterns that cost round trips.
+
+Per function it finds:
+
+- ``n_plus_one``: a session query (``get``, ``exec``, ``execute``, ...)
+  inside a loop or comprehension, i.e. one query per item;
+- ``python_filtering``: rows loaded with ``.all()`` and then filtered,
+  counted, sorted or sliced in Python instead of in SQL;
+- ``commit_in_loop``: ``session.commit()`` once per item.
+
+A ``while`` loop whose queries page with ``.limit()`` or ``.offset()``
+fetches a batch per iteration, so neither its queries nor a commit per
+batch are reported; any other ``while`` loop is treated like a ``for``.
+Loops over a literal collection (or a name bound to one) run a fixed
+number of times and are skipped too, as are commits on a session opened
+inside the loop. Loaded rows that are counted or sliced are only reported
+when the query has no LIMIT and that is all the function does with them.
+"""
+
+import ast
+import os
+import re
+from collections import Counter
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from app.skills.code_review import balanced_chunks
+from app.skills.source_tree import DEFAULT_MAX_FILE_SIZE, iter_python_files
+
+
+# Receivers treated as a session: session, db_session, self.session, db, ...
+SESSION_NAME = re.compile(r"(?:^|_)(?:session|db)$", re.IGNORECASE)
+
+# Every finding needs such a receiver, so files without one are not parsed
+SESSION_TEXT = re.compile(r"(?:\b|_)(?:session|db)\s*\.", re.IGNORECASE)
+
+QUERY_METHODS = {"get", "exec", "execute", "scalar", "scalars", "query", "refresh"}
+
+Finding = Dict[str, object]
+
+_LITERALS = (ast.Tuple, ast.List, ast.Set, ast.Dict)
+
+
+def finding(type_: str, severity: str, line: int, issue: str, recommendation: str, example: str) -> Finding:
+    return {
+        "type": type_,
+        "severity": severity,
+        "line": line,
+        "issue": issue,
+        "recommendation": recommendation,
+        "example": example,
+    }
+
+
+def is_session(node: ast.AST) -> bool:
+    name = node.id if isinstance(node, ast.Name) else node.attr if isinstance(node, ast.Attribute) else None
+    return bool(name) and bool(SESSION_NAME.search(name))
+
+
+def session_call(node: ast.AST, methods: Set[str]) -> Optional[str]:
+    """``method`` if ``node`` is ``<session>.method(...)`` for one of ``methods``"""
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute):
+        if node.func.attr in methods and is_session(node.func.value):
+            return node.func.attr
+    return None
+
+
+def loads_all_rows(node: ast.AST) -> bool:
+    """Whether ``node`` is a ``.all()`` call on a chain that starts with a session query"""
+    if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr == "all"):
+        return False
+    current = node.func.value
+    while isinstance(current, (ast.Call, ast.Attribute)):
+        if session_call(current, QUERY_METHODS):
+            return True
+        current = current.func if isinstance(current, ast.Call) else current.value
+    return False
+
+
+class _Scanner(ast.NodeVisitor):
+    def __init__(self):
+        self.findings: List[Finding] = []
+        # Enclosing per-item loops of the current function, innermost last
+        self.loops: List[ast.AST] = []
+        # Names bound by ``with ... as`` inside each of those loops
+        self.loop_sessions: List[Set[str]] = []
+        # Per function: names holding ``.all()`` results -> line loaded,
+        # names bound to literal collections or to LIMITed queries, and the
+        # function node (to count reads of a name when needed)
+        self.loaded: List[Dict[str, int]] = []
+        self.literals: List[Set[str]] = []
+        self.paged: List[Set[str]] = []
+        self.scopes: List[ast.AST] = []
+        self._reads: Dict[int, Counter] = {}
+
+    def scan(self, tree: ast.AST) -> List[Finding]:
+        self._enter_scope(tree)
+        self.visit(tree)
+        self.findings.sort(key=lambda f: (f["line"], f["type"]))
+        return self.findings
+
+    def _enter_scope(self, node: ast.AST):
+        self.loaded.append({})
+        self.literals.append(set())
+        self.paged.append(set())
+        self.scopes.append(node)
+
+    def _visit_function(self, node):
+        loops, sessions = self.loops, self.loop_sessions
+        self.loops, self.loop_sessions = [], []
+        self._enter_scope(node)
+        self.generic_visit(node)
+        self.loaded.pop()
+        self.literals.pop()
+        self.paged.pop()
+        self.scopes.pop()
+        self.loops, self.loop_sessions = loops, sessions
+
+    visit_FunctionDef = visit_AsyncFunctionDef = visit_Lambda = _visit_function
+
+    def visit_For(self, node):
+        # The iterable is evaluated once, before the loop starts
+        self.visit(node.iter)
+        self._check_filtered_loop(node)
+        if self._bounded(node.iter):
+            self._visit_all(node.body)
+        else:
+            self._in_loop(node, node.body)
+        self._visit_all(node.orelse)
+
+    visit_AsyncFor = visit_For
+
+    def visit_While(self, node):
+        self.visit(node.test)
+        if _pages(node):
+            self._visit_all(node.body)
+        else:
+            self._in_loop(node, node.body)
+        self._visit_all(node.orelse)
+
+    def _visit_comprehension(self, node):
+        first, *rest = node.generators
+        self.visit(first.iter)
+        self._check_filtered_comprehension(node)
+        elements = [node.key, node.value] if isinstance(node, ast.DictComp) else [node.elt]
+        inner = [*first.ifs, *(part for g in rest for part in (g.iter, *g.ifs)), *elements]
+        if self._bounded(first.iter):
+            self._visit_all(inner)
+        else:
+            self._in_loop(node, inner)
+
+    visit_ListComp = visit_SetComp = visit_DictComp = visit_GeneratorExp = _visit_comprehension
+
+    def visit_With(self, node):
+        if self.loop_sessions:
+            for item in node.items:
+                if isinstance(item.optional_vars, ast.Name):
+                    self.loop_sessions[-1].add(item.optional_vars.id)
+        self.generic_visit(node)
+
+    visit_AsyncWith = visit_With
+
+    def visit_Assign(self, node):
+        self.visit(node.value)
+        for target in node.targets:
+            if isinstance(target, ast.Name):
+                if loads_all_rows(node.value):
+                    self.loaded[-1][target.id] = node.lineno
+                else:
+                    self.loaded[-1].pop(target.id, None)
+                if _has_limit(node.value):
+                    self.paged[-1].add(target.id)
+                else:
+                    self.paged[-1].discard(target.id)
+                if isinstance(node.value, _LITERALS):
+                    self.literals[-1].add(target.id)
+                else:
+                    self.literals[-1].discard(target.id)
+            self.visit(target)
+
+    def visit_Call(self, node):
+        method = session_call(node, QUERY_METHODS)
+        if method and self.loops:
+            self._add(
+                "n_plus_one", "high", node.lineno,
+                f"session.{method}() inside a loop (line {self.loops[-1].lineno}) runs one query per item",
+                "Load every item in one query with an IN filter or a join; bulk-update with executemany",
+                "session.exec(select(Task).where(Task.id.in_(ids))).all()"
+            )
+
+        if session_call(node, {"commit"}) and self.loops:
+            receiver = node.func.value
+            opened_here = isinstance(receiver, ast.Name) and any(receiver.id in names for names in self.loop_sessions)
+            if not opened_here:
+                self._add(
+                    "commit_in_loop", "high", node.lineno,
+                    f"session.commit() inside a loop (line {self.loops[-1].lineno}) commits once per item",
+                    "Commit once after the loop, or once per batch of rows",
+                    "for task in tasks:\n    session.add(task)\nsession.commit()"
+                )
+
+        if isinstance(node.func, ast.Name) and node.args and self._loaded_line(node.args[-1]):
+            self._check_builtin(node)
+        self.generic_visit(node)
+
+    def visit_Subscript(self, node):
+        line = self._loaded_line(node.value)
+        if line and isinstance(node.slice, (ast.Slice, ast.Constant)) and self._only_use(node.value):
+            self._add(
+                "python_filtering", "medium", node.lineno,
+                f"Rows loaded with .all() (line {line}) are sliced in Python",
+                "Use .limit() / .offset() or .first() so only the needed rows are read",
+                "session.exec(select(Task).limit(10)).all()"
+            )
+        self.generic_visit(node)
+
+    def _check_builtin(self, node: ast.Call):
+        line = self._loaded_line(node.args[-1])
+        if node.func.id == "filter":
+            issue, recommendation, example = (
+                "filtered in Python", "Move the condition into .where()",
+                "select(Task).where(Task.status == TaskStatus.TODO)"
+            )
+        elif node.func.id == "len" and self._only_use(node.args[-1]):
+            issue, recommendation, example = (
+                "counted in Python", "Count in SQL",
+                "session.exec(select(func.count()).select_from(Task)).one()"
+            )
+        elif node.func.id in ("sorted", "max", "min"):
+            issue, recommendation, example = (
+                "ordered in Python", "Use .order_by() (with .limit() for max/min)",
+                "select(Task).order_by(Task.due_date).limit(1)"
+            )
+        else:
+            return
+        self._add(
+            "python_filtering", "medium", node.lineno,
+            f"Rows loaded with .all() (line {line}) are {issue} with {node.func.id}()",
+            recommendation, example
+        )
+
+    def _check_filtered_comprehension(self, node):
+        first = node.generators[0]
+        line = self._loaded_line(first.iter)
+        if line and first.ifs:
+            self._add(
+                "python_filtering", "medium", node.lineno,
+                f"Rows loaded with .all() (line {line}) are filtered in a comprehension",
+                "Move the condition into .where() so unmatched rows are never loaded",
+                "select(Task).where(Task.status == TaskStatus.TODO)"
+            )
+
+    def _check_filtered_loop(self, node):
+        line = self._loaded_line(node.iter)
+        if not line or not node.body:
+            return
+        head = node.body[0]
+        skips = isinstance(head, ast.If) and not head.orelse and len(head.body) == 1 \
+            and isinstance(head.body[0], ast.Continue)
+        guards = len(node.body) == 1 and isinstance(head, ast.If) and not head.orelse
+        if skips or guards:
+            self._add(
+                "python_filtering", "medium", node.lineno,
+                f"Rows loaded with .all() (line {line}) are filtered inside the loop",
+                "Move the condition into .where() so unmatched rows are never loaded",
+                "select(Task).where(Task.status == TaskStatus.TODO)"
+            )
+
+    def _bounded(self, iterable: ast.AST) -> bool:
+        """Whether a loop runs over a literal collection, directly or through a name or its items()"""
+        if isinstance(iterable, _LITERALS):
+            return True
+        if isinstance(iterable, ast.Call) and isinstance(iterable.func, ast.Attribute) \
+                and iterable.func.attr in ("items", "keys", "values"):
+            iterable = iterable.func.value
+        return isinstance(iterable, ast.Name) and iterable.id in self.literals[-1]
+
+    def _only_use(self, node: ast.AST) -> bool:
+        """Whether ``node`` loads an unlimited query only to be used here: the
+        ``.all()`` call itself, or a name read nowhere else in the function"""
+        if isinstance(node, ast.Name):
+            return node.id not in self.paged[-1] and self._read_count(node.id) == 1
+        return not _has_limit(node)
+
+    def _read_count(self, name: str) -> int:
+        scope = self.scopes[-1]
+        reads = self._reads.get(id(scope))
+        if reads is None:
+            reads = self._reads[id(scope)] = Counter(
+                child.id for child in ast.walk(scope) if isinstance(child, ast.Name) and isinstance(child.ctx, ast.Load)
+            )
+        return reads[name]
+
+    def _loaded_line(self, node: ast.AST) -> Optional[int]:
+        if loads_all_rows(node):
+            return node.lineno
+        if isinstance(node, ast.Name):
+            return self.loaded[-1].get(node.id)
+        return None
+
+    def _in_loop(self, loop: ast.AST, nodes: Sequence[ast.AST]):
+        self.loops.append(loop)
+        self.loop_sessions.append(set())
+        self._visit_all(nodes)
+        self.loop_sessions.pop()
+        self.loops.pop()
+
+    def _visit_all(self, nodes: Sequence[ast.AST]):
+        for child in nodes:
+            self.visit(child)
+
+    def _add(self, type_: str, severity: str, line: int, issue: str, recommendation: str, example: str):
+        if not any(f["type"] == type_ and f["line"] == line for f in self.findings):
+            self.findings.append(finding(type_, severity, line, issue, recommendation, example))
+
+
+def _calls(node: ast.AST, methods: Set[str]) -> bool:
+    return any(
+        isinstance(child, ast.Call) and isinstance(child.func, ast.Attribute) and child.func.attr in methods
+        for child in ast.walk(node)
+    )
+
+
+def _has_limit(node: ast.AST) -> bool:
+    return _calls(node, {"limit"})
+
+
+def _pages(loop: ast.While) -> bool:
+    """Whether a ``while`` loop reads a batch of rows per iteration"""
+    return any(_calls(child, {"limit", "offset"}) for child in (loop.test, *loop.body))
+
+
+def scan_source(code: str) -> List[Finding]:
+    """Findings for one module's source; raises ``SyntaxError``, or ``ValueError``
+    on Python versions that reject null bytes that way"""
+    if not SESSION_TEXT.search(code):
+        return []
+    return _Scanner().scan(ast.parse(code))
+
+
+def scan_file(path: str) -> Tuple[List[Finding], Optional[str]]:
+    """``(findings, error)`` for one file, each finding tagged with the path"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            code = f.read()
+        findings = scan_source(code)
+    except (OSError, UnicodeDecodeError) as e:
+        return [], f"Could not read file: {e}"
+    except (SyntaxError, ValueError) as e:
+        return [], f"Syntax error: {e}"
+    return [{"file": path, **item} for item in findings], None
+
+
+def _scan_chunk(paths: List[Tuple[int, str]]) -> List[Tuple[int, str, List[Finding], Optional[str]]]:
+    """Worker entry point: scan a chunk of files"""
+    return [(i, path, *scan_file(path)) for i, path in paths]
+
+
+def scan_package(
+    path: str,
+    max_workers: Optional[int] = 1,
+    executor: Optional[Executor] = None,
+    exclude: Sequence[str] = (),
+    max_file_size: Optional[int] = DEFAULT_MAX_FILE_SIZE
+) -> Iterator[Tuple[str, List[Finding], Optional[str]]]:
+    """``(path, findings, error)`` per Python file under ``path``, in path order.
+
+    With ``max_workers`` other than 1 (None means one per CPU) files are
+    scanned over a process pool in chunks of similar total size; each result
+    is yielded once every file before it in path order has been scanned.
+    """
+    paths = sorted(iter_python_files(path, exclude, max_file_size)) if os.path.isdir(path) else [path]
+    workers = max_workers or os.cpu_count() or 1
+
+    if workers == 1 and executor is None:
+        for file_path in paths:
+            yield (file_path, *scan_file(file_path))
+        return
+
+    owned = executor is None
+    pool = executor or ProcessPoolExecutor(max_workers=workers)
+    results: List[Optional[tuple]] = [None] * len(paths)
+    try:
+        futures = [
+            pool.submit(_scan_chunk, chunk)
+            for chunk in balanced_chunks(list(enumerate(paths)), workers * 4)
+            if chunk
+        ]
+        next_index = 0
+        for future in as_completed(futures):
+            for i, file_path, findings, error in future.result():
+                results[i] = (file_path, findings, error)
+            while next_index < len(results) and results[next_index] is not None:
+                yield results[next_index]
+                results[next_index] = None
+                next_index += 1
+    finally:
+        if owned:
+            pool.shutdown(cancel_futures=True)
@@ -0,0 +1,435 @@
+"""
+SQLite query plan analysis for the Database Optimizer Skill.
+
+Runs ``EXPLAIN QUERY PLAN`` against a real schema, usually on an
+in-memory copy made with the SQLite backup API so statistics can be
+gathered and statements timed without touching the live database. Row
+estimates come from ``sqlite_stat1``.
+"""
+
+import re
+import sqlite3
+import statistics
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+# Scans over fewer rows than this are reported as low severity
+FULL_SCAN_ROWS = 1000
+
+# Without better statistics a range bound is assumed to keep a quarter
+# of the rows, as SQLite's own planner does
+RANGE_SELECTIVITY = 4
+
+ACCESS_STEP = re.compile(
+    r"^(?P<op>SCAN|SEARCH) (?P<name>\S+)"
+    r"(?: USING (?:(?P<covering>COVERING )?INDEX (?P<index>\S+)"
+    r"|(?P<automatic>AUTOMATIC (?:PARTIAL )?COVERING INDEX)"
+    r"|(?P<pk>INTEGER PRIMARY KEY|PRIMARY KEY))?)?"
+    r"(?: \((?P<terms>.*)\))?"
+)
+TEMP_BTREE = re.compile(r"^USE TEMP B-TREE FOR (?P<purpose>.+)$")
+TABLE_REFERENCE = re.compile(
+    r'\b(?:FROM|JOIN|UPDATE|INTO)\s+["`\[]?(?P<table>\w+)["`\]]?(?:\s+(?:AS\s+)?(?P<alias>\w+))?',
+    re.IGNORECASE
+)
+NOT_ALIASES = {
+    "WHERE", "JOIN", "LEFT", "RIGHT", "INNER", "OUTER", "CROSS", "FULL", "NATURAL", "ON", "USING",
+    "GROUP", "ORDER", "LIMIT", "SET", "VALUES", "UNION", "EXCEPT", "INTERSECT", "HAVING", "WINDOW",
+}
+PREDICATE_COLUMN = re.compile(
+    r'(?:\b(?P<alias>\w+)\.)?["`]?(?P<column>\w+)["`]?\s*(?:=|<|>|<=|>=|!=|\bIN\b|\bLIKE\b|\bBETWEEN\b|\bIS\b)',
+    re.IGNORECASE
+)
+LIMIT = re.compile(r"\bLIMIT\s+(?:\d+|\?)", re.IGNORECASE)
+WHERE_CLAUSE = re.compile(
+    r"\bWHERE\b(?P<clause>.+?)(?:\bGROUP\s+BY\b|\bORDER\s+BY\b|\bLIMIT\b|\bRETURNING\b|$)",
+    re.IGNORECASE | re.DOTALL
+)
+LEADING_WILDCARD = re.compile(r'(?:\b\w+\.)?["`]?(?P<column>\w+)["`]?\s+LIKE\s+[\'"]%', re.IGNORECASE)
+IDENTIFIER = re.compile(r"(?:\b(?P<alias>\w+)\.)?\b(?P<column>[A-Za-z_]\w*)\b")
+ORDER_BY = re.compile(r"\bORDER\s+BY\s+(?P<columns>.+?)(?:\bLIMIT\b|\bOFFSET\b|$)", re.IGNORECASE | re.DOTALL)
+
+
+def open_database(database: Any, copy: bool = True) -> Tuple[sqlite3.Connection, bool, Callable[[], None]]:
+    """Connect to ``database`` and return ``(connection, is_copy, close)``.
+
+    ``database`` is a file path, a ``sqlite:///`` URL, a ``sqlite3``
+    connection or a SQLAlchemy engine. With ``copy`` the connection is an
+    in-memory copy; otherwise a path is opened read-only. Call ``close``
+    when done: it closes what was opened here, returns an engine's
+    connection to its pool and leaves a caller's connection open.
+    """
+    if isinstance(database, sqlite3.Connection):
+        source, close = database, _keep_open
+    elif hasattr(database, "raw_connection"):
+        raw = database.raw_connection()
+        source, close = raw.driver_connection, raw.close
+    else:
+        path = str(database)
+        if path.startswith("sqlite:///"):
+            path = path[len("sqlite:///"):]
+        source = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        close = source.close
+
+    if not copy:
+        return source, False, close
+
+    scratch = sqlite3.connect(":memory:")
+    try:
+        source.backup(scratch)
+    finally:
+        close()
+    return scratch, True, scratch.close
+
+
+def _keep_open():
+    pass
+
+
+def explain(connection: sqlite3.Connection, query: str, params: Sequence = ()) -> List[Dict[str, Any]]:
+    return [
+        {"id": node_id, "parent": parent, "detail": detail}
+        for node_id, parent, _, detail in connection.execute(f"EXPLAIN QUERY PLAN {query}", params)
+    ]
+
+
+def ensure_statistics(connection: sqlite3.Connection) -> bool:
+    """Run ANALYZE unless ``sqlite_stat1`` already has rows; only call on a copy"""
+    exists = connection.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'"
+    ).fetchone()
+    if exists and connection.execute("SELECT 1 FROM sqlite_stat1 LIMIT 1").fetchone():
+        return False
+    connection.execute("ANALYZE")
+    return True
+
+
+def table_statistics(connection: sqlite3.Connection) -> Dict[str, Dict[Optional[str], List[int]]]:
+    """``sqlite_stat1`` as {table: {index or None: [rows, rows per key prefix...]}}"""
+    exists = connection.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'"
+    ).fetchone()
+    if not exists:
+        return {}
+
+    stats: Dict[str, Dict[Optional[str], List[int]]] = {}
+    for table, index, stat in connection.execute("SELECT tbl, idx, stat FROM sqlite_stat1"):
+        numbers = []
+        for part in (stat or "").split():
+            if not part.isdigit():
+                break
+            numbers.append(int(part))
+        if numbers:
+            stats.setdefault(table, {})[index] = numbers
+    return stats
+
+
+def table_indexes(connection: sqlite3.Connection, table: str) -> Dict[str, List[str]]:
+    """Index name -> indexed columns, in order"""
+    indexes = {}
+    for row in connection.execute(f'PRAGMA index_list("{table}")'):
+        name = row[1]
+        indexes[name] = [info[2] for info in connection.execute(f'PRAGMA index_info("{name}")')]
+    return indexes
+
+
+def table_columns(connection: sqlite3.Connection, table: str) -> List[str]:
+    return [row[1] for row in connection.execute(f'PRAGMA table_info("{table}")')]
+
+
+def time_query(
+    connection: sqlite3.Connection,
+    query: str,
+    params: Sequence = (),
+    runs: int = 5
+) -> Dict[str, Any]:
+    """Median and best wall time over ``runs`` executions, rows fetched included.
+
+    Each run happens inside a savepoint that is rolled back, so writes
+    leave the database unchanged.
+    """
+    timings = []
+    rows = 0
+    for _ in range(max(1, runs)):
+        connection.execute("SAVEPOINT timing")
+        try:
+            start = time.perf_counter()
+            rows = len(connection.execute(query, params).fetchall())
+            timings.append((time.perf_counter() - start) * 1000)
+        finally:
+            connection.execute("ROLLBACK TO timing")
+            connection.execute("RELEASE timing")
+    return {
+        "runs": len(timings),
+        "median_ms": round(statistics.median(timings), 3),
+        "min_ms": round(min(timings), 3),
+        "rows": rows,
+    }
+
+
+class PlanAnalysis:
+    """Findings for one query plan, in the optimizer's recommendation schema"""
+
+    def __init__(self, connection: sqlite3.Connection, query: str, plan: List[Dict[str, Any]]):
+        self.connection = connection
+        self.query = query
+        self.plan = plan
+        self.stats = table_statistics(connection)
+        self.aliases = self._aliases()
+        self.recommendations: List[Dict[str, str]] = []
+        self.estimated_rows: Optional[int] = 0
+        self.indexes_used: List[str] = []
+        # (table, columns) of every index suggested in an example
+        self.candidates: List[Tuple[str, Tuple[str, ...]]] = []
+        # An unsorted plan under LIMIT stops scanning early
+        self.stops_early = bool(LIMIT.search(query)) and not any(
+            TEMP_BTREE.match(step["detail"]) for step in plan
+        )
+
+    def run(self) -> "PlanAnalysis":
+        # Rows touched: each access step runs once per row produced by the
+        # steps before it under the same parent (nested loop joins)
+        loops: Dict[int, int] = {0: 1}
+        scanned_tables = []
+        estimates_known = True
+
+        for step in self.plan:
+            detail = step["detail"]
+            outer = loops.get(step["parent"], 1)
+            access = ACCESS_STEP.match(detail)
+
+            if access:
+                table = self.aliases.get(access["name"], access["name"])
+                rows = self._estimate(table, access)
+                step["table"] = table
+                step["estimated_rows"] = rows
+                if rows is None:
+                    estimates_known = False
+                    rows = 1
+                self.estimated_rows += outer * rows
+                loops[step["parent"]] = outer * max(rows, 1)
+                self._check_access(table, access, rows)
+                if access["op"] == "SCAN" and not access["index"]:
+                    scanned_tables.append(table)
+            elif detail.startswith("CORRELATED"):
+                loops[step["id"]] = outer
+                self._add(
+                    "correlated_subquery", "medium",
+                    "Correlated subquery runs once per outer row",
+                    "Rewrite it as a JOIN or a grouped subquery joined once",
+                    "SELECT t.id, d.n FROM task t LEFT JOIN (SELECT task_id, COUNT(*) n FROM "
+                    "task_dependency GROUP BY task_id) d ON d.task_id = t.id"
+                )
+            else:
+                loops[step["id"]] = 1 if "SUBQUERY" in detail or detail.startswith("MATERIALIZE") else outer
+                temp = TEMP_BTREE.match(detail)
+                if temp:
+                    self._check_temp_btree(temp["purpose"])
+
+        for table in dict.fromkeys(scanned_tables):
+            self._check_unused_indexes(table)
+
+        if not estimates_known:
+            self.estimated_rows = None
+        return self
+
+    def _aliases(self) -> Dict[str, str]:
+        aliases = {}
+        for match in TABLE_REFERENCE.finditer(self.query):
+            table, alias = match["table"], match["alias"]
+            aliases[table] = table
+            if alias and alias.upper() not in NOT_ALIASES:
+                aliases[alias] = table
+        return aliases
+
+    def _estimate(self, table: str, access: re.Match) -> Optional[int]:
+        table_stats = self.stats.get(table)
+        if not table_stats:
+            return None
+        total = next(iter(table_stats.values()))[0]
+
+        if access["op"] == "SCAN" or not access["terms"]:
+            return total
+
+        terms = [term.strip() for term in access["terms"].split(" AND ")]
+        equalities = sum(1 for term in terms if term.endswith("=?") and not term.endswith("!=?"))
+        ranged = len(terms) > equalities
+
+        if access["pk"]:
+            rows = 1 if equalities else total
+        elif access["index"] and access["index"] in table_stats:
+            per_key = table_stats[access["index"]]
+            rows = per_key[min(equalities, len(per_key) - 1)]
+        else:
+            rows = total
+        return max(1, rows // RANGE_SELECTIVITY) if ranged else rows
+
+    def _check_access(self, table: str, access: re.Match, rows: int):
+        if access["automatic"]:
+            columns = self._term_columns(access["terms"])
+            self._add(
+                "automatic_index", "high",
+                f"SQLite builds a temporary index on {table} for every execution",
+                "Create a permanent index on the join columns",
+                self._suggest_index(table, columns)
+            )
+            return
+
+        if access["op"] != "SCAN":
+            if access["index"]:
+                self.indexes_used.append(access["index"])
+            return
+
+        if access["index"]:
+            self.indexes_used.append(access["index"])
+            leading = (table_indexes(self.connection, table).get(access["index"]) or ["column"])[0]
+            if leading in self._where_columns(table):
+                self._add(
+                    "unused_index", "high" if rows >= FULL_SCAN_ROWS else "low",
+                    f"Reads every entry of index {access['index']} although {leading} is filtered",
+                    "Make the predicate on the indexed column sargable so the scan becomes a search",
+                    f"WHERE {leading} = ? instead of WHERE LOWER({leading}) = ?"
+                )
+            elif rows >= FULL_SCAN_ROWS and not self.stops_early:
+                self._add(
+                    "full_index_scan", "low",
+                    f"Reads every entry of index {access['index']} (~{rows} rows)",
+                    "Filter on the index's leading column to turn the scan into a search",
+                    f"SELECT ... FROM {table} WHERE {leading} = ?"
+                )
+            return
+
+        wildcards = {match["column"] for match in LEADING_WILDCARD.finditer(self.query)}
+        columns = [column for column in self._predicate_columns(table) if column not in wildcards]
+        severity = "high" if rows >= FULL_SCAN_ROWS and not self.stops_early else "low"
+        issue = f"Full table scan of {table} (~{rows} rows{', stops at LIMIT' if self.stops_early else ''})"
+
+        if columns:
+            self._add(
+                "full_scan", severity, issue,
+                "Add an index on the filtered columns",
+                self._suggest_index(table, columns)
+            )
+        elif wildcards & set(table_columns(self.connection, table)):
+            self._add(
+                "full_scan", severity, issue,
+                "A LIKE pattern with a leading wildcard cannot use an index; use an FTS5 table for substring search",
+                f"CREATE VIRTUAL TABLE {table}_fts USING fts5({', '.join(sorted(wildcards))})"
+            )
+        else:
+            self._add(
+                "full_scan", severity, issue,
+                "Filter the query or add LIMIT; nothing in it can use an index",
+                f"SELECT ... FROM {table} WHERE ... LIMIT 100"
+            )
+
+    def _check_temp_btree(self, purpose: str):
+        columns = []
+        table = None
+        order_by = ORDER_BY.search(self.query)
+        if order_by and "ORDER BY" in purpose:
+            for term in order_by["columns"].split(","):
+                name = term.strip().split()[0] if term.strip() else ""
+                alias, _, column = name.rpartition(".")
+                table = table or self.aliases.get(alias) or next(iter(self.aliases.values()), None)
+                columns.append(column.strip('"`'))
+        if not (table and columns):
+            self._add(
+                "temp_btree", "medium",
+                f"Sorts in a temporary B-tree for {purpose}",
+                "An index whose columns match the sort order returns rows already sorted",
+                "CREATE INDEX ... ON table (sort columns)"
+            )
+            return
+
+        filtered = [column for column in self._predicate_columns(table) if column not in columns]
+        if filtered:
+            recommendation = (
+                f"An index on the filter columns ({', '.join(filtered)}) followed by the sort columns "
+                f"({', '.join(columns)}) returns matching rows already sorted"
+            )
+        else:
+            recommendation = f"An index on the sort columns ({', '.join(columns)}) returns rows already sorted"
+        self._add(
+            "temp_btree", "medium",
+            f"Sorts in a temporary B-tree for {purpose}",
+            recommendation,
+            self._suggest_index(table, filtered + columns)
+        )
+
+    def _check_unused_indexes(self, table: str):
+        filtered = set(self._where_columns(table))
+        for index, columns in table_indexes(self.connection, table).items():
+            if index in self.indexes_used or not columns or columns[0] not in filtered:
+                continue
+            self._add(
+                "unused_index", "high",
+                f"Index {index} on {table}({', '.join(columns)}) exists but the plan scans the table",
+                "Make the predicate on the indexed column sargable: no function around the column, "
+                "no leading wildcard, and a value of the column's type",
+                f"WHERE {columns[0]} = ? instead of WHERE LOWER({columns[0]}) = ?"
+            )
+
+    def _predicate_columns(self, table: str) -> List[str]:
+        """Columns of ``table`` compared in the query, in order of appearance"""
+        known = set(table_columns(self.connection, table))
+        found = []
+        for match in PREDICATE_COLUMN.finditer(self.query):
+            alias, column = match["alias"], match["column"]
+            if alias and self.aliases.get(alias) != table:
+                continue
+            if column in known and column not in found:
+                found.append(column)
+        return found
+
+    def _where_columns(self, table: str) -> List[str]:
+        """Columns of ``table`` mentioned anywhere in the WHERE clause, wrapped in functions or not"""
+        where = WHERE_CLAUSE.search(self.query)
+        if not where:
+            return []
+        known = set(table_columns(self.connection, table))
+        found = []
+        for match in IDENTIFIER.finditer(where["clause"]):
+            alias, column = match["alias"], match["column"]
+            if alias and self.aliases.get(alias) != table:
+                continue
+            if column in known and column not in found:
+                found.append(column)
+        return found
+
+    @staticmethod
+    def _term_columns(terms: Optional[str]) -> List[str]:
+        if not terms:
+            return []
+        return [re.split(r"[=<>!]", term.strip())[0] for term in terms.split(" AND ")]
+
+    def candidate_indexes(self) -> List[Tuple[str, Tuple[str, ...]]]:
+        """Suggested ``(table, columns)`` not already covered by a prefix of an existing index"""
+        found = []
+        for table, columns in self.candidates:
+            existing = table_indexes(self.connection, table).values()
+            if any(list(columns) == index[:len(columns)] for index in existing):
+                continue
+            if (table, columns) not in found:
+                found.append((table, columns))
+        return found
+
+    def _suggest_index(self, table: str, columns: Sequence[str]) -> str:
+        self.candidates.append((table, tuple(columns)))
+        return create_index_sql(table, columns)
+
+    def _add(self, type_: str, severity: str, issue: str, recommendation: str, example: str):
+        if any(r["type"] == type_ and r["issue"] == issue for r in self.recommendations):
+            return
+        self.recommendations.append({
+            "type": type_,
+            "severity": severity,
+            "issue": issue,
+            "recommendation": recommendation,
+            "example": example
+        })
+
+
+def create_index_sql(table: str, columns: Sequence[str]) -> str:
+    return f"CREATE INDEX ix_{table}_{'_'.join(columns)} ON {table} ({', '.join(columns)})"
@@ -0,0 +1,245 @@
+"""
+Rule registry and single-pass engine for the Code Review Skill.
+
+Rules subscribe to AST node types and/or to source lines. The engine
+walks the tree once with an ``ast.NodeVisitor`` and scans the lines once,
+dispatching each node and line only to the rules interested in it, so the
+cost of a review grows with the work rules do rather than with how many
+there are.
+"""
+
+import ast
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+Issue = Dict[str, object]
+
+MAX_PARAMETERS = 5
+MAX_LINE_LENGTH = 120
+
+
+def issue(type_: str, severity: str, line: Optional[int], message: str) -> Issue:
+    return {"type": type_, "severity": severity, "line": line, "message": message}
+
+
+class Rule:
+    """A review check.
+
+    Set ``node_types`` to receive those nodes (and their subclasses) in
+    ``check_node``; set ``checks_lines`` to receive every source line in
+    ``check_line`` together with the line before it.
+    """
+
+    name = ""
+    node_types: Tuple[type, ...] = ()
+    checks_lines = False
+
+    def check_node(self, node: ast.AST) -> Iterable[Issue]:
+        return ()
+
+    def check_line(self, lineno: int, line: str, previous: Optional[str]) -> Iterable[Issue]:
+        return ()
+
+
+class RuleRegistry:
+    """Named rules, in registration order"""
+
+    def __init__(self):
+        self._rules: Dict[str, Rule] = {}
+
+    def register(self, rule_class: type) -> type:
+        """Class decorator adding one instance of the rule"""
+        rule = rule_class()
+        if not rule.name:
+            raise ValueError(f"{rule_class.__name__} has no name")
+        self._rules[rule.name] = rule
+        return rule_class
+
+    def names(self) -> List[str]:
+        return list(self._rules)
+
+    def select(self, enabled: Optional[Iterable[str]] = None, disabled: Iterable[str] = ()) -> List[Rule]:
+        """Rules to run: ``enabled`` (all by default) minus ``disabled``"""
+        enabled = self.names() if enabled is None else list(enabled)
+        disabled = set(disabled)
+        unknown = (set(enabled) | disabled) - set(self._rules)
+        if unknown:
+            raise ValueError(f"Unknown rules: {', '.join(sorted(unknown))}")
+        return [self._rules[name] for name in self.names() if name in enabled and name not in disabled]
+
+
+# Rules shipped with the skill; third-party rules register here too
+registry = RuleRegistry()
+
+
+class _Dispatcher(ast.NodeVisitor):
+    def __init__(self, handlers: Dict[type, List[Callable]]):
+        self.handlers = handlers
+        self.issues: List[Issue] = []
+
+    def visit(self, node: ast.AST):
+        for handler in self.handlers.get(type(node), ()):
+            self.issues.extend(handler(node))
+        self.generic_visit(node)
+
+
+class ReviewEngine:
+    """Runs a set of rules over source code in one tree walk and one line scan"""
+
+    def __init__(self, rules: Sequence[Rule], timed: bool = False):
+        self.rules = list(rules)
+        self.timed = timed
+        self.timings = {rule.name: {"calls": 0, "issues": 0, "seconds": 0.0} for rule in self.rules}
+
+        self._node_handlers: Dict[type, List[Callable]] = {}
+        self._line_handlers: List[Callable] = []
+        for rule in self.rules:
+            for node_type in rule.node_types:
+                for subclass in _with_subclasses(node_type):
+                    self._node_handlers.setdefault(subclass, []).append(self._wrap(rule, rule.check_node))
+            if rule.checks_lines:
+                self._line_handlers.append(self._wrap(rule, rule.check_line))
+
+    @property
+    def rule_names(self) -> List[str]:
+        return [rule.name for rule in self.rules]
+
+    def review(self, content: str) -> List[Issue]:
+        """Issues from every rule; a syntax error replaces the tree-based ones"""
+        try:
+            tree = ast.parse(content)
+        except SyntaxError as e:
+            issues = [issue("syntax_error", "critical", e.lineno, str(e))]
+        else:
+            dispatcher = _Dispatcher(self._node_handlers)
+            if self._node_handlers:
+                dispatcher.visit(tree)
+            issues = dispatcher.issues
+
+        if self._line_handlers:
+            previous = None
+            for lineno, line in enumerate(content.split('\n'), 1):
+                for handler in self._line_handlers:
+                    issues.extend(handler(lineno, line, previous))
+                previous = line
+        return issues
+
+    def merge_timings(self, timings: Dict[str, Dict[str, float]]):
+        """Add timings gathered by another engine, e.g. in a worker process"""
+        for name, timing in timings.items():
+            totals = self.timings.setdefault(name, {"calls": 0, "issues": 0, "seconds": 0.0})
+            for field, value in timing.items():
+                totals[field] += value
+
+    def report(self) -> List[Dict[str, object]]:
+        """Per-rule cost, most expensive first"""
+        total = sum(t["seconds"] for t in self.timings.values()) or 1.0
+        return sorted(
+            (
+                {"rule": name, **timing, "share": round(timing["seconds"] / total, 4)}
+                for name, timing in self.timings.items()
+            ),
+            key=lambda row: row["seconds"],
+            reverse=True
+        )
+
+    def _wrap(self, rule: Rule, check: Callable) -> Callable:
+        # Untimed engines call checks directly; timing costs two clock reads per call
+        if not self.timed:
+            return check
+
+        timing = self.timings[rule.name]
+        clock = time.perf_counter
+
+        def timed(*args):
+            start = clock()
+            found = tuple(check(*args))
+            timing["seconds"] += clock() - start
+            timing["calls"] += 1
+            timing["issues"] += len(found)
+            return found
+
+        return timed
+
+
+def _with_subclasses(node_type: type) -> List[type]:
+    found, pending = [], [node_type]
+    while pending:
+        current = pending.pop()
+        found.append(current)
+        pending.extend(current.__subclasses__())
+    return found
+
+
+@registry.register
+class TooManyParameters(Rule):
+    name = "too_many_parameters"
+    node_types = (ast.FunctionDef,)
+
+    def check_node(self, node):
+        if len(node.args.args) > MAX_PARAMETERS:
+            yield issue(
+                self.name, "medium", node.lineno,
+                f"Function '{node.name}' has {len(node.args.args)} parameters (max recommended: {MAX_PARAMETERS})"
+            )
+
+
+@registry.register
+class MissingDocstring(Rule):
+    name = "missing_docstring"
+    node_types = (ast.FunctionDef,)
+
+    def check_node(self, node):
+        if not ast.get_docstring(node):
+            yield issue(self.name, "low", node.lineno, f"Function '{node.name}' missing docstring")
+
+
+@registry.register
+class EmptyExceptionHandler(Rule):
+    name = "empty_exception_handler"
+    node_types = (ast.Try,)
+
+    def check_node(self, node):
+        if not node.handlers:
+            yield issue(self.name, "high", node.lineno, "Try block without exception handlers")
+
+
+@registry.register
+class BareExcept(Rule):
+    name = "bare_except"
+    node_types = (ast.ExceptHandler,)
+
+    def check_node(self, node):
+        if node.type is None:
+            yield issue(self.name, "high", node.lineno, "Bare except clause (catches all exceptions)")
+
+
+@registry.register
+class LineTooLong(Rule):
+    name = "line_too_long"
+    checks_lines = True
+
+    def check_line(self, lineno, line, previous):
+        if len(line) > MAX_LINE_LENGTH:
+            yield issue(
+                self.name, "low", lineno,
+                f"Line exceeds {MAX_LINE_LENGTH} characters ({len(line)} chars)"
+            )
+
+
+@registry.register
+class ImportNotAtTop(Rule):
+    name = "import_not_at_top"
+    checks_lines = True
+
+    def check_line(self, lineno, line, previous):
+        if not _is_import(line) or previous is None:
+            return
+        if previous.strip() and not _is_import(previous):
+            yield issue(self.name, "medium", lineno, "Imports should be at the top of the file")
+
+
+def _is_import(line: str) -> bool:
+    stripped = line.strip()
+    return stripped.startswith('import ') or stripped.startswith('from ')
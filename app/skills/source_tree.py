@@ -0,0 +1,147 @@
+"""
+Source tree traversal for the Code Review Skill.
+
+Walks a directory lazily and prunes excluded directories before
+descending into them: well-known environment/build directories, glob
+excludes, and the common subset of ``.gitignore`` syntax (``*``, ``?``,
+``**``, ``!`` negation, leading and trailing ``/``).
+"""
+
+import fnmatch
+import os
+import re
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+DEFAULT_EXCLUDED_DIRS = frozenset({
+    ".git", ".hg", ".svn", ".venv", "venv", "env", "node_modules", "build", "dist",
+    "__pycache__", ".tox", ".nox", ".mypy_cache", ".pytest_cache", ".eggs", "site-packages",
+})
+
+DEFAULT_MAX_FILE_SIZE = 1024 * 1024
+
+
+class GitIgnore:
+    """Patterns from the ``.gitignore`` files seen so far, each scoped to its directory"""
+
+    def __init__(self):
+        # (directory relative to the root, regex, negated, directories only)
+        self.rules: List[Tuple[str, "re.Pattern", bool, bool]] = []
+
+    def add_file(self, path: str, base: str):
+        try:
+            with open(path, "r", errors="replace") as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return
+        for line in lines:
+            rule = _translate(line)
+            if rule:
+                self.rules.append((base, *rule))
+
+    def ignored(self, rel_path: str, is_dir: bool) -> bool:
+        """Whether ``rel_path`` (``/``-separated, relative to the root) is ignored; the last match wins"""
+        ignored = False
+        for base, pattern, negated, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if base:
+                if not rel_path.startswith(base + "/"):
+                    continue
+                candidate = rel_path[len(base) + 1:]
+            else:
+                candidate = rel_path
+            if pattern.match(candidate):
+                ignored = not negated
+        return ignored
+
+
+def iter_python_files(
+    root: str,
+    exclude: Sequence[str] = (),
+    max_file_size: Optional[int] = DEFAULT_MAX_FILE_SIZE,
+    respect_gitignore: bool = True,
+    excluded_dirs: Iterable[str] = DEFAULT_EXCLUDED_DIRS
+) -> Iterator[str]:
+    """Yield ``.py`` files under ``root`` in sorted order, one directory at a time.
+
+    ``exclude`` globs are matched against the ``/``-separated path relative
+    to ``root`` and against the bare name; a matching directory is not
+    entered. Files over ``max_file_size`` bytes are skipped.
+    """
+    excluded_dirs = frozenset(excluded_dirs)
+    gitignore = GitIgnore() if respect_gitignore else None
+
+    def skipped(rel_path: str, name: str, is_dir: bool) -> bool:
+        if any(fnmatch.fnmatch(rel_path, glob) or fnmatch.fnmatch(name, glob) for glob in exclude):
+            return True
+        return gitignore is not None and gitignore.ignored(rel_path, is_dir)
+
+    for directory, dirnames, filenames in os.walk(root):
+        rel_dir = os.path.relpath(directory, root).replace(os.sep, "/")
+        rel_dir = "" if rel_dir == "." else rel_dir
+        prefix = rel_dir + "/" if rel_dir else ""
+
+        if gitignore is not None and ".gitignore" in filenames:
+            gitignore.add_file(os.path.join(directory, ".gitignore"), rel_dir)
+
+        dirnames[:] = sorted(
+            name for name in dirnames
+            if name not in excluded_dirs and not skipped(prefix + name, name, True)
+        )
+
+        for name in sorted(filenames):
+            if not name.endswith(".py") or skipped(prefix + name, name, False):
+                continue
+            path = os.path.join(directory, name)
+            if max_file_size is not None:
+                try:
+                    if os.path.getsize(path) > max_file_size:
+                        continue
+                except OSError:
+                    continue
+            yield path
+
+
+def _translate(line: str) -> Optional[Tuple["re.Pattern", bool, bool]]:
+    """``(regex, negated, directories only)`` for one ``.gitignore`` line"""
+    line = line.rstrip()
+    if not line or line.startswith("#"):
+        return None
+
+    negated = line.startswith("!")
+    if negated:
+        line = line[1:]
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    # A slash anywhere but the end anchors the pattern to its .gitignore
+    anchored = "/" in line
+    line = line.lstrip("/")
+    if not line:
+        return None
+
+    regex = []
+    i = 0
+    while i < len(line):
+        if line.startswith("**/", i):
+            regex.append("(?:.*/)?")
+            i += 3
+        elif line.startswith("/**", i) and i + 3 == len(line):
+            regex.append("/.*")
+            i += 3
+        elif line.startswith("**", i):
+            regex.append(".*")
+            i += 2
+        elif line[i] == "*":
+            regex.append("[^/]*")
+            i += 1
+        elif line[i] == "?":
+            regex.append("[^/]")
+            i += 1
+        else:
+            regex.append(re.escape(line[i]))
+            i += 1
+
+    body = "".join(regex)
+    pattern = f"{body}$" if anchored else f"(?:.*/)?{body}$"
+    return re.compile(pattern), negated, dir_only
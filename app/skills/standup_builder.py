@@ -0,0 +1,200 @@
+"""
+Stateless standup report building and rendering.
+
+``StandupReportBuilder`` holds no per-report state, so one instance can
+serve concurrent requests and many users. ``iter_batch_reports`` renders
+standups for many users across a process pool and streams the output.
+"""
+
+import json
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+
+FORMATS = ("text", "markdown", "ndjson")
+
+# Only these task fields are sent to worker processes
+STANDUP_FIELDS = ("title", "status", "updated_at", "tags")
+
+DEFAULT_YESTERDAY = "Continued work on ongoing projects"
+DEFAULT_TODAY = "Continue ongoing tasks"
+DEFAULT_BLOCKERS = "No blockers"
+
+
+def is_blocked(tags: Optional[str]) -> bool:
+    """Whether a task's tags mark it as blocked"""
+    return bool(tags) and "blocked" in tags.lower()
+
+
+class StandupReportBuilder:
+    """Builds and renders standup reports without keeping any state"""
+
+    def build(
+        self,
+        day: date,
+        yesterday: List[str],
+        today: List[str],
+        blockers: List[str],
+        user: Optional[str] = None,
+        counts: Optional[Dict[str, int]] = None
+    ) -> Dict[str, Any]:
+        """Assemble a report; ``counts`` overrides totals of truncated lists"""
+        counts = counts or {}
+        return {
+            "user": user,
+            "date": day.strftime("%Y-%m-%d"),
+            "yesterday": list(yesterday),
+            "today": list(today),
+            "blockers": list(blockers),
+            "completed_count": counts.get("completed", len(yesterday)),
+            "in_progress_count": counts.get("in_progress", len(today)),
+            "blockers_count": counts.get("blocked", len(blockers)),
+        }
+
+    def from_tasks(self, tasks: Iterable[Dict], day: date, user: Optional[str] = None) -> Dict[str, Any]:
+        """Report on tasks completed the day before ``day`` plus current open work"""
+        previous_day = day - timedelta(days=1)
+        completed, in_progress, blocked = [], [], []
+
+        for task in tasks:
+            status = task.get("status")
+            if status == "completed":
+                updated_at = task.get("updated_at")
+                if isinstance(updated_at, str):
+                    updated_at = datetime.fromisoformat(updated_at.replace('Z', '+00:00'))
+                if updated_at and updated_at.date() == previous_day:
+                    completed.append(task["title"])
+
+            elif status == "cancelled":
+                continue
+
+            # "blocked" is a tag, not a TaskStatus value
+            elif is_blocked(task.get("tags")):
+                blocked.append(task["title"])
+
+            elif status == "in_progress":
+                in_progress.append(task["title"])
+
+        return self.build(day, completed, in_progress, blocked, user)
+
+    def render(self, report: Dict[str, Any], fmt: str = "text") -> str:
+        """Render a report as plain text, Markdown or one NDJSON line"""
+        if fmt == "ndjson":
+            return json.dumps(report, ensure_ascii=False, separators=(",", ":"))
+        if fmt == "markdown":
+            return self._render_markdown(report)
+        if fmt == "text":
+            return self.render_text(report)
+        raise ValueError(f"Unknown format: {fmt}")
+
+    def render_text(
+        self,
+        report: Dict[str, Any],
+        title: str = "Daily Standup Report",
+        done_heading: str = "Yesterday"
+    ) -> str:
+        """Render a report as plain text under a custom title and heading for done work"""
+        if report.get("user"):
+            title = f"{title} ({report['user']})"
+
+        lines = [f"📅 {title} - {report['date']}"]
+        for icon, heading, items in self._sections(report, done_heading):
+            lines.extend(["", f"{icon} {heading}:"])
+            lines.extend(f"   • {item}" for item in items)
+        return "\n".join(lines)
+
+    @staticmethod
+    def _sections(report: Dict[str, Any], done_heading: str = "Yesterday") -> List[Tuple[str, str, List[str]]]:
+        return [
+            ("✅", done_heading, report["yesterday"] or [DEFAULT_YESTERDAY]),
+            ("🎯", "Today", report["today"] or [DEFAULT_TODAY]),
+            ("🚧", "Blockers", report["blockers"] or [DEFAULT_BLOCKERS]),
+        ]
+
+    def _render_markdown(self, report: Dict[str, Any]) -> str:
+        title = f"Standup - {report['date']}"
+        if report.get("user"):
+            title = f"{report['user']} - {title}"
+
+        lines = [f"## {title}"]
+        for _, heading, items in self._sections(report):
+            lines.extend(["", f"### {heading}", ""])
+            lines.extend(f"- {item}" for item in items)
+        return "\n".join(lines) + "\n"
+
+
+# One builder per process, shared by every user rendered in that process
+_builder = StandupReportBuilder()
+
+
+def _pool_context():
+    # Forking a process that runs other threads (a server's thread pool, the
+    # write batcher) can copy a held lock into the child, so workers start
+    # from a fresh interpreter instead
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def _render_chunk(chunk: List[Tuple[Any, List[tuple]]], day: date, fmt: str) -> List[str]:
+    """Worker entry point: build and render the reports of a chunk of users"""
+    return [
+        _builder.render(_builder.from_tasks((dict(zip(STANDUP_FIELDS, row)) for row in rows), day, user), fmt)
+        for user, rows in chunk
+    ]
+
+
+def _pack(users: List[Tuple[Any, Iterable[Dict]]]) -> List[Tuple[Any, List[tuple]]]:
+    return [
+        (user, [tuple(task.get(field) for field in STANDUP_FIELDS) for task in tasks])
+        for user, tasks in users
+    ]
+
+
+def iter_batch_reports(
+    tasks_by_user: Mapping[Any, Iterable[Dict]],
+    day: Optional[date] = None,
+    fmt: str = "ndjson",
+    max_workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    executor: Optional[Executor] = None
+) -> Iterator[str]:
+    """Render a standup per user and yield them as they finish.
+
+    Users are chunked over a process pool (inline with one worker). Each
+    yielded string is one complete report: an NDJSON line, or a text or
+    Markdown document followed by a blank line.
+
+    Workers of an owned pool are started with forkserver (or spawn), never
+    forked from this process; only the fields in ``STANDUP_FIELDS`` are
+    pickled to them.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format: {fmt}")
+
+    day = day or date.today()
+    separator = "\n" if fmt == "ndjson" else "\n\n"
+    workers = max_workers or os.cpu_count() or 1
+
+    if workers == 1 and executor is None:
+        for user, tasks in tasks_by_user.items():
+            yield _builder.render(_builder.from_tasks(tasks, day, user), fmt) + separator
+        return
+
+    users = list(tasks_by_user.items())
+    if chunk_size is None:
+        chunk_size = max(1, -(-len(users) // (workers * 4)))
+    ranges = [(start, min(start + chunk_size, len(users))) for start in range(0, len(users), chunk_size)]
+
+    owned = executor is None
+    pool = executor or ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context())
+    try:
+        futures = [pool.submit(_render_chunk, _pack(users[start:stop]), day, fmt) for start, stop in ranges]
+        for future in as_completed(futures):
+            for rendered in future.result():
+                yield rendered + separator
+    finally:
+        if owned:
+            pool.shutdown(cancel_futures=True)
@@ -4,35 +4,72 @@ Automates the creation of daily standup reports by analyzing
 git commits, tasks completed, and work in progress.
 """
 
+import asyncio
 import subprocess
-from datetime import datetime, timedelta
-from typing import List, Dict
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import List, Dict, Iterable, Iterator, Optional, Sequence
 import re
 
+from app.skills.git_collector import (
+    CommitCache,
+    GitCommitCollector,
+    GitError,
+    iter_git_log,
+    read_commits,
+    run_git_steps,
+)
+from app.skills.standup_builder import StandupReportBuilder, iter_batch_reports
+
+
+CONVENTIONAL_PREFIX = re.compile(r'^(fix|feat|docs|style|refactor|test|chore):\s*', re.IGNORECASE)
+VERB_PREFIX = re.compile(r'^(fixed|added|updated|removed|created)\s+', re.IGNORECASE)
+BLOCKER_KEYWORDS = ('wip', 'todo', 'fixme', 'blocked', 'issue', 'bug')
+# One alternation finds any keyword in a single scan of the message
+BLOCKER_PATTERN = re.compile('|'.join(BLOCKER_KEYWORDS), re.IGNORECASE)
+# Commit-based reports know what was done, not what is planned
+COMMIT_TODAY = ("Continue ongoing tasks", "Address any blockers")
+
+
+def clean_commit_message(message: str) -> str:
+    """Strip conventional-commit and past-tense verb prefixes, capitalize"""
+    message = VERB_PREFIX.sub('', CONVENTIONAL_PREFIX.sub('', message, count=1), count=1).strip()
+    if message and not message[0].isupper():
+        message = message[0].upper() + message[1:]
+    return message
+
+
+def iter_cleaned_commits(commits: Iterable[Dict[str, str]]) -> Iterator[Dict[str, object]]:
+    """Annotate each streamed commit with its cleaned message and blocker flag"""
+    for commit in commits:
+        subject = commit["subject"]
+        yield {
+            **commit,
+            "message": clean_commit_message(subject),
+            "blocker": BLOCKER_PATTERN.search(subject) is not None,
+        }
+
 
 class StandupReporterSkill:
     """Automated daily standup report generator"""
 
-    def __init__(self):
-        self.report = {
-            "date": datetime.now().strftime("%Y-%m-%d"),
-            "yesterday": [],
-            "today": [],
-            "blockers": []
-        }
+    # Stateless, so one builder is shared by every instance and thread
+    builder = StandupReportBuilder()
+
+    def __init__(self, commit_cache: Optional[CommitCache] = None):
+        self.commit_cache = commit_cache
 
     def generate_report(self, git_repo_path: str = ".") -> Dict[str, any]:
         """Generate a complete standup report"""
         try:
             commits = self._get_yesterday_commits(git_repo_path)
-            self._parse_commits(commits)
-            self._identify_blockers(commits)
-
-            formatted_report = self._format_report()
+            report = self.builder.build(
+                date.today(), self._work_items(commits), COMMIT_TODAY, self._blockers(commits)
+            )
 
             return {
-                "date": self.report["date"],
-                "report": formatted_report,
+                "date": report["date"],
+                "report": self.builder.render(report),
                 "total_commits": len(commits),
                 "status": "generated"
             }
@@ -40,163 +77,193 @@ class StandupReporterSkill:
         except Exception as e:
             return {"error": str(e)}
 
+    def generate_summary(
+        self,
+        repo_path: str = ".",
+        since: Optional[date] = None,
+        until: Optional[date] = None,
+        authors: Optional[Sequence[str]] = None,
+        max_items: int = 20
+    ) -> Dict[str, any]:
+        """Summarize commits over a date range (default: the last 7 days).
+
+        Commits are streamed from ``git log`` and folded into counters in a
+        single pass, keeping only the first ``max_items`` highlights and
+        blockers, so memory does not grow with the size of the range.
+        """
+        until = until or date.today()
+        since = since or until - timedelta(days=6)
+        total = 0
+        blocker_count = 0
+        per_author: Counter = Counter()
+        highlights: List[str] = []
+        blockers: List[str] = []
+
+        try:
+            for commit in iter_cleaned_commits(iter_git_log(repo_path, since, until, authors or ())):
+                total += 1
+                per_author[commit["author"]] += 1
+                if commit["message"] and len(highlights) < max_items:
+                    highlights.append(commit["message"])
+                if commit["blocker"]:
+                    blocker_count += 1
+                    if len(blockers) < max_items:
+                        blockers.append(f"Potential blocker detected: {commit['subject'][:50]}...")
+        except (GitError, OSError) as e:
+            return {"error": str(e)}
+
+        if total > len(highlights):
+            highlights.append(f"...and {total - len(highlights)} more commit(s)")
+        report = self.builder.build(until, highlights, COMMIT_TODAY, blockers)
+        report["date"] = f"{since:%Y-%m-%d} to {until:%Y-%m-%d}"
+
+        return {
+            "since": since.strftime("%Y-%m-%d"),
+            "until": until.strftime("%Y-%m-%d"),
+            "report": self.builder.render_text(report, "Commit Summary", "Highlights"),
+            "total_commits": total,
+            "blockers_count": blocker_count,
+            "commits_by_author": dict(per_author.most_common()),
+            "status": "generated"
+        }
+
     def _get_yesterday_commits(self, repo_path: str) -> List[str]:
         """Get commits from yesterday"""
         try:
-            yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
-            cmd = [
-                "git", "-C", repo_path, "log",
-                f"--since={yesterday} 00:00",
-                f"--until={yesterday} 23:59",
-                "--pretty=format:%s",
-                "--author=$(git config user.name)"
-            ]
-
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                shell=False
-            )
-
-            if result.returncode == 0:
-                commits = [c for c in result.stdout.split('\n') if c.strip()]
-                return commits
-            return []
+            yesterday = (datetime.now() - timedelta(days=1)).date()
+            # shell=False does not expand $(...), so the author is resolved here
+            author = self._resolve_author(repo_path)
+            steps = read_commits(repo_path, yesterday, [author] if author else [], self.commit_cache)
+            return [commit["subject"] for commit in run_git_steps(steps)]
 
         except Exception:
             return []
 
-    def _parse_commits(self, commits: List[str]):
-        """Parse commits to extract work items"""
-        for commit in commits:
-            cleaned = self._clean_commit_message(commit)
-            if cleaned:
-                self.report["yesterday"].append(cleaned)
-
-        if not self.report["yesterday"]:
-            self.report["yesterday"].append("Continued work on ongoing projects")
+    def _resolve_author(self, repo_path: str) -> Optional[str]:
+        """Return the repository's configured ``user.name``"""
+        result = subprocess.run(
+            ["git", "-C", repo_path, "config", "user.name"],
+            capture_output=True,
+            text=True,
+            shell=False
+        )
+        name = result.stdout.strip()
+        return name if result.returncode == 0 and name else None
+
+    def _work_items(self, commits: List[str]) -> List[str]:
+        """Cleaned, non-empty commit messages"""
+        return [cleaned for cleaned in map(self._clean_commit_message, commits) if cleaned]
 
     def _clean_commit_message(self, message: str) -> str:
         """Clean and format commit message"""
-        message = re.sub(r'^(fix|feat|docs|style|refactor|test|chore):\s*', '', message, flags=re.IGNORECASE)
-        message = re.sub(r'^(fixed|added|updated|removed|created)\s+', '', message, flags=re.IGNORECASE)
-
-        message = message.strip()
-
-        if message and not message[0].isupper():
-            message = message[0].upper() + message[1:]
-
-        return message
+        return clean_commit_message(message)
 
-    def _identify_blockers(self, commits: List[str]):
+    def _blockers(self, commits: List[str]) -> List[str]:
         """Identify potential blockers from commit messages"""
-        blocker_keywords = ['wip', 'todo', 'fixme', 'blocked', 'issue', 'bug']
-
-        for commit in commits:
-            lower_commit = commit.lower()
-            for keyword in blocker_keywords:
-                if keyword in lower_commit:
-                    self.report["blockers"].append(
-                        f"Potential blocker detected: {commit[:50]}..."
-                    )
-                    break
-
-        if not self.report["blockers"]:
-            self.report["blockers"].append("No blockers")
-
-    def _format_report(self) -> str:
-        """Format the standup report as a string"""
-        report_lines = [
-            f"📅 Daily Standup Report - {self.report['date']}",
-            "",
-            "✅ Yesterday:",
-        ]
-
-        for item in self.report["yesterday"]:
-            report_lines.append(f"   • {item}")
-
-        report_lines.extend([
-            "",
-            "🎯 Today:",
-            "   • Continue ongoing tasks",
-            "   • Address any blockers",
-            "",
-            "🚧 Blockers:",
-        ])
-
-        for blocker in self.report["blockers"]:
-            report_lines.append(f"   • {blocker}")
-
-        return "\n".join(report_lines)
+        return [f"Potential blocker detected: {commit[:50]}..." for commit in commits if BLOCKER_PATTERN.search(commit)]
+
+    def generate_team_reports(
+        self,
+        repo_paths: Sequence[str],
+        day: Optional[date] = None,
+        authors: Optional[Sequence[str]] = None,
+        current_user: bool = False,
+        max_concurrency: int = 16,
+        timeout: float = 10.0
+    ) -> Dict[str, any]:
+        """Generate one standup report per person from many repositories.
+
+        Blocking wrapper around ``generate_team_reports_async``; call that
+        one directly from code already running an event loop.
+        """
+        return asyncio.run(self.generate_team_reports_async(
+            repo_paths, day, authors, current_user, max_concurrency, timeout
+        ))
+
+    async def generate_team_reports_async(
+        self,
+        repo_paths: Sequence[str],
+        day: Optional[date] = None,
+        authors: Optional[Sequence[str]] = None,
+        current_user: bool = False,
+        max_concurrency: int = 16,
+        timeout: float = 10.0
+    ) -> Dict[str, any]:
+        """Collect ``day``'s commits (default yesterday) concurrently and report per author"""
+        day = day or (datetime.now() - timedelta(days=1)).date()
+        collector = GitCommitCollector(max_concurrency=max_concurrency, timeout=timeout, cache=self.commit_cache)
+        collected = await collector.collect(repo_paths, day, authors, current_user)
+
+        by_author: Dict[str, List[Dict[str, str]]] = {}
+        for commit in collected["commits"]:
+            by_author.setdefault(commit["author"], []).append(commit)
+
+        today = date.today()
+        reports = {}
+        for author, commits in sorted(by_author.items()):
+            report = self.builder.build(
+                today,
+                [f"{self._clean_commit_message(c['subject'])} ({c['repo']})" for c in commits],
+                COMMIT_TODAY,
+                self._blockers([c["subject"] for c in commits]),
+            )
+            reports[author] = {
+                "report": self.builder.render(report),
+                "total_commits": len(commits),
+                "repositories": sorted({c["repo"] for c in commits}),
+            }
+
+        return {
+            "date": day.strftime("%Y-%m-%d"),
+            "reports": reports,
+            "total_commits": len(collected["commits"]),
+            "errors": collected["errors"],
+            "status": "generated"
+        }
 
     def generate_from_task_list(self, tasks: List[Dict]) -> Dict[str, any]:
         """Generate standup report from a list of tasks"""
-        completed_yesterday = []
-        in_progress = []
-        blocked = []
-
-        yesterday = datetime.now() - timedelta(days=1)
-
-        for task in tasks:
-            if task.get("status") == "completed":
-                completed_date = task.get("updated_at", "")
-                if isinstance(completed_date, str):
-                    completed_date = datetime.fromisoformat(completed_date.replace('Z', '+00:00'))
-
-                if completed_date.date() == yesterday.date():
-                    completed_yesterday.append(task["title"])
-
-            elif task.get("status") == "in_progress":
-                in_progress.append(task["title"])
-
-            elif task.get("status") == "blocked":
-                blocked.append(task["title"])
-
-        self.report["yesterday"] = completed_yesterday or ["Continued work on ongoing projects"]
-        self.report["today"] = in_progress or ["Continue ongoing tasks"]
-        self.report["blockers"] = blocked or ["No blockers"]
-
-        formatted_report = self._format_task_report()
-
+        return self._task_report_result(self.builder.from_tasks(tasks, date.today()))
+
+    def generate_from_task_groups(
+        self,
+        completed: List[str],
+        in_progress: List[str],
+        blocked: List[str],
+        report_date: Optional[date] = None,
+        counts: Optional[Dict[str, int]] = None
+    ) -> Dict[str, any]:
+        """Generate a standup report from already-selected task titles.
+
+        ``counts`` overrides the reported totals when the title lists were
+        truncated by the caller.
+        """
+        report = self.builder.build(report_date or date.today(), completed, in_progress, blocked, counts=counts)
+        return self._task_report_result(report)
+
+    def generate_batch(
+        self,
+        tasks_by_user: Dict[str, List[Dict]],
+        day: Optional[date] = None,
+        fmt: str = "ndjson",
+        max_workers: Optional[int] = None
+    ) -> Iterator[str]:
+        """Stream one standup per user, rendered in parallel.
+
+        ``fmt`` is "ndjson", "markdown" or "text"; see ``iter_batch_reports``.
+        """
+        return iter_batch_reports(tasks_by_user, day, fmt, max_workers)
+
+    def _task_report_result(self, report: Dict[str, any]) -> Dict[str, any]:
         return {
-            "date": self.report["date"],
-            "report": formatted_report,
-            "completed_count": len(completed_yesterday),
-            "in_progress_count": len(in_progress),
-            "blockers_count": len(blocked),
+            "date": report["date"],
+            "report": self.builder.render(report),
+            "completed_count": report["completed_count"],
+            "in_progress_count": report["in_progress_count"],
+            "blockers_count": report["blockers_count"],
             "status": "generated"
         }
 
-    def _format_task_report(self) -> str:
-        """Format task-based standup report"""
-        report_lines = [
-            f"📅 Daily Standup Report - {self.report['date']}",
-            "",
-            "✅ Yesterday:",
-        ]
-
-        for item in self.report["yesterday"]:
-            report_lines.append(f"   • {item}")
-
-        report_lines.extend([
-            "",
-            "🎯 Today:",
-        ])
-
-        for item in self.report["today"]:
-            report_lines.append(f"   • {item}")
-
-        report_lines.extend([
-            "",
-            "🚧 Blockers:",
-        ])
-
-        for blocker in self.report["blockers"]:
-            report_lines.append(f"   • {blocker}")
-
-        return "\n".join(report_lines)
-
 
 def main():
     """Example usage"""
@@ -4,10 +4,41 @@ Intelligently prioritizes tasks based on deadlines, dependencies,
 effort estimates, and urgency using a scoring algorithm.
 """
 
-from datetime import datetime
-from typing import List, Dict, Optional
+import heapq
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, List, Dict, Iterable, Iterator, Mapping, Optional, Tuple, Union
 from enum import Enum
 
+from sqlalchemy import case, func
+
+from app.models.scoring import (
+    PRIORITY_SCORES,
+    DEFAULT_PRIORITY_SCORE,
+    IN_PROGRESS_BONUS,
+    TAG_KEYWORD_BONUSES,
+    DESCRIPTION_KEYWORD_BONUSES,
+    URGENCY_BUCKETS,
+    OVERDUE_URGENCY,
+    DISTANT_URGENCY,
+    due_urgency,
+    keyword_bonus,
+    next_urgency_transition,
+    parse_due_date,
+    reference_clock,
+    urgency_for_days,
+)
+from app.skills.task_scoring import BatchPriorityScorer, MemoDict
+from app.skills.task_scheduling import (
+    PLANNING_SLOT_MINUTES,
+    SLACK_EPSILON,
+    DependencyGraph,
+    blocking_bonus,
+    effort_of,
+    select_within_capacity,
+)
+
 
 class PriorityLevel(str, Enum):
     LOW = "low"
@@ -16,176 +47,500 @@ class PriorityLevel(str, Enum):
     URGENT = "urgent"
 
 
+class _TaskRecord:
+    """A task parsed and classified once, against one reference clock"""
+
+    __slots__ = ("task", "score", "overdue", "in_progress", "blocked", "urgent_high")
+
+    def __init__(self, task: Dict, score: float, overdue: bool, in_progress: bool,
+                 blocked: bool, urgent_high: bool):
+        self.task = task
+        self.score = score
+        self.overdue = overdue
+        self.in_progress = in_progress
+        self.blocked = blocked
+        self.urgent_high = urgent_high
+
+
+class _TaskNormalizer:
+    """Turns tasks into records against one reference clock.
+
+    Derived values are memoized per distinct priority, due date, tags and
+    description, so repeated values in a large backlog are parsed once.
+    """
+
+    def __init__(self, priority_scores: Dict[str, int], now: Optional[datetime] = None):
+        self.priority_scores = priority_scores
+        self.now_aware, self.now_naive = reference_clock(now)
+        self._priority = MemoDict(self._priority_info)
+        self._due = MemoDict(self._due_info)
+        self._tags = MemoDict(self._tags_info)
+        self._description = MemoDict(self._description_bonus)
+
+    def __call__(self, task: Dict) -> _TaskRecord:
+        base, urgent_high = self._priority[task.get("priority", "medium")]
+        urgency, overdue = self._due[task.get("due_date")]
+        tag_bonus, blocked = self._tags[task.get("tags", "")]
+        in_progress = task.get("status") == "in_progress"
+
+        score = 0.0 + base + urgency + tag_bonus + self._description[task.get("description", "")]
+        if in_progress:
+            score += IN_PROGRESS_BONUS
+
+        return _TaskRecord(task, score, overdue, in_progress, blocked, urgent_high)
+
+    def _priority_info(self, priority) -> Tuple[int, bool]:
+        key = priority.lower() if isinstance(priority, str) else ""
+        return self.priority_scores.get(key, DEFAULT_PRIORITY_SCORE), key in ("urgent", "high")
+
+    def _due_info(self, due_date) -> Tuple[int, bool]:
+        return due_urgency(due_date, self.now_aware, self.now_naive)
+
+    def _tags_info(self, tags) -> Tuple[int, bool]:
+        if not tags:
+            return 0, False
+        return keyword_bonus(tags, TAG_KEYWORD_BONUSES), "blocked" in tags.lower()
+
+    def _description_bonus(self, description) -> int:
+        if not description:
+            return 0
+        return keyword_bonus(description, DESCRIPTION_KEYWORD_BONUSES)
+
+
+# Only these fields are sent to worker processes; results come back as
+# (index, score) pairs and are joined to the caller's task dicts
+SCORING_FIELDS = ("title", "priority", "status", "due_date", "tags", "description")
+
+
+def _prioritize_chunk(
+    chunk: List[Tuple[Any, List[tuple]]],
+    now: datetime,
+    priority_scores: Dict[str, int]
+) -> List[tuple]:
+    """Worker entry point: rank each partition of a chunk with the caller's priority weights"""
+    prioritizer = TaskPrioritizerSkill()
+    prioritizer.priority_scores = priority_scores
+    results = []
+    for key, rows in chunk:
+        normalize = _TaskNormalizer(priority_scores, now)
+        records = [normalize(dict(zip(SCORING_FIELDS, row))) for row in rows]
+        order = sorted(range(len(records)), key=lambda i: records[i].score, reverse=True)
+        ranked = [records[i] for i in order]
+        recommendations = prioritizer._build_recommendations(ranked[:5], prioritizer._count_flags(records))
+        results.append((key, order, [r.score for r in ranked], recommendations))
+    return results
+
+
 class TaskPrioritizerSkill:
     """Automated task prioritization skill"""
 
     def __init__(self):
-        self.priority_scores = {
-            "urgent": 100,
-            "high": 75,
-            "medium": 50,
-            "low": 25
-        }
+        self.priority_scores = dict(PRIORITY_SCORES)
 
-    def prioritize_tasks(self, tasks: List[Dict]) -> Dict[str, any]:
+    def prioritize_tasks(self, tasks: List[Dict], now: Optional[datetime] = None) -> Dict[str, any]:
         """Prioritize a list of tasks"""
-        scored_tasks = []
-
-        for task in tasks:
-            score = self._calculate_priority_score(task)
-            scored_tasks.append({
-                **task,
-                "priority_score": score,
-                "recommended_order": 0
-            })
-
-        scored_tasks.sort(key=lambda x: x["priority_score"], reverse=True)
+        normalize = _TaskNormalizer(self.priority_scores, now)
+        records = [normalize(task) for task in tasks]
+        records.sort(key=lambda r: r.score, reverse=True)
 
-        for idx, task in enumerate(scored_tasks, 1):
-            task["recommended_order"] = idx
+        scored_tasks = [
+            {**r.task, "priority_score": r.score, "recommended_order": idx}
+            for idx, r in enumerate(records, 1)
+        ]
 
-        recommendations = self._generate_recommendations(scored_tasks)
+        recommendations = self._build_recommendations(records[:5], self._count_flags(records))
 
         return {
-            "total_tasks": len(tasks),
+            "total_tasks": len(records),
             "prioritized_tasks": scored_tasks,
             "recommendations": recommendations,
             "status": "prioritized"
         }
 
-    def _calculate_priority_score(self, task: Dict) -> float:
+    def prioritize_top_k(
+        self,
+        tasks: Iterable[Dict],
+        k: int = 5,
+        now: Optional[datetime] = None
+    ) -> Dict[str, any]:
+        """Return only the k highest-priority tasks from any iterable.
+
+        Tasks are consumed in a single pass (a generator over DB rows works),
+        keeping a bounded heap of the best candidates and the recommendation
+        counters, so memory is O(k). Ordering and tie-breaking match
+        ``prioritize_tasks``.
+        """
+        normalize = _TaskNormalizer(self.priority_scores, now)
+        keep = max(k, 5)
+        heap = []
+        counters = {"total": 0, "overdue": 0, "in_progress": 0, "blocked": 0, "urgent_high": 0}
+
+        for index, task in enumerate(tasks):
+            record = normalize(task)
+            # Earlier tasks win ties, as with the stable sort in prioritize_tasks
+            entry = (record.score, -index, record)
+            if len(heap) < keep:
+                heapq.heappush(heap, entry)
+            elif entry[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, entry)
+
+            counters["total"] += 1
+            counters["overdue"] += record.overdue
+            counters["in_progress"] += record.in_progress
+            counters["blocked"] += record.blocked
+            counters["urgent_high"] += record.urgent_high
+
+        top = [record for _, _, record in sorted(heap, key=lambda e: e[:2], reverse=True)]
+
+        return {
+            "total_tasks": counters["total"],
+            "prioritized_tasks": [
+                {**r.task, "priority_score": r.score, "recommended_order": idx}
+                for idx, r in enumerate(top[:k], 1)
+            ],
+            "recommendations": self._build_recommendations(top[:5], counters),
+            "counters": counters,
+            "status": "prioritized"
+        }
+
+    @staticmethod
+    def partition_tasks(
+        tasks: Iterable[Dict],
+        by: Union[str, Callable[[Dict], Any]] = "team"
+    ) -> Dict[Any, List[Dict]]:
+        """Group tasks by a field or key function.
+
+        ``by="tags"`` splits the comma-separated tags, so a task lands in
+        every tag's partition; tasks without a key go under None.
+        """
+        partitions: Dict[Any, List[Dict]] = {}
+        for task in tasks:
+            if callable(by):
+                keys = [by(task)]
+            elif by == "tags":
+                keys = [tag.strip() for tag in (task.get("tags") or "").split(",") if tag.strip()] or [None]
+            else:
+                keys = [task.get(by)]
+            for key in keys:
+                partitions.setdefault(key, []).append(task)
+        return partitions
+
+    def prioritize_partitions(
+        self,
+        partitions: Mapping[Any, List[Dict]],
+        max_workers: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        now: Optional[datetime] = None,
+        executor: Optional[Executor] = None
+    ) -> Iterator[Tuple[Any, Dict[str, any]]]:
+        """Prioritize independent task sets in parallel.
+
+        Partitions are grouped into chunks and fanned out over a process
+        pool; ``(key, result)`` pairs are yielded as chunks finish, and each
+        result matches ``prioritize_tasks`` on that partition. Every
+        partition is scored against the same reference clock. Pass an
+        ``executor`` to reuse a pool across calls.
+        """
+        now = now or datetime.now(timezone.utc)
+        items = list(partitions.items())
+        workers = max_workers or os.cpu_count() or 1
+
+        if not items:
+            return
+        if workers == 1 and executor is None:
+            for key, tasks in items:
+                yield key, self.prioritize_tasks(tasks, now)
+            return
+
+        if chunk_size is None:
+            # A few chunks per worker keeps the pool balanced without
+            # paying per-partition IPC overhead
+            chunk_size = max(1, -(-len(items) // (workers * 4)))
+
+        owned = executor is None
+        pool = executor or ProcessPoolExecutor(max_workers=workers)
+        try:
+            futures = []
+            for start in range(0, len(items), chunk_size):
+                chunk = items[start:start + chunk_size]
+                payload = [
+                    (key, [tuple(task.get(field) for field in SCORING_FIELDS) for task in tasks])
+                    for key, tasks in chunk
+                ]
+                futures.append(pool.submit(_prioritize_chunk, payload, now, self.priority_scores))
+
+            for future in as_completed(futures):
+                for key, order, scores, recommendations in future.result():
+                    tasks = partitions[key]
+                    yield key, {
+                        "total_tasks": len(tasks),
+                        "prioritized_tasks": [
+                            {**tasks[i], "priority_score": score, "recommended_order": idx}
+                            for idx, (i, score) in enumerate(zip(order, scores), 1)
+                        ],
+                        "recommendations": recommendations,
+                        "status": "prioritized"
+                    }
+        finally:
+            if owned:
+                pool.shutdown(cancel_futures=True)
+
+    def _calculate_priority_score(self, task: Dict, now: Optional[datetime] = None) -> float:
         """Calculate priority score for a task"""
-        score = 0.0
+        return _TaskNormalizer(self.priority_scores, now)(task).score
 
-        base_priority = task.get("priority", "medium").lower()
-        score += self.priority_scores.get(base_priority, 50)
+    def _calculate_urgency_score(self, due_date: str, now: Optional[datetime] = None) -> float:
+        """Calculate urgency score based on due date"""
+        now_aware, now_naive = reference_clock(now)
+        try:
+            due = parse_due_date(due_date)
+            return urgency_for_days((due - (now_aware if due.tzinfo else now_naive)).days)
 
-        due_date = task.get("due_date")
-        if due_date:
-            score += self._calculate_urgency_score(due_date)
+        except Exception:
+            return 0
 
-        if task.get("status") == "in_progress":
-            score += 20
+    def score_with_transition(
+        self,
+        task: Dict,
+        now: Optional[datetime] = None
+    ) -> Tuple[float, Optional[datetime]]:
+        """Score a task and return when its urgency bucket next changes.
+
+        The score stays valid until just after the returned instant; None
+        means it never changes with time (no due date, or already overdue).
+        """
+        return self._calculate_priority_score(task, now), self._next_urgency_transition(task.get("due_date"), now)
+
+    def _next_urgency_transition(self, due_date, now: Optional[datetime] = None) -> Optional[datetime]:
+        """First bucket boundary at or after now for a due date"""
+        return next_urgency_transition(due_date, now)
+
+    def score_tasks(self, tasks: List[Dict], now: Optional[datetime] = None) -> List[float]:
+        """Score many tasks at once with the columnar batch engine.
+
+        Produces the same scores as ``_calculate_priority_score`` evaluated
+        at the reference time ``now`` (defaults to the current time).
+        """
+        return BatchPriorityScorer(self.priority_scores).score(tasks, now)
+
+    def sql_priority_score(self, priority, status, due_date, tags, description,
+                           now: Optional[datetime] = None):
+        """Compile the scoring rules into one SQL expression.
+
+        Takes the SQLAlchemy columns holding each task field. Urgency buckets
+        become plain range comparisons on ``due_date`` against precomputed
+        bounds, so no date functions are needed. Due dates are compared as
+        naive timestamps, as the Python scorer does for rows loaded from
+        the database.
+        """
+        _, now_naive = reference_clock(now)
+
+        # Comparisons (rather than case(value=...)) let enum columns convert the keys
+        base = case(
+            *[(priority == key, weight) for key, weight in self.priority_scores.items()],
+            else_=DEFAULT_PRIORITY_SCORE
+        )
 
-        tags = task.get("tags", "")
-        if tags:
-            if "urgent" in tags.lower():
-                score += 30
-            if "critical" in tags.lower():
-                score += 25
-            if "blocked" in tags.lower():
-                score -= 40
+        urgency = case(
+            (due_date.is_(None), 0),
+            (due_date < now_naive, OVERDUE_URGENCY),
+            *[
+                (due_date < now_naive + timedelta(days=max_days + 1), score)
+                for max_days, score in URGENCY_BUCKETS
+            ],
+            else_=DISTANT_URGENCY
+        )
 
-        description = task.get("description", "")
-        if description:
-            if "asap" in description.lower():
-                score += 20
-            if "deadline" in description.lower():
-                score += 15
+        in_progress = case((status == "in_progress", IN_PROGRESS_BONUS), else_=0)
 
-        return score
+        keyword_bonuses = [
+            case((func.lower(column).contains(keyword), bonus), else_=0)
+            for column, table in ((tags, TAG_KEYWORD_BONUSES), (description, DESCRIPTION_KEYWORD_BONUSES))
+            for keyword, bonus in table
+        ]
 
-    def _calculate_urgency_score(self, due_date: str) -> float:
-        """Calculate urgency score based on due date"""
-        try:
-            if isinstance(due_date, str):
-                due = datetime.fromisoformat(due_date.replace('Z', '+00:00'))
-            else:
-                due = due_date
-
-            now = datetime.now(due.tzinfo) if due.tzinfo else datetime.now()
-            days_until_due = (due - now).days
-
-            if days_until_due < 0:
-                return 50
-            elif days_until_due == 0:
-                return 45
-            elif days_until_due == 1:
-                return 40
-            elif days_until_due <= 3:
-                return 30
-            elif days_until_due <= 7:
-                return 20
-            elif days_until_due <= 14:
-                return 10
-            else:
-                return 5
+        return sum(keyword_bonuses, base + urgency + in_progress)
+
+    def plan_daily_capacity(
+        self,
+        tasks: Iterable[Dict],
+        capacity_hours: float = 8.0,
+        capacities: Optional[Dict[Any, float]] = None,
+        slot_minutes: int = PLANNING_SLOT_MINUTES,
+        now: Optional[datetime] = None
+    ) -> Dict[str, any]:
+        """Pick the score-maximizing set of open tasks that fits each person's day.
+
+        Tasks are grouped by ``assignee``; each group gets ``capacities[assignee]``
+        hours (default ``capacity_hours``). Effort comes from ``effort_hours``
+        and is rounded up to whole ``slot_minutes`` slots. Each group is a 0/1
+        knapsack solved exactly when small and greedily (with its fractional
+        upper bound reported) otherwise.
+        """
+        normalize = _TaskNormalizer(self.priority_scores, now)
+        capacities = capacities or {}
+        slot_hours = slot_minutes / 60
+
+        groups: Dict[Any, List[_TaskRecord]] = {}
+        for task in tasks:
+            if task.get("status") in ("completed", "cancelled"):
+                continue
+            groups.setdefault(task.get("assignee"), []).append(normalize(task))
+
+        plans = []
+        demand_hours = 0.0
+        total_capacity = 0.0
+        deferred = 0
+        for assignee, records in groups.items():
+            capacity = capacities.get(assignee, capacity_hours)
+            efforts = [effort_of(r.task) for r in records]
+            weights = [-(-round(effort * 60) // slot_minutes) for effort in efforts]
+            selection = select_within_capacity(
+                [r.score for r in records], weights, int(capacity / slot_hours + 1e-9)
+            )
 
-        except Exception:
-            return 0
+            chosen = sorted(selection["chosen"], key=lambda i: records[i].score, reverse=True)
+            demand_hours += sum(efforts)
+            total_capacity += capacity
+            deferred += len(records) - len(chosen)
+            plans.append({
+                "assignee": assignee,
+                "capacity_hours": capacity,
+                "planned_hours": selection["weight"] * slot_hours,
+                "total_score": selection["value"],
+                "upper_bound": selection["upper_bound"],
+                "method": selection["method"],
+                "tasks": [
+                    {**records[i].task, "priority_score": records[i].score, "effort_hours": efforts[i]}
+                    for i in chosen
+                ],
+            })
 
-    def _generate_recommendations(self, sorted_tasks: List[Dict]) -> List[str]:
-        """Generate recommendations based on prioritized tasks"""
+        return {
+            "date": (now or datetime.now()).strftime("%Y-%m-%d"),
+            "plans": plans,
+            "total_planned_hours": sum(plan["planned_hours"] for plan in plans),
+            "deferred_tasks": deferred,
+            "capacity_assessment": _capacity_assessment(demand_hours, total_capacity),
+            "status": "planned"
+        }
+
+    def schedule_tasks(
+        self,
+        tasks: List[Dict],
+        dependencies: Iterable[Tuple[int, int]],
+        now: Optional[datetime] = None
+    ) -> Dict[str, any]:
+        """Schedule tasks around their dependencies.
+
+        ``dependencies`` holds ``(task_id, depends_on_id)`` pairs. Tasks are
+        returned in topological order with their critical path timings
+        (in effort hours from now) and a priority score raised for tasks
+        that block others or sit on the critical path. Tasks on or behind a
+        dependency cycle cannot be scheduled and are reported separately.
+        Every graph pass is linear in tasks plus dependencies.
+        """
+        normalize = _TaskNormalizer(self.priority_scores, now)
+        records = [normalize(task) for task in tasks]
+        graph = DependencyGraph([task.get("id") for task in tasks], dependencies)
+
+        order = graph.topological_order()
+        cycles = graph.cycles(order)
+        timings = graph.critical_path(order, [effort_of(task) for task in tasks])
+        dependents = graph.dependent_counts()
+        indegree = graph.indegree
+        slack = timings["slack"]
+
+        schedule = []
+        for i in order:
+            critical = slack[i] <= SLACK_EPSILON
+            schedule.append({
+                **records[i].task,
+                "priority_score": records[i].score + blocking_bonus(dependents[i], critical),
+                "blocks": dependents[i],
+                "ready": indegree[i] == 0,
+                "earliest_start": timings["earliest_start"][i],
+                "earliest_finish": timings["earliest_finish"][i],
+                "latest_start": timings["latest_start"][i],
+                "latest_finish": timings["latest_finish"][i],
+                "slack": slack[i],
+                "critical": critical,
+            })
+
+        ids = graph.ids
+        in_order = set(order)
+        return {
+            "total_tasks": len(tasks),
+            "total_dependencies": graph.edge_count,
+            "schedule": schedule,
+            "critical_path": [ids[i] for i in timings["path"]],
+            "project_duration": timings["duration"],
+            "cycles": [[ids[i] for i in component] for component in cycles],
+            "unschedulable": [ids[i] for i in range(len(ids)) if i not in in_order],
+            "status": "cycle_detected" if cycles else "scheduled"
+        }
+
+    def _count_flags(self, records: List[_TaskRecord]) -> Dict[str, int]:
+        counters = {"total": len(records), "overdue": 0, "in_progress": 0, "blocked": 0, "urgent_high": 0}
+        for r in records:
+            counters["overdue"] += r.overdue
+            counters["in_progress"] += r.in_progress
+            counters["blocked"] += r.blocked
+            counters["urgent_high"] += r.urgent_high
+        return counters
+
+    def _build_recommendations(self, top_records: List[_TaskRecord], counters: Dict[str, int]) -> List[str]:
+        """Build recommendations from the top five records and whole-list counters"""
         recommendations = []
 
-        if len(sorted_tasks) == 0:
+        if len(top_records) == 0:
             return ["No tasks to prioritize"]
 
-        top_task = sorted_tasks[0]
+        top_record = top_records[0]
         recommendations.append(
-            f"🎯 Focus on: '{top_task.get('title', 'Untitled')}' (Score: {top_task['priority_score']:.1f})"
+            f"🎯 Focus on: '{top_record.task.get('title', 'Untitled')}' (Score: {top_record.score:.1f})"
         )
 
-        overdue_tasks = [
-            t for t in sorted_tasks
-            if self._is_overdue(t.get("due_date"))
-        ]
-        if overdue_tasks:
+        if counters["overdue"]:
             recommendations.append(
-                f"⚠️  {len(overdue_tasks)} overdue task(s) need immediate attention"
+                f"⚠️  {counters['overdue']} overdue task(s) need immediate attention"
             )
 
-        in_progress = [
-            t for t in sorted_tasks
-            if t.get("status") == "in_progress"
-        ]
-        if in_progress:
+        if counters["in_progress"]:
             recommendations.append(
-                f"🔄 {len(in_progress)} task(s) currently in progress - consider completing before starting new ones"
+                f"🔄 {counters['in_progress']} task(s) currently in progress - consider completing before starting new ones"
             )
 
-        urgent_tasks = [
-            t for t in sorted_tasks[:5]
-            if t.get("priority", "").lower() in ["urgent", "high"]
-        ]
-        if len(urgent_tasks) >= 3:
+        if sum(r.urgent_high for r in top_records[:5]) >= 3:
             recommendations.append(
                 "🔥 Multiple high-priority tasks detected - consider delegation or timeline adjustment"
             )
 
-        blocked_tasks = [
-            t for t in sorted_tasks
-            if "blocked" in t.get("tags", "").lower()
-        ]
-        if blocked_tasks:
+        if counters["blocked"]:
             recommendations.append(
-                f"🚧 {len(blocked_tasks)} blocked task(s) - address blockers to improve flow"
+                f"🚧 {counters['blocked']} blocked task(s) - address blockers to improve flow"
             )
 
         return recommendations
 
-    def _is_overdue(self, due_date: Optional[str]) -> bool:
+    def _is_overdue(self, due_date: Optional[str], now: Optional[datetime] = None) -> bool:
         """Check if a task is overdue"""
         if not due_date:
             return False
 
+        now_aware, now_naive = reference_clock(now)
         try:
-            if isinstance(due_date, str):
-                due = datetime.fromisoformat(due_date.replace('Z', '+00:00'))
-            else:
-                due = due_date
-
-            now = datetime.now(due.tzinfo) if due.tzinfo else datetime.now()
-            return due < now
+            due = parse_due_date(due_date)
+            return due < (now_aware if due.tzinfo else now_naive)
 
         except Exception:
             return False
 
-    def suggest_daily_tasks(self, all_tasks: List[Dict], max_tasks: int = 5) -> Dict[str, any]:
+    def suggest_daily_tasks(self, all_tasks: Iterable[Dict], max_tasks: int = 5) -> Dict[str, any]:
         """Suggest top tasks to focus on today"""
-        result = self.prioritize_tasks(all_tasks)
+        result = self.prioritize_top_k(all_tasks, max_tasks)
 
-        daily_tasks = result["prioritized_tasks"][:max_tasks]
+        daily_tasks = result["prioritized_tasks"]
 
         return {
             "date": datetime.now().strftime("%Y-%m-%d"),
@@ -195,14 +550,11 @@ class TaskPrioritizerSkill:
             "status": "suggested"
         }
 
-    def estimate_daily_capacity(self, tasks: List[Dict]) -> Dict[str, any]:
+    def estimate_daily_capacity(self, tasks: Iterable[Dict]) -> Dict[str, any]:
         """Estimate if tasks fit within daily capacity"""
-        result = self.prioritize_tasks(tasks)
+        result = self.prioritize_top_k(tasks, 5)
 
-        urgent_count = sum(
-            1 for t in result["prioritized_tasks"]
-            if t.get("priority", "").lower() in ["urgent", "high"]
-        )
+        urgent_count = result["counters"]["urgent_high"]
 
         capacity_warning = None
         if urgent_count > 5:
@@ -213,14 +565,22 @@ class TaskPrioritizerSkill:
             capacity_warning = "✅ Workload appears manageable"
 
         return {
-            "total_tasks": len(tasks),
+            "total_tasks": result["total_tasks"],
             "urgent_high_priority": urgent_count,
             "capacity_assessment": capacity_warning,
-            "top_5_tasks": result["prioritized_tasks"][:5],
+            "top_5_tasks": result["prioritized_tasks"],
             "status": "assessed"
         }
 
 
+def _capacity_assessment(demand_hours: float, capacity_hours: float) -> str:
+    if demand_hours <= capacity_hours:
+        return "✅ Workload appears manageable"
+    if demand_hours > capacity_hours * 2:
+        return "⚠️  Open work far exceeds today's capacity - consider rescheduling"
+    return "⚡ More work than fits today - the plan covers the highest-value subset"
+
+
 def main():
     """Example usage"""
     prioritizer = TaskPrioritizerSkill()
@@ -0,0 +1,353 @@
+"""
+Dependency graph algorithms used by the Task Prioritizer scheduler.
+
+Graphs are stored in compressed sparse row form (one flat successor list
+plus offsets) over dense integer indexes, so every pass below is a plain
+loop over lists and the whole schedule runs in O(V + E).
+"""
+
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+
+DEFAULT_EFFORT_HOURS = 1.0
+
+# Added to the priority score per task directly waiting on this one
+BLOCKING_BONUS_PER_DEPENDENT = 5
+MAX_BLOCKING_BONUS = 30
+CRITICAL_PATH_BONUS = 15
+
+# Slack below this is treated as zero (float sums of effort hours)
+SLACK_EPSILON = 1e-9
+
+# Capacity planning works in whole slots; exact DP is used while
+# tasks x slots stays under the cell limit, greedy-by-density beyond it
+PLANNING_SLOT_MINUTES = 15
+KNAPSACK_CELL_LIMIT = 500_000
+
+
+class DependencyGraph:
+    """Directed graph where an edge u -> v means v depends on u"""
+
+    __slots__ = ("ids", "index", "offsets", "successors", "indegree")
+
+    def __init__(self, ids: Sequence[Hashable], dependencies: Iterable[Tuple[Hashable, Hashable]]):
+        """Build the graph from ``(task_id, depends_on_id)`` pairs.
+
+        Pairs naming a task outside ``ids`` are ignored: a dependency on a
+        finished or archived task is already satisfied. Duplicates are kept
+        once, at their first position.
+        """
+        self.ids = list(ids)
+        self.index = {task_id: i for i, task_id in enumerate(self.ids)}
+        n = len(self.ids)
+
+        index = self.index
+        # A dict rather than a set keeps edges in input order
+        edges = {}
+        for task_id, depends_on_id in dependencies:
+            v = index.get(task_id)
+            u = index.get(depends_on_id)
+            if u is not None and v is not None:
+                edges[u, v] = None
+
+        outdegree = [0] * n
+        indegree = [0] * n
+        for u, v in edges:
+            outdegree[u] += 1
+            indegree[v] += 1
+
+        offsets = [0] * (n + 1)
+        total = 0
+        for i in range(n):
+            total += outdegree[i]
+            offsets[i + 1] = total
+
+        successors = [0] * total
+        fill = offsets[:n]
+        for u, v in edges:
+            successors[fill[u]] = v
+            fill[u] += 1
+
+        self.offsets = offsets
+        self.successors = successors
+        self.indegree = indegree
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.successors)
+
+    def dependents(self, i: int) -> List[int]:
+        return self.successors[self.offsets[i]:self.offsets[i + 1]]
+
+    def dependent_counts(self) -> List[int]:
+        """Number of tasks directly waiting on each task"""
+        offsets = self.offsets
+        return [offsets[i + 1] - offsets[i] for i in range(len(self.ids))]
+
+    def topological_order(self) -> List[int]:
+        """Kahn's algorithm; tasks on or behind a cycle are left out.
+
+        Ties are broken by input order, so the result is deterministic:
+        tasks with no dependencies keep the order of ``ids``, and tasks
+        released by the same task follow the order of their dependency pairs.
+        """
+        remaining = list(self.indegree)
+        offsets, successors = self.offsets, self.successors
+        order = [i for i, d in enumerate(remaining) if d == 0]
+
+        # ``order`` doubles as the FIFO queue
+        head = 0
+        while head < len(order):
+            u = order[head]
+            head += 1
+            for j in range(offsets[u], offsets[u + 1]):
+                v = successors[j]
+                remaining[v] -= 1
+                if remaining[v] == 0:
+                    order.append(v)
+        return order
+
+    def cycles(self, order: Optional[List[int]] = None) -> List[List[int]]:
+        """Strongly connected components that contain a cycle.
+
+        Only tasks missing from the topological order can be on a cycle,
+        so Tarjan's algorithm (iterative, to avoid the recursion limit)
+        runs on those alone.
+        """
+        if order is None:
+            order = self.topological_order()
+        n = len(self.ids)
+        if len(order) == n:
+            return []
+
+        candidate = [True] * n
+        for i in order:
+            candidate[i] = False
+
+        offsets, successors = self.offsets, self.successors
+        low = [0] * n
+        number = [0] * n
+        on_stack = [False] * n
+        stack: List[int] = []
+        counter = 1
+        components = []
+
+        for root in range(n):
+            if not candidate[root] or number[root]:
+                continue
+
+            number[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+            work = [(root, offsets[root])]
+
+            while work:
+                u, j = work[-1]
+                if j < offsets[u + 1]:
+                    work[-1] = (u, j + 1)
+                    v = successors[j]
+                    if not candidate[v]:
+                        continue
+                    if not number[v]:
+                        number[v] = low[v] = counter
+                        counter += 1
+                        stack.append(v)
+                        on_stack[v] = True
+                        work.append((v, offsets[v]))
+                    elif on_stack[v] and number[v] < low[u]:
+                        low[u] = number[v]
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if low[u] < low[parent]:
+                        low[parent] = low[u]
+                if low[u] == number[u]:
+                    component = []
+                    while True:
+                        v = stack.pop()
+                        on_stack[v] = False
+                        component.append(v)
+                        if v == u:
+                            break
+                    if len(component) > 1 or u in self.dependents(u):
+                        components.append(sorted(component))
+
+        return components
+
+    def critical_path(self, order: List[int], durations: Sequence[float]) -> Dict[str, object]:
+        """Forward/backward pass over a topological order.
+
+        Returns earliest/latest start and finish per task (indexed like
+        ``ids``; tasks outside ``order`` get None), the slack, the project
+        duration and one zero-slack chain from start to finish.
+        """
+        n = len(self.ids)
+        offsets, successors = self.offsets, self.successors
+
+        earliest_start = [0.0] * n
+        earliest_finish = [0.0] * n
+        for u in order:
+            finish = earliest_start[u] + durations[u]
+            earliest_finish[u] = finish
+            for j in range(offsets[u], offsets[u + 1]):
+                v = successors[j]
+                if finish > earliest_start[v]:
+                    earliest_start[v] = finish
+
+        duration = max((earliest_finish[u] for u in order), default=0.0)
+
+        scheduled = [False] * n
+        for u in order:
+            scheduled[u] = True
+
+        latest_finish = [duration] * n
+        latest_start = [0.0] * n
+        for u in reversed(order):
+            finish = latest_finish[u]
+            for j in range(offsets[u], offsets[u + 1]):
+                v = successors[j]
+                # Tasks stuck behind a cycle are not scheduled and impose no deadline
+                if scheduled[v] and latest_start[v] < finish:
+                    finish = latest_start[v]
+            latest_finish[u] = finish
+            latest_start[u] = finish - durations[u]
+
+        slack = [
+            latest_start[i] - earliest_start[i] if scheduled[i] else None
+            for i in range(n)
+        ]
+
+        path = []
+        current = next(
+            (u for u in order if slack[u] <= SLACK_EPSILON and earliest_start[u] <= SLACK_EPSILON),
+            None
+        )
+        while current is not None:
+            path.append(current)
+            finish = earliest_finish[current]
+            current = next(
+                (
+                    v for v in self.dependents(current)
+                    if slack[v] is not None and slack[v] <= SLACK_EPSILON
+                    and abs(earliest_start[v] - finish) <= SLACK_EPSILON
+                ),
+                None
+            )
+
+        def only_scheduled(values):
+            return [value if scheduled[i] else None for i, value in enumerate(values)]
+
+        return {
+            "earliest_start": only_scheduled(earliest_start),
+            "earliest_finish": only_scheduled(earliest_finish),
+            "latest_start": only_scheduled(latest_start),
+            "latest_finish": only_scheduled(latest_finish),
+            "slack": slack,
+            "duration": duration,
+            "path": path,
+        }
+
+
+def effort_of(task: Dict) -> float:
+    """Effort in hours, falling back to the default for missing or invalid values"""
+    effort = task.get("effort_hours")
+    try:
+        effort = float(effort)
+    except (TypeError, ValueError):
+        return DEFAULT_EFFORT_HOURS
+    return effort if effort >= 0 else DEFAULT_EFFORT_HOURS
+
+
+def blocking_bonus(dependents: int, critical: bool) -> int:
+    """Priority boost for a task that other tasks are waiting on"""
+    bonus = min(dependents * BLOCKING_BONUS_PER_DEPENDENT, MAX_BLOCKING_BONUS)
+    return bonus + (CRITICAL_PATH_BONUS if critical else 0)
+
+
+def select_within_capacity(
+    values: Sequence[float],
+    weights: Sequence[int],
+    capacity: int,
+    cell_limit: int = KNAPSACK_CELL_LIMIT
+) -> Dict[str, object]:
+    """Choose items maximizing total value with total weight <= capacity.
+
+    Weights are whole slots. Small instances are solved exactly with 0/1
+    knapsack DP in O(items x capacity); larger ones greedily by value
+    density. Either way ``upper_bound`` is the fractional (LP) bound, so
+    the optimality gap of a greedy plan is known.
+    """
+    items = [i for i in range(len(values)) if values[i] > 0 and weights[i] <= capacity]
+    by_density = sorted(
+        items,
+        key=lambda i: values[i] / weights[i] if weights[i] else float("inf"),
+        reverse=True
+    )
+
+    upper_bound = 0.0
+    room = capacity
+    for i in by_density:
+        if weights[i] <= room:
+            upper_bound += values[i]
+            room -= weights[i]
+        else:
+            upper_bound += values[i] * room / weights[i]
+            break
+
+    if len(items) * (capacity + 1) <= cell_limit:
+        chosen = _knapsack(items, values, weights, capacity)
+        method = "knapsack"
+    else:
+        chosen = _greedy(by_density, values, weights, capacity)
+        method = "greedy"
+
+    return {
+        "chosen": chosen,
+        "value": sum(values[i] for i in chosen),
+        "weight": sum(weights[i] for i in chosen),
+        "upper_bound": upper_bound,
+        "method": method,
+    }
+
+
+def _knapsack(items: List[int], values: Sequence[float], weights: Sequence[int], capacity: int) -> List[int]:
+    best = [0.0] * (capacity + 1)
+    taken = []
+    for i in items:
+        weight, value = weights[i], values[i]
+        # Row update over whole lists; best[w - weight] is the previous row
+        candidates = [previous + value for previous in best[:capacity + 1 - weight]]
+        take = [False] * weight + [c > b for c, b in zip(candidates, best[weight:])]
+        best = best[:weight] + [c if c > b else b for c, b in zip(candidates, best[weight:])]
+        taken.append(take)
+
+    chosen = []
+    room = capacity
+    for i, take in zip(reversed(items), reversed(taken)):
+        if take[room]:
+            chosen.append(i)
+            room -= weights[i]
+    chosen.reverse()
+    return chosen
+
+
+def _greedy(by_density: List[int], values: Sequence[float], weights: Sequence[int], capacity: int) -> List[int]:
+    chosen = []
+    room = capacity
+    for i in by_density:
+        if weights[i] <= room:
+            chosen.append(i)
+            room -= weights[i]
+
+    # Guards the classic worst case of many small items crowding out one
+    # large valuable item; keeps the plan within 2x of optimal
+    best_single = max(by_density, key=lambda i: values[i], default=None)
+    if best_single is not None and values[best_single] > sum(values[i] for i in chosen):
+        return [best_single]
+    return chosen
@@ -0,0 +1,177 @@
+"""
+Columnar batch scoring engine for the Task Prioritizer skill. The scoring
+weights and thresholds live in ``app.models.scoring``.
+
+The batch engine turns a list of task dicts into column arrays once and
+computes every score component over whole columns. NumPy is used when it
+is installed; otherwise the standard library ``array`` module is used.
+"""
+
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.models.scoring import (
+    PRIORITY_SCORES,
+    DEFAULT_PRIORITY_SCORE,
+    IN_PROGRESS_BONUS,
+    TAG_KEYWORD_BONUSES,
+    DESCRIPTION_KEYWORD_BONUSES,
+    URGENCY_BUCKETS,
+    OVERDUE_URGENCY,
+    DISTANT_URGENCY,
+    keyword_bonus,
+    parse_due_date,
+    reference_clock,
+    urgency_for_days,
+)
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised when NumPy is absent
+    np = None
+
+
+EPOCH_AWARE = datetime(1970, 1, 1, tzinfo=timezone.utc)
+EPOCH_NAIVE = datetime(1970, 1, 1)
+ONE_MICROSECOND = timedelta(microseconds=1)
+DAY_MICROSECONDS = 86_400_000_000
+
+
+class TaskColumns:
+    """Columnar view of a task list"""
+
+    __slots__ = ("size", "base", "due_us", "due_kind", "in_progress", "keywords")
+
+    def __init__(self, size, base, due_us, due_kind, in_progress, keywords):
+        self.size = size
+        self.base = base
+        # due_kind: 0 = no/invalid due date, 1 = naive, 2 = timezone-aware
+        self.due_us = due_us
+        self.due_kind = due_kind
+        self.in_progress = in_progress
+        self.keywords = keywords
+
+
+class BatchPriorityScorer:
+    """Vectorized equivalent of ``TaskPrioritizerSkill._calculate_priority_score``"""
+
+    def __init__(self, priority_scores: Optional[Dict[str, int]] = None, use_numpy: bool = True):
+        self.priority_scores = dict(priority_scores or PRIORITY_SCORES)
+        self.use_numpy = use_numpy and np is not None
+
+    def score(self, tasks: Sequence[Dict], now: Optional[datetime] = None) -> List[float]:
+        """Score every task against a single reference clock"""
+        return self.score_columns(self.to_columns(tasks), now)
+
+    def to_columns(self, tasks: Sequence[Dict]) -> TaskColumns:
+        """Extract the score inputs of every task, one column at a time.
+
+        Each raw value is converted once per distinct value (large backlogs
+        repeat the same priorities, due dates and tags heavily), and the
+        per-task work is reduced to C-level dict lookups.
+        """
+        base = list(map(
+            MemoDict(self._base_score).__getitem__,
+            [task.get("priority", "medium") for task in tasks]
+        ))
+        due = list(map(
+            MemoDict(self._due_to_micros).__getitem__,
+            [task.get("due_date") for task in tasks]
+        ))
+        in_progress = [task.get("status") == "in_progress" for task in tasks]
+        tag_bonus = MemoDict(lambda text: keyword_bonus(text, TAG_KEYWORD_BONUSES) if text else 0)
+        description_bonus = MemoDict(lambda text: keyword_bonus(text, DESCRIPTION_KEYWORD_BONUSES) if text else 0)
+        keywords = [
+            tag_bonus[task.get("tags", "")] + description_bonus[task.get("description", "")]
+            for task in tasks
+        ]
+        due_us = [micros for micros, _ in due]
+        due_kind = [kind for _, kind in due]
+
+        if self.use_numpy:
+            return TaskColumns(
+                len(base),
+                np.array(base, dtype=np.float64),
+                np.array(due_us, dtype=np.int64),
+                np.array(due_kind, dtype=np.int8),
+                np.array(in_progress, dtype=bool),
+                np.array(keywords, dtype=np.float64),
+            )
+        return TaskColumns(
+            len(base),
+            array("d", base),
+            array("q", due_us),
+            array("b", due_kind),
+            array("b", in_progress),
+            array("d", keywords),
+        )
+
+    def _base_score(self, priority) -> int:
+        key = priority.lower() if isinstance(priority, str) else None
+        return self.priority_scores.get(key, DEFAULT_PRIORITY_SCORE)
+
+    def score_columns(self, columns: TaskColumns, now: Optional[datetime] = None) -> List[float]:
+        """Compute scores for pre-built columns at the given reference time"""
+        now_aware, now_naive = reference_clock(now)
+        ref_aware = (now_aware - EPOCH_AWARE) // ONE_MICROSECOND
+        ref_naive = (now_naive - EPOCH_NAIVE) // ONE_MICROSECOND
+
+        if self.use_numpy:
+            return self._score_numpy(columns, ref_naive, ref_aware)
+        return self._score_arrays(columns, ref_naive, ref_aware)
+
+    def _score_numpy(self, columns: TaskColumns, ref_naive: int, ref_aware: int) -> List[float]:
+        reference = np.where(columns.due_kind == 2, ref_aware, ref_naive)
+        days = np.floor_divide(columns.due_us - reference, DAY_MICROSECONDS)
+
+        conditions = [days < 0] + [days <= max_days for max_days, _ in URGENCY_BUCKETS]
+        choices = [OVERDUE_URGENCY] + [score for _, score in URGENCY_BUCKETS]
+        urgency = np.select(conditions, choices, DISTANT_URGENCY)
+        urgency = np.where(columns.due_kind > 0, urgency, 0)
+
+        scores = (
+            columns.base
+            + urgency
+            + np.where(columns.in_progress, IN_PROGRESS_BONUS, 0)
+            + columns.keywords
+        )
+        return scores.tolist()
+
+    def _score_arrays(self, columns: TaskColumns, ref_naive: int, ref_aware: int) -> List[float]:
+        references = (0, ref_naive, ref_aware)
+        urgency = MemoDict(urgency_for_days)
+        return [
+            base
+            + (urgency[(due_us - references[kind]) // DAY_MICROSECONDS] if kind else 0)
+            + (IN_PROGRESS_BONUS if in_progress else 0)
+            + keywords
+            for base, due_us, kind, in_progress, keywords in zip(
+                columns.base, columns.due_us, columns.due_kind, columns.in_progress, columns.keywords
+            )
+        ]
+
+    @staticmethod
+    def _due_to_micros(due_date) -> Tuple[int, int]:
+        """Return (microseconds since epoch, kind); missing or unparseable dates score 0"""
+        if not due_date:
+            return 0, 0
+        try:
+            due = parse_due_date(due_date)
+            if due.tzinfo is not None:
+                return (due - EPOCH_AWARE) // ONE_MICROSECOND, 2
+            return (due - EPOCH_NAIVE) // ONE_MICROSECOND, 1
+        except Exception:
+            return 0, 0
+
+
+class MemoDict(dict):
+    """Dict that computes and caches missing keys"""
+
+    def __init__(self, func):
+        super().__init__()
+        self.func = func
+
+    def __missing__(self, key):
+        value = self[key] = self.func(key)
+        return value
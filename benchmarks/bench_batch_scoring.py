@@ -0,0 +1,71 @@
+"""
+Benchmark: per-task priority scoring vs the columnar batch engine.
+
+Usage: python benchmarks/bench_batch_scoring.py [sizes...]
+Default sizes: 10000 100000 1000000
+"""
+
+import gc
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.skills import TaskPrioritizerSkill
+from app.skills.task_scoring import BatchPriorityScorer, np
+
+
+def make_tasks(n: int, seed: int = 42):
+    rng = random.Random(seed)
+    now = datetime.now()
+    due_dates = [(now + timedelta(days=d)).isoformat() for d in range(-10, 60)] + [None]
+    tags = ["", "bug", "urgent,bug", "critical", "blocked", "feature,ui", None]
+    descriptions = ["", "Fix ASAP", "Hard deadline Friday", "Refactor module", None]
+    return [
+        {
+            "id": i,
+            "title": f"Task {i}",
+            "priority": rng.choice(["low", "medium", "high", "urgent"]),
+            "status": rng.choice(["todo", "in_progress", "todo", "completed"]),
+            "due_date": rng.choice(due_dates),
+            "tags": rng.choice(tags),
+            "description": rng.choice(descriptions),
+        }
+        for i in range(n)
+    ]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    prioritizer = TaskPrioritizerSkill()
+    engines = [("array", BatchPriorityScorer(use_numpy=False))]
+    if np is not None:
+        engines.append(("numpy", BatchPriorityScorer(use_numpy=True)))
+
+    print(f"{'tasks':>10} {'scalar':>10} " + " ".join(f"{name:>10}" for name, _ in engines))
+    for n in sizes:
+        tasks = make_tasks(n)
+        # Keep collection of the freshly built task dicts out of the timings
+        gc.collect()
+        gc.freeze()
+        expected, scalar_time = timed(lambda: [prioritizer._calculate_priority_score(t) for t in tasks])
+        row = [f"{n:>10}", f"{scalar_time:>9.3f}s"]
+        for name, engine in engines:
+            scores, elapsed = timed(lambda: engine.score(tasks))
+            assert len(scores) == n
+            row.append(f"{elapsed:>9.3f}s")
+        print(" ".join(row))
+        gc.unfreeze()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Benchmark: plan_daily_capacity latency for thousands of candidate tasks
+spread across tens of assignees (target: interactive, under 100 ms).
+
+Usage: python benchmarks/bench_capacity_planner.py [tasks] [assignees]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.skills import TaskPrioritizerSkill
+from bench_batch_scoring import make_tasks
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    assignees = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    prioritizer = TaskPrioritizerSkill()
+    rng = random.Random(11)
+
+    tasks = make_tasks(n)
+    for task in tasks:
+        task["assignee"] = f"dev-{rng.randrange(assignees)}"
+        task["effort_hours"] = rng.choice([0.25, 0.5, 1, 2, 3, 4, 8, 16])
+
+    print(f"tasks={n} assignees={assignees}")
+    for label, unassigned in (("per assignee", False), ("one shared pool", True)):
+        candidates = [{**task, "assignee": None} for task in tasks] if unassigned else tasks
+        timings = []
+        for _ in range(5):
+            start = time.perf_counter()
+            result = prioritizer.plan_daily_capacity(candidates, capacity_hours=8)
+            timings.append(time.perf_counter() - start)
+
+        methods = sorted({plan["method"] for plan in result["plans"]})
+        gap = max(1 - plan["total_score"] / plan["upper_bound"] for plan in result["plans"] if plan["upper_bound"])
+        print(
+            f"  {label:<16} best {min(timings) * 1000:7.1f} ms  "
+            f"method={','.join(methods)}  worst gap to LP bound {gap:.2%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark: CodeReviewSkill.review_directory serially vs over a process
+pool, at increasing worker counts, on a generated tree of modules.
+
+Usage: python benchmarks/bench_code_review.py [files]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.skills import CodeReviewSkill
+
+
+FUNCTION = '''
+def handler_{n}(request, session, user, payload, options, retries):
+    try:
+        value = payload.get("value")
+    except:
+        value = None
+    return {{"value": value, "user": user, "n": {n}}}
+'''
+
+
+def make_tree(root: str, files: int, seed: int = 7):
+    """Write ``files`` modules of skewed sizes under ``root``"""
+    rng = random.Random(seed)
+    for i in range(files):
+        package = os.path.join(root, f"pkg{i % 50}")
+        os.makedirs(package, exist_ok=True)
+        functions = max(1, int(rng.paretovariate(1.5) * 5))
+        with open(os.path.join(package, f"module_{i}.py"), "w") as f:
+            f.write("import os\n\n")
+            f.writelines(FUNCTION.format(n=n) for n in range(functions))
+
+
+def main():
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    reviewer = CodeReviewSkill()
+
+    with tempfile.TemporaryDirectory() as root:
+        make_tree(root, files)
+
+        start = time.perf_counter()
+        baseline = reviewer.review_directory(root)
+        serial = time.perf_counter() - start
+
+        print(f"files={files} cpus={os.cpu_count()}")
+        print(f"  serial:             {serial:8.3f}s  {baseline['total_issues']} issues")
+
+        workers = 2
+        while workers <= max(2, os.cpu_count() or 1):
+            start = time.perf_counter()
+            result = reviewer.review_directory(root, max_workers=workers)
+            elapsed = time.perf_counter() - start
+            assert result == baseline
+            print(f"  {workers:>2} worker(s):       {elapsed:8.3f}s  speedup {serial / elapsed:5.2f}x")
+            workers *= 2
+
+
+if __name__ == "__main__":
+    main()
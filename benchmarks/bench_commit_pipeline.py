@@ -0,0 +1,77 @@
+"""
+Benchmark: buffered git log + per-message regexes vs the streaming
+commit pipeline, over one large history.
+
+Usage: python benchmarks/bench_commit_pipeline.py [commits]
+"""
+
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.skills import StandupReporterSkill
+from app.skills.git_collector import git_log_command
+from bench_git_collection import make_repo
+
+
+def legacy_summary(repo_path, day):
+    """The pre-pipeline approach: buffer all output, then re-scan each message"""
+    result = subprocess.run(git_log_command(repo_path, day, log_format="%s"), capture_output=True, text=True)
+    commits = [c for c in result.stdout.split('\n') if c.strip()]
+
+    cleaned = []
+    for message in commits:
+        message = re.sub(r'^(fix|feat|docs|style|refactor|test|chore):\s*', '', message, flags=re.IGNORECASE)
+        message = re.sub(r'^(fixed|added|updated|removed|created)\s+', '', message, flags=re.IGNORECASE)
+        cleaned.append(message.strip())
+
+    blockers = []
+    for commit in commits:
+        lower_commit = commit.lower()
+        for keyword in ['wip', 'todo', 'fixme', 'blocked', 'issue', 'bug']:
+            if keyword in lower_commit:
+                blockers.append(commit)
+                break
+    return len(commits), len(blockers)
+
+
+def measure(fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    commits = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    day = datetime.now().date()
+
+    with tempfile.TemporaryDirectory() as root:
+        path = os.path.join(root, "repo")
+        make_repo(path, commits)
+
+        legacy, legacy_time, legacy_peak = measure(lambda: legacy_summary(path, day))
+        streamed, stream_time, stream_peak = measure(
+            lambda: StandupReporterSkill().generate_summary(path, since=day, until=day)
+        )
+
+    assert legacy == (streamed["total_commits"], streamed["blockers_count"])
+    print(f"commits={commits}")
+    print(f"  buffered + re.sub:  {legacy_time:8.3f}s  peak {legacy_peak / 1e6:8.1f} MB")
+    print(f"  streaming pipeline: {stream_time:8.3f}s  peak {stream_peak / 1e6:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark: review_diff against a base ref vs review_directory on a
+repository where only a handful of files changed.
+
+Usage: python benchmarks/bench_diff_review.py [files] [changed]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.skills import CodeReviewSkill
+from bench_code_review import make_tree
+
+
+def git(repo, *args):
+    env = {
+        **os.environ,
+        "GIT_AUTHOR_NAME": "Bench", "GIT_AUTHOR_EMAIL": "bench@example.com",
+        "GIT_COMMITTER_NAME": "Bench", "GIT_COMMITTER_EMAIL": "bench@example.com",
+    }
+    subprocess.run(["git", "-C", repo, *args], check=True, capture_output=True, env=env)
+
+
+def main():
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    changed = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    reviewer = CodeReviewSkill()
+
+    with tempfile.TemporaryDirectory() as repo:
+        make_tree(repo, files)
+        git(repo, "init", "-q")
+        git(repo, "add", "-A")
+        git(repo, "commit", "-q", "-m", "Initial")
+
+        paths = sorted(
+            os.path.join(directory, name)
+            for directory, _, names in os.walk(repo) if ".git" not in directory
+            for name in names
+        )
+        for path in paths[::max(1, len(paths) // changed)][:changed]:
+            with open(path, "a") as f:
+                f.write("\n\ndef added(a, b, c, d, e, f, g):\n    try:\n        pass\n    except:\n        pass\n")
+
+        start = time.perf_counter()
+        whole = reviewer.review_directory(repo)
+        directory = time.perf_counter() - start
+
+        start = time.perf_counter()
+        scoped = reviewer.review_diff(base_ref="HEAD", repo_path=repo)
+        diff = time.perf_counter() - start
+
+        print(f"files={files} changed={changed}")
+        print(f"  review_directory:   {directory:8.3f}s  {whole['total_issues']} issues")
+        print(
+            f"  review_diff:        {diff:8.3f}s  "
+            f"{scoped['total_issues']} issues in {scoped['files_reviewed']} files"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark: sequential git log per repository vs the concurrent collector.
+
+Creates throwaway repositories with a few hundred commits each.
+
+Usage: python benchmarks/bench_git_collection.py [repos] [commits_per_repo] [concurrency]
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.skills.git_collector import GitCommitCollector, git_log_command
+
+
+def make_repo(path, commits):
+    """Repository with ``commits`` commits dated now"""
+    subprocess.run(["git", "init", "-q", path], check=True)
+    # fast-import writes all commits in one process
+    stream = "".join(
+        f"commit refs/heads/main\ncommitter Bench <bench@example.com> {int(time.time())} +0000\n"
+        f"data {len(f'Commit {i}')}\nCommit {i}\n\n"
+        for i in range(commits)
+    )
+    subprocess.run(["git", "-C", path, "fast-import", "--quiet"], input=stream, text=True, check=True)
+    subprocess.run(["git", "-C", path, "symbolic-ref", "HEAD", "refs/heads/main"], check=True)
+
+
+def main():
+    repos = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    commits = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    concurrency = int(sys.argv[3]) if len(sys.argv) > 3 else 16
+    day = datetime.now().date()
+
+    with tempfile.TemporaryDirectory() as root:
+        paths = [os.path.join(root, f"repo{i}") for i in range(repos)]
+        for path in paths:
+            make_repo(path, commits)
+
+        start = time.perf_counter()
+        sequential = 0
+        for path in paths:
+            result = subprocess.run(git_log_command(path, day), capture_output=True, text=True)
+            sequential += len(result.stdout.splitlines())
+        sequential_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        collected = asyncio.run(GitCommitCollector(max_concurrency=concurrency).collect(paths, day))
+        concurrent_time = time.perf_counter() - start
+
+    assert len(collected["commits"]) == sequential
+    print(f"repos={repos} commits/repo={commits} concurrency={concurrency} cpus={os.cpu_count()} found={sequential}")
+    print(f"  sequential: {sequential_time:8.3f}s")
+    print(f"  concurrent: {concurrent_time:8.3f}s  speedup {sequential_time / concurrent_time:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
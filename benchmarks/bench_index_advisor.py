@@ -0,0 +1,104 @@
+"""
+Benchmark: capture the workload of a scripted API session, ask the index
+advisor for indexes, apply its recommendations and replay the session.
+
+Also reports what workload capture costs per request.
+
+Usage: python benchmarks/bench_index_advisor.py [tasks] [rounds]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+directory = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+os.environ["WORKLOAD_CAPTURE_ENABLED"] = "true"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlmodel import Session
+
+from app.database import create_db_and_tables, engine, workload_recorder
+from app.main import app
+from app.models import Task
+from app.skills import DatabaseOptimizerSkill
+
+
+def seed(tasks: int):
+    create_db_and_tables()
+    with Session(engine) as session:
+        for i in range(tasks):
+            session.add(Task(
+                title=f"Task {i}",
+                status=["todo", "in_progress", "completed"][i % 3],
+                priority=["low", "medium", "high", "urgent"][i % 4],
+                due_date=datetime(2024, 1, 1) + timedelta(hours=i),
+            ))
+        session.commit()
+
+
+def session_requests(client: TestClient, rounds: int) -> float:
+    """A mix of list, lookup and update requests; returns elapsed seconds"""
+    start = time.perf_counter()
+    for i in range(rounds):
+        client.get("/tasks/", params={"sort": "title", "limit": 20})
+        client.get("/tasks/", params={"priority": "high", "limit": 20})
+        client.get(f"/tasks/{i + 1}")
+        client.put(f"/tasks/{i + 1}", json={"title": f"Renamed {i}"})
+    return time.perf_counter() - start
+
+
+def main():
+    tasks = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    seed(tasks)
+
+    with TestClient(app) as client:
+        session_requests(client, rounds)
+        # Alternate capture off and on; the best of three runs each
+        uncaptured, captured = float("inf"), float("inf")
+        for _ in range(3):
+            workload_recorder.detach()
+            uncaptured = min(uncaptured, session_requests(client, rounds))
+            workload_recorder.attach()
+            workload_recorder.reset()
+            captured = min(captured, session_requests(client, rounds))
+        workload = workload_recorder.snapshot()
+
+        start = time.perf_counter()
+        advice = DatabaseOptimizerSkill().advise_indexes(workload, engine)
+        advise_time = time.perf_counter() - start
+
+        with engine.begin() as connection:
+            for ddl in advice["recommended"]:
+                connection.execute(text(ddl))
+        workload_recorder.detach()
+        tuned = session_requests(client, rounds)
+
+    requests = rounds * 4
+    print(f"tasks={tasks} requests={requests} fingerprints={len(workload)}")
+    print(f"  capture off:          {uncaptured * 1e6 / requests:8.1f}us/request")
+    print(f"  capture on:           {captured * 1e6 / requests:8.1f}us/request")
+    print(f"  advise_indexes:       {advise_time:8.3f}s  ({len(advice['candidates'])} candidates evaluated)")
+    for candidate in advice["candidates"]:
+        amplification = candidate.get("write_amplification", {})
+        print(
+            f"    {'*' if candidate['recommended'] else ' '} {candidate['ddl']}: "
+            f"saves {candidate.get('read_saved_ms', 0):.1f}ms, "
+            f"writes +{amplification.get('extra_ms', 0):.2f}ms, {candidate.get('size_bytes', 0) // 1024}KiB"
+        )
+        for statement in candidate.get("statements", []):
+            print(
+                f"        {statement['kind']:5} x{statement['count']:<4} "
+                f"{statement['before_ms']:7.3f} -> {statement['after_ms']:7.3f}ms  {statement['fingerprint'][:60]}"
+            )
+    print(f"  session after applying {len(advice['recommended'])} index(es): "
+          f"{uncaptured:.3f}s -> {tuned:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
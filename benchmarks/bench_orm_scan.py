@@ -0,0 +1,69 @@
+"""
+Benchmark: scan this repository's app/ package for SQLModel anti-patterns,
+then a tree of many copies of it, serially and over a process pool.
+
+Also runs the old substring checks of analyze_sqlmodel_code over the same
+files for comparison.
+
+Usage: python benchmarks/bench_orm_scan.py [copies] [workers]
+"""
+
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app.skills import DatabaseOptimizerSkill
+
+
+def substring_findings(path: str) -> int:
+    """What analyze_sqlmodel_code reported before the AST scanner"""
+    with open(path, encoding="utf-8") as f:
+        code = f.read()
+    found = int(".all()" in code and "limit" not in code.lower())
+    return found + int("select(" in code and not re.search(r"select\([A-Za-z_]+\)", code))
+
+
+def timed_scan(optimizer: DatabaseOptimizerSkill, path: str, workers: int):
+    start = time.perf_counter()
+    result = optimizer.scan_codebase(path, max_workers=workers)
+    return result, time.perf_counter() - start
+
+
+def main():
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    optimizer = DatabaseOptimizerSkill()
+    app = os.path.join(ROOT, "app")
+
+    result, elapsed = timed_scan(optimizer, app, 1)
+    paths = sorted(
+        os.path.join(directory, name)
+        for directory, _, names in os.walk(app) for name in names if name.endswith(".py")
+    )
+    print(f"app/: {result['files_scanned']} files in {elapsed * 1000:.1f}ms, {result['by_type']}")
+    for item in result["findings"]:
+        print(f"  {os.path.relpath(item['file'], ROOT)}:{item['line']}  {item['type']}  {item['issue']}")
+    print(f"  substring checks: {sum(substring_findings(path) for path in paths)} recommendations, no locations")
+
+    with tempfile.TemporaryDirectory() as tree:
+        for i in range(copies):
+            shutil.copytree(app, os.path.join(tree, f"copy_{i}"), ignore=shutil.ignore_patterns("__pycache__"))
+
+        serial, serial_time = timed_scan(optimizer, tree, 1)
+        parallel, parallel_time = timed_scan(optimizer, tree, workers)
+        assert parallel["findings"] == serial["findings"]
+
+    files = serial["files_scanned"]
+    print(f"{copies} copies: {files} files, {serial['total_findings']} findings")
+    print(f"  1 worker:   {serial_time:7.3f}s  ({files / serial_time:,.0f} files/s)")
+    print(f"  {workers} workers:  {parallel_time:7.3f}s  ({files / parallel_time:,.0f} files/s, cpus={os.cpu_count()})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Benchmark: serial per-team prioritize_tasks vs prioritize_partitions
+over a process pool, at increasing worker counts.
+
+Usage: python benchmarks/bench_partitioned.py [teams] [tasks_per_team]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.skills import TaskPrioritizerSkill
+from bench_batch_scoring import make_tasks
+
+
+def main():
+    teams = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    per_team = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    prioritizer = TaskPrioritizerSkill()
+
+    tasks = make_tasks(teams * per_team)
+    for task in tasks:
+        task["team"] = task["id"] % teams
+    partitions = prioritizer.partition_tasks(tasks, by="team")
+
+    start = time.perf_counter()
+    for team_tasks in partitions.values():
+        prioritizer.prioritize_tasks(team_tasks)
+    serial = time.perf_counter() - start
+
+    print(f"teams={teams} tasks/team={per_team} cpus={os.cpu_count()}")
+    print(f"  serial loop:        {serial:8.3f}s")
+
+    workers = 1
+    while workers <= max(2, os.cpu_count() or 1):
+        start = time.perf_counter()
+        count = sum(1 for _ in prioritizer.prioritize_partitions(partitions, max_workers=workers))
+        elapsed = time.perf_counter() - start
+        assert count == len(partitions)
+        print(f"  {workers:>2} worker(s):       {elapsed:8.3f}s  speedup {serial / elapsed:5.2f}x")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
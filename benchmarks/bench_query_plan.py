@@ -0,0 +1,80 @@
+"""
+Benchmark: heuristic analyze_query vs plan-based analyze_query_plans on a
+seeded task database, compared against each query's measured latency.
+
+Usage: python benchmarks/bench_query_plan.py [tasks]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.models import Task
+from app.skills import DatabaseOptimizerSkill
+
+
+QUERIES = [
+    "SELECT id, title FROM task WHERE status = 'TODO' ORDER BY priority_rank DESC, due_date, id LIMIT 20",
+    "SELECT * FROM task WHERE id = 42",
+    "SELECT id, title FROM task WHERE status = 'COMPLETED' AND updated_at > '2024-06-01'",
+    "SELECT id FROM task",
+    "SELECT * FROM task WHERE LOWER(status) = 'todo'",
+    "SELECT * FROM task WHERE description = 'x' ORDER BY created_at",
+    "SELECT t.id FROM task t JOIN task_dependency d ON d.task_id = t.id WHERE t.title = 'Task 7'",
+    "SELECT * FROM task ORDER BY title LIMIT 10",
+]
+
+
+def seed(url: str, tasks: int):
+    engine = create_engine(url)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        for i in range(tasks):
+            session.add(Task(
+                title=f"Task {i}",
+                status=["todo", "in_progress", "completed"][i % 3],
+                priority=["low", "medium", "high", "urgent"][i % 4],
+                due_date=datetime(2024, 1, 1) + timedelta(hours=i),
+                tags="blocked" if i % 7 == 0 else None,
+            ))
+        session.commit()
+    return engine
+
+
+def main():
+    tasks = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    optimizer = DatabaseOptimizerSkill()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = seed(f"sqlite:///{os.path.join(directory, 'bench.db')}", tasks)
+
+        start = time.perf_counter()
+        heuristic = [optimizer.analyze_query(query) for query in QUERIES]
+        heuristic_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        planned = optimizer.analyze_query_plans(QUERIES, engine, runs=5)
+        plan_time = time.perf_counter() - start
+        engine.dispose()
+
+    print(f"tasks={tasks} queries={len(QUERIES)}")
+    print(f"  analyze_query:        {heuristic_time * 1000:8.2f}ms")
+    print(f"  analyze_query_plans:  {plan_time * 1000:8.2f}ms  (copy, ANALYZE, plans and 5 timed runs each)")
+    print()
+    print(f"  {'median ms':>10}  {'heuristic':>9}  {'plan':<24}  query")
+    for query, guess, result in zip(QUERIES, heuristic, planned):
+        found = [r for r in result["recommendations"] if r["severity"] in ("high", "medium")]
+        print(
+            f"  {result['timing']['median_ms']:10.3f}  {guess['total_recommendations']:>9}  "
+            f"{','.join(sorted({r['type'] for r in found})) or '-':<24}  {query[:60]}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark: review cost as rules are added. Compares the single-pass
+ReviewEngine against running each rule as its own ast.walk + line scan
+(the shape of the previous implementation), with 6 built-in rules and
+with 50 extra generated rules.
+
+Usage: python benchmarks/bench_review_rules.py [files]
+"""
+
+import ast
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.skills.review_rules import Rule, ReviewEngine, issue, registry
+from bench_code_review import make_tree
+
+
+NODE_TYPES = [ast.Call, ast.Name, ast.Attribute, ast.Constant, ast.FunctionDef, ast.Return, ast.Compare, ast.Dict]
+
+
+def make_rule(n: int) -> Rule:
+    """A cheap rule on one node type; every fifth also checks lines"""
+    node_type = NODE_TYPES[n % len(NODE_TYPES)]
+
+    class Generated(Rule):
+        name = f"generated_{n}"
+        node_types = (node_type,)
+        checks_lines = n % 5 == 0
+
+        def check_node(self, node):
+            if getattr(node, "lineno", 0) % 997 == n:
+                yield issue(self.name, "low", node.lineno, "generated")
+
+        def check_line(self, lineno, line, previous):
+            if len(line) == 200 + n:
+                yield issue(self.name, "low", lineno, "generated")
+
+    return Generated()
+
+
+def review_per_rule(rules, content):
+    """One tree walk and one line scan per rule"""
+    issues = []
+    tree = ast.parse(content)
+    lines = content.split('\n')
+    for rule in rules:
+        for node in ast.walk(tree):
+            if isinstance(node, rule.node_types):
+                issues.extend(rule.check_node(node))
+        if rule.checks_lines:
+            previous = None
+            for lineno, line in enumerate(lines, 1):
+                issues.extend(rule.check_line(lineno, line, previous))
+                previous = line
+    return issues
+
+
+def main():
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+    with tempfile.TemporaryDirectory() as root:
+        make_tree(root, files)
+        sources = []
+        for directory, _, names in os.walk(root):
+            for name in names:
+                with open(os.path.join(directory, name)) as f:
+                    sources.append(f.read())
+
+    builtin = registry.select()
+    extended = builtin + [make_rule(n) for n in range(50)]
+    print(f"files={len(sources)}")
+
+    for label, rules in [("6 rules", builtin), ("56 rules", extended)]:
+        start = time.perf_counter()
+        for content in sources:
+            review_per_rule(rules, content)
+        per_rule = time.perf_counter() - start
+
+        engine = ReviewEngine(rules)
+        start = time.perf_counter()
+        for content in sources:
+            engine.review(content)
+        single = time.perf_counter() - start
+
+        timed_engine = ReviewEngine(rules, timed=True)
+        start = time.perf_counter()
+        for content in sources:
+            timed_engine.review(content)
+        timed = time.perf_counter() - start
+
+        print(
+            f"  {label:>8}: pass per rule {per_rule:7.3f}s  single pass {single:7.3f}s  "
+            f"single pass, timed {timed:7.3f}s"
+        )
+
+    print("  costliest rules (56, timed):")
+    for row in timed_engine.report()[:5]:
+        print(f"    {row['rule']:<24} {row['calls']:>8} calls  {row['seconds']:.3f}s  {row['share']:.1%}")
+
+
+if __name__ == "__main__":
+    main()
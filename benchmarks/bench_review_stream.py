@@ -0,0 +1,73 @@
+"""
+Benchmark: streaming iter_review_directory vs review_directory on a tree
+whose .venv holds most of the Python files. Reports discovery time with
+and without pruning, time to first result, total time and peak traced
+memory.
+
+Usage: python benchmarks/bench_review_stream.py [project_files] [venv_files]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.skills import CodeReviewSkill
+from app.skills.source_tree import iter_python_files
+from bench_code_review import make_tree
+
+
+def measure(run):
+    tracemalloc.start()
+    start = time.perf_counter()
+    first, count = run(start)
+    total = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return first, total, peak, count
+
+
+def main():
+    project = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    venv = int(sys.argv[2]) if len(sys.argv) > 2 else 8000
+    reviewer = CodeReviewSkill()
+
+    with tempfile.TemporaryDirectory() as root:
+        make_tree(os.path.join(root, "src"), project)
+        make_tree(os.path.join(root, ".venv", "lib"), venv, seed=11)
+
+        start = time.perf_counter()
+        everything = sum(1 for _ in iter_python_files(root, max_file_size=None, excluded_dirs=()))
+        unpruned = time.perf_counter() - start
+        start = time.perf_counter()
+        pruned_count = sum(1 for _ in iter_python_files(root))
+        pruned = time.perf_counter() - start
+
+        def whole(start):
+            result = reviewer.review_directory(root)
+            return time.perf_counter() - start, result["files_reviewed"]
+
+        def streamed(start):
+            first, count = None, 0
+            for _ in reviewer.iter_review_directory(root):
+                if first is None:
+                    first = time.perf_counter() - start
+                count += 1
+            return first, count
+
+        print(f"project files={project} .venv files={venv}")
+        print(f"  discovery, unpruned: {unpruned:7.3f}s  {everything} files")
+        print(f"  discovery, pruned:   {pruned:7.3f}s  {pruned_count} files")
+        for label, run in [("review_directory", whole), ("iter_review_directory", streamed)]:
+            first, total, peak, count = measure(run)
+            print(
+                f"  {label:<22} first result {first:7.3f}s  total {total:7.3f}s  "
+                f"peak {peak / 1e6:6.1f} MB  {count} files"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark: dependency scheduling at increasing graph sizes.
+
+Builds random DAGs with ``edges_per_task`` dependencies per task and
+reports the time per task + edge; a flat column means linear scaling.
+
+Usage: python benchmarks/bench_scheduling.py [max_tasks] [edges_per_task]
+"""
+
+import gc
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.skills import TaskPrioritizerSkill
+from bench_batch_scoring import make_tasks
+
+
+def make_dependencies(n, edges_per_task, seed=7):
+    """Random DAG: each task depends on earlier tasks in a shuffled order"""
+    rng = random.Random(seed)
+    ranking = list(range(n))
+    rng.shuffle(ranking)
+    dependencies = []
+    for position in range(1, n):
+        task_id = ranking[position]
+        for _ in range(edges_per_task):
+            dependencies.append((task_id, ranking[rng.randrange(max(0, position - 1000), position)]))
+    return dependencies
+
+
+def main():
+    max_tasks = int(sys.argv[1]) if len(sys.argv) > 1 else 400_000
+    edges_per_task = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    prioritizer = TaskPrioritizerSkill()
+
+    sizes = []
+    n = 25_000
+    while n <= max_tasks:
+        sizes.append(n)
+        n *= 2
+
+    print(f"{'tasks':>9} {'edges':>9} {'seconds':>9} {'us/(V+E)':>9} {'critical':>9}")
+    for n in sizes:
+        tasks = make_tasks(n)
+        for task in tasks:
+            task["effort_hours"] = task["id"] % 8 + 1
+        dependencies = make_dependencies(n, edges_per_task)
+        gc.collect()
+        gc.freeze()
+
+        start = time.perf_counter()
+        result = prioritizer.schedule_tasks(tasks, dependencies)
+        elapsed = time.perf_counter() - start
+        gc.unfreeze()
+
+        size = n + result["total_dependencies"]
+        print(
+            f"{n:>9} {result['total_dependencies']:>9} {elapsed:>9.3f} "
+            f"{elapsed / size * 1e6:>9.2f} {len(result['critical_path']):>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
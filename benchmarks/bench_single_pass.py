@@ -0,0 +1,112 @@
+"""
+Benchmark: single-pass record-based prioritization vs the previous
+implementation, which re-parsed due dates on every recommendation pass.
+
+Usage: python benchmarks/bench_single_pass.py [sizes...]
+"""
+
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.skills import TaskPrioritizerSkill
+from bench_batch_scoring import make_tasks
+
+
+class LegacyPrioritizer:
+    """The multi-pass algorithm prioritize_tasks used before, for comparison"""
+
+    priority_scores = {"urgent": 100, "high": 75, "medium": 50, "low": 25}
+
+    def prioritize_tasks(self, tasks):
+        scored = [{**t, "priority_score": self._score(t), "recommended_order": 0} for t in tasks]
+        scored.sort(key=lambda x: x["priority_score"], reverse=True)
+        for idx, task in enumerate(scored, 1):
+            task["recommended_order"] = idx
+        overdue = [t for t in scored if self._is_overdue(t.get("due_date"))]
+        in_progress = [t for t in scored if t.get("status") == "in_progress"]
+        urgent = [t for t in scored[:5] if (t.get("priority") or "").lower() in ["urgent", "high"]]
+        blocked = [t for t in scored if "blocked" in (t.get("tags") or "").lower()]
+        return scored, len(overdue), len(in_progress), len(urgent), len(blocked)
+
+    def _score(self, task):
+        score = 0.0
+        score += self.priority_scores.get(task.get("priority", "medium").lower(), 50)
+        if task.get("due_date"):
+            score += self._urgency(task["due_date"])
+        if task.get("status") == "in_progress":
+            score += 20
+        tags = task.get("tags", "")
+        if tags:
+            score += 30 if "urgent" in tags.lower() else 0
+            score += 25 if "critical" in tags.lower() else 0
+            score -= 40 if "blocked" in tags.lower() else 0
+        description = task.get("description", "")
+        if description:
+            score += 20 if "asap" in description.lower() else 0
+            score += 15 if "deadline" in description.lower() else 0
+        return score
+
+    def _parse(self, due_date):
+        if isinstance(due_date, str):
+            return datetime.fromisoformat(due_date.replace('Z', '+00:00'))
+        return due_date
+
+    def _urgency(self, due_date):
+        try:
+            due = self._parse(due_date)
+            now = datetime.now(due.tzinfo) if due.tzinfo else datetime.now()
+            days = (due - now).days
+        except Exception:
+            return 0
+        if days < 0:
+            return 50
+        for max_days, score in ((0, 45), (1, 40), (3, 30), (7, 20), (14, 10)):
+            if days <= max_days:
+                return score
+        return 5
+
+    def _is_overdue(self, due_date):
+        if not due_date:
+            return False
+        try:
+            due = self._parse(due_date)
+            now = datetime.now(due.tzinfo) if due.tzinfo else datetime.now()
+            return due < now
+        except Exception:
+            return False
+
+
+def measure(fn):
+    gc.collect()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [10_000, 100_000]
+    legacy = LegacyPrioritizer()
+    current = TaskPrioritizerSkill()
+
+    print(f"{'tasks':>10} {'legacy':>10} {'peak MB':>9} {'single':>10} {'peak MB':>9}")
+    for n in sizes:
+        tasks = make_tasks(n)
+        legacy_time, legacy_peak = measure(lambda: legacy.prioritize_tasks(tasks))
+        current_time, current_peak = measure(lambda: current.prioritize_tasks(tasks))
+        print(f"{n:>10} {legacy_time:>9.3f}s {legacy_peak / 1e6:>9.1f} "
+              f"{current_time:>9.3f}s {current_peak / 1e6:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark: one StandupReporterSkill per user vs streamed batch generation
+at increasing worker counts.
+
+Usage: python benchmarks/bench_standup_batch.py [users] [tasks_per_user]
+"""
+
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.skills import StandupReporterSkill
+
+
+def make_tasks_by_user(users, per_user, seed=5):
+    rng = random.Random(seed)
+    now = datetime.now()
+    stamps = [(now - timedelta(days=d, hours=h)).isoformat() for d in range(3) for h in range(0, 24, 6)]
+    return {
+        f"user{u}": [
+            {
+                "title": f"Task {u}-{i}",
+                "status": rng.choice(["todo", "in_progress", "completed", "completed", "cancelled"]),
+                "updated_at": rng.choice(stamps),
+                "tags": rng.choice([None, "", "backend", "blocked", "ui,Blocked"]),
+            }
+            for i in range(per_user)
+        ]
+        for u in range(users)
+    }
+
+
+def main():
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    per_user = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    tasks_by_user = make_tasks_by_user(users, per_user)
+
+    start = time.perf_counter()
+    for tasks in tasks_by_user.values():
+        StandupReporterSkill().generate_from_task_list(tasks)
+    per_user_time = time.perf_counter() - start
+
+    print(f"users={users} tasks/user={per_user} cpus={os.cpu_count()}")
+    print(f"  instance per user:  {per_user_time:8.3f}s")
+
+    workers = 1
+    while workers <= max(2, os.cpu_count() or 1):
+        start = time.perf_counter()
+        size = sum(len(chunk) for chunk in StandupReporterSkill().generate_batch(
+            tasks_by_user, date.today(), "text", max_workers=workers
+        ))
+        elapsed = time.perf_counter() - start
+        print(f"  batch, {workers:>2} worker(s): {elapsed:8.3f}s  {size / 1e6:6.1f} MB text")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Benchmark: full prioritize_tasks + slice vs streaming prioritize_top_k.
+
+Usage: python benchmarks/bench_top_k.py [tasks] [k]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.skills import TaskPrioritizerSkill
+from bench_batch_scoring import make_tasks
+
+
+def measure(fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+
+    # Peak memory is measured on a second run; tracing skews timings
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    k = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    prioritizer = TaskPrioritizerSkill()
+
+    tasks = make_tasks(n)
+    full, full_time, full_peak = measure(lambda: prioritizer.prioritize_tasks(tasks)["prioritized_tasks"][:k])
+    top, top_time, top_peak = measure(lambda: prioritizer.prioritize_top_k(iter(tasks), k)["prioritized_tasks"])
+    assert [t["id"] for t in full] == [t["id"] for t in top]
+
+    print(f"tasks={n} k={k}")
+    print(f"  full sort + slice: {full_time:8.3f}s  peak {full_peak / 1e6:8.1f} MB")
+    print(f"  streaming top-k:   {top_time:8.3f}s  peak {top_peak / 1e6:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark: writes/sec for concurrent task creation with and without
+group-commit batching on a file-backed SQLite database.
+
+Usage: python benchmarks/bench_write_batching.py [threads] [writes_per_thread]
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlmodel import SQLModel, Session, create_engine
+
+from app.database import WriteBatcher
+from app.models import Task
+
+
+def _make_engine(path: str):
+    engine = create_engine(
+        f"sqlite:///{path}",
+        connect_args={"check_same_thread": False, "timeout": 60},
+        pool_size=64,
+        max_overflow=64,
+    )
+    SQLModel.metadata.create_all(engine)
+    return engine
+
+
+def _direct_write(engine, title: str):
+    with Session(engine) as session:
+        session.add(Task(title=title))
+        session.commit()
+
+
+def _run(threads: int, writes: int, write) -> float:
+    def worker(n):
+        for i in range(writes):
+            write(f"task-{n}-{i}")
+
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    start = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return threads * writes / (time.perf_counter() - start)
+
+
+def main():
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    writes = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = _make_engine(os.path.join(tmp, "direct.db"))
+        direct = _run(threads, writes, lambda title: _direct_write(engine, title))
+        engine.dispose()
+
+        engine = _make_engine(os.path.join(tmp, "batched.db"))
+        batcher = WriteBatcher(engine, max_latency_ms=5, max_batch_size=64)
+        batcher.start()
+        batched = _run(threads, writes, lambda title: batcher.submit(lambda s: s.add(Task(title=title))))
+        batcher.stop()
+        stats = batcher.stats()
+        engine.dispose()
+
+    print(f"threads={threads} writes/thread={writes}")
+    print(f"  batching off: {direct:10.0f} writes/sec")
+    print(f"  batching on:  {batched:10.0f} writes/sec "
+          f"({stats['operations'] / max(stats['batches'], 1):.1f} ops/commit)")
+
+
+if __name__ == "__main__":
+    main()
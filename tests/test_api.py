@@ -20,6 +20,39 @@ class TestRootEndpoints:
         assert response.status_code == 200
         assert response.json() == {"status": "healthy"}
 
+    def test_admission_stats(self, client: TestClient):
+        """Test GET /health/admission"""
+        response = client.get("/health/admission")
+        assert response.status_code == 200
+        data = response.json()
+        assert "queue_depth" in data["read"]
+        assert "shed_total" in data["write"]
+
+    def test_workload_stats_disabled(self, client: TestClient):
+        """Test GET /health/workload with capture disabled"""
+        response = client.get("/health/workload")
+        assert response.status_code == 200
+        assert response.json() == {"enabled": False}
+
+    def test_workload_stats_hide_parameters(self, client: TestClient, monkeypatch):
+        """Test GET /health/workload returns fingerprints and timings, not bound values"""
+        from app.config import settings
+        from app.database import workload_recorder
+
+        monkeypatch.setattr(settings, "workload_capture_enabled", True)
+        workload_recorder.reset()
+        workload_recorder.record("SELECT * FROM task WHERE title = ?", ["Secret plans"], 1.5)
+        try:
+            response = client.get("/health/workload")
+        finally:
+            workload_recorder.reset()
+
+        assert "Secret plans" not in response.text
+        top = response.json()["top"]
+        assert top[0]["fingerprint"] == "SELECT * FROM task WHERE title = ?"
+        assert top[0]["count"] == 1
+        assert "params" not in top[0]
+
 
 class TestCreateTask:
     """Test task creation endpoint"""
@@ -131,6 +164,217 @@ class TestGetTasks:
         assert len(data) == 1
         assert data[0]["priority"] == "urgent"
 
+    def test_get_tasks_include_archived(self, client: TestClient, create_test_task, session):
+        """Test archived tasks are only listed when requested"""
+        from app.database import archive_closed_tasks
+
+        create_test_task(title="Open")
+        create_test_task(title="Done", status="completed")
+        archived_id = create_test_task(title="Done earlier", status="completed").id
+        archive_closed_tasks(session, timedelta(0), now=datetime.now() + timedelta(seconds=1))
+
+        hot = client.get("/tasks/").json()
+        assert [t["title"] for t in hot] == ["Open"]
+
+        response = client.get("/tasks/?include_archived=true&status=completed")
+        assert response.status_code == 200
+        assert sorted(t["title"] for t in response.json()) == ["Done", "Done earlier"]
+
+        assert client.get(f"/tasks/{archived_id}").status_code == 404
+        response = client.get(f"/tasks/{archived_id}?include_archived=true")
+        assert response.status_code == 200
+        assert response.json()["title"] == "Done earlier"
+
+    def test_get_tasks_sorted_by_priority(self, client: TestClient):
+        """Test sorting by priority rank, due date and id"""
+        soon = (datetime.now() + timedelta(days=1)).isoformat()
+        later = (datetime.now() + timedelta(days=5)).isoformat()
+        for title, priority, due in [
+            ("low", "low", None), ("urgent-later", "urgent", later),
+            ("medium", "medium", soon), ("urgent-soon", "urgent", soon),
+            ("high", "high", None),
+        ]:
+            client.post("/tasks/", json={"title": title, "priority": priority, "due_date": due})
+
+        response = client.get("/tasks/?sort=-priority,due_date,id")
+        assert response.status_code == 200
+        assert [t["title"] for t in response.json()] == [
+            "urgent-soon", "urgent-later", "high", "medium", "low"
+        ]
+
+    def test_get_tasks_keyset_pagination(self, client: TestClient):
+        """Test walking pages with the X-Next-Cursor header"""
+        priorities = ["low", "urgent", "medium", "high", "urgent", "low", "high"]
+        for i, priority in enumerate(priorities):
+            due = None if i % 3 == 0 else (datetime.now() + timedelta(days=i % 2)).isoformat()
+            client.post("/tasks/", json={"title": f"Task {i}", "priority": priority, "due_date": due})
+
+        expected = [t["id"] for t in client.get("/tasks/?sort=-priority,due_date").json()]
+        seen = []
+        cursor = None
+        while True:
+            url = "/tasks/?sort=-priority,due_date&limit=2"
+            response = client.get(url + (f"&cursor={cursor}" if cursor else ""))
+            seen.extend(t["id"] for t in response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+
+        assert seen == expected
+        assert len(seen) == len(priorities)
+
+    def test_get_tasks_invalid_sort(self, client: TestClient):
+        """Test unknown sort fields and malformed cursors are rejected"""
+        assert client.get("/tasks/?sort=-bogus").status_code == 400
+        assert client.get("/tasks/?sort=id&cursor=not-a-cursor").status_code == 400
+
+
+class TestPrioritizedTasks:
+    """Test SQL-computed task prioritization"""
+
+    def test_matches_python_scorer(self, client: TestClient, session):
+        """Test SQL scores and order match TaskPrioritizerSkill"""
+        from app.models import Task
+        from app.skills import TaskPrioritizerSkill
+        from sqlmodel import select
+
+        now = datetime.now()
+        for i in range(24):
+            due = None if i % 4 == 0 else (now + timedelta(days=[-2, 0, 1, 3, 6, 10, 20][i % 7], hours=6)).isoformat()
+            client.post("/tasks/", json={
+                "title": f"Task {i}",
+                "priority": ["low", "medium", "high", "urgent"][i % 4],
+                "status": ["todo", "in_progress", "completed"][i % 3],
+                "due_date": due,
+                "tags": ["Urgent,bug", "critical", "blocked", None][i % 4],
+                "description": ["Needed ASAP", "hard DEADLINE", "", None][(i // 2) % 4],
+            })
+
+        response = client.get("/tasks/prioritized?limit=10")
+        assert response.status_code == 200
+        data = response.json()
+
+        rows = [t.model_dump() for t in session.exec(select(Task).order_by(Task.id)).all()]
+        expected = TaskPrioritizerSkill().prioritize_tasks(rows)["prioritized_tasks"][:10]
+
+        assert [t["id"] for t in data] == [t["id"] for t in expected]
+        assert [t["priority_score"] for t in data] == [t["priority_score"] for t in expected]
+
+    def test_status_filter(self, client: TestClient, create_test_task):
+        """Test filtering prioritized tasks by status"""
+        create_test_task(title="Open", status="todo")
+        create_test_task(title="Working", status="in_progress")
+
+        data = client.get("/tasks/prioritized?status=in_progress").json()
+        assert [t["title"] for t in data] == ["Working"]
+        assert data[0]["priority_score"] == 70
+
+
+class TestSuggestedTasks:
+    """Test suggestions served from the priority index"""
+
+    def test_suggested_tasks(self, client: TestClient):
+        """Test open tasks come back in priority order"""
+        for title, priority, status in [
+            ("Low", "low", "todo"), ("Urgent", "urgent", "todo"),
+            ("Done", "urgent", "completed"), ("Working", "medium", "in_progress"),
+        ]:
+            client.post("/tasks/", json={"title": title, "priority": priority, "status": status})
+
+        response = client.get("/tasks/suggested?max_tasks=2")
+        assert response.status_code == 200
+        assert [(t["title"], t["priority_score"]) for t in response.json()] == [("Urgent", 100), ("Working", 70)]
+
+
+class TestTaskDependencies:
+    """Test dependency endpoints and scheduling"""
+
+    def _create(self, client: TestClient, title: str, **fields) -> int:
+        return client.post("/tasks/", json={"title": title, **fields}).json()["id"]
+
+    def test_add_list_and_remove(self, client: TestClient):
+        """Test a dependency can be added, listed and removed"""
+        first = self._create(client, "First")
+        second = self._create(client, "Second")
+
+        response = client.post(f"/tasks/{second}/dependencies", json={"depends_on_id": first})
+        assert response.status_code == 201
+        assert [t["id"] for t in response.json()] == [first]
+
+        assert client.post(f"/tasks/{second}/dependencies", json={"depends_on_id": first}).status_code == 409
+        assert client.post(f"/tasks/{second}/dependencies", json={"depends_on_id": 999}).status_code == 404
+        assert client.post(f"/tasks/{first}/dependencies", json={"depends_on_id": first}).status_code == 400
+
+        assert client.delete(f"/tasks/{second}/dependencies/{first}").status_code == 204
+        assert client.get(f"/tasks/{second}/dependencies").json() == []
+        assert client.delete(f"/tasks/{second}/dependencies/{first}").status_code == 404
+
+    def test_cycle_is_rejected(self, client: TestClient):
+        """Test a dependency closing a cycle is refused"""
+        a, b, c = (self._create(client, title) for title in "ABC")
+        client.post(f"/tasks/{b}/dependencies", json={"depends_on_id": a})
+        client.post(f"/tasks/{c}/dependencies", json={"depends_on_id": b})
+
+        response = client.post(f"/tasks/{a}/dependencies", json={"depends_on_id": c})
+        assert response.status_code == 409
+        assert response.json()["detail"] == "Dependency would create a cycle"
+
+    def test_schedule(self, client: TestClient):
+        """Test open tasks are scheduled and closed prerequisites are satisfied"""
+        done = self._create(client, "Done", status="completed")
+        build = self._create(client, "Build", effort_hours=4)
+        ship = self._create(client, "Ship", effort_hours=1)
+        client.post(f"/tasks/{build}/dependencies", json={"depends_on_id": done})
+        client.post(f"/tasks/{ship}/dependencies", json={"depends_on_id": build})
+
+        response = client.get("/tasks/schedule")
+        assert response.status_code == 200
+        data = response.json()
+        assert [t["id"] for t in data["schedule"]] == [build, ship]
+        assert data["critical_path"] == [build, ship]
+        assert data["project_duration"] == 5
+        assert data["schedule"][0]["ready"] is True
+
+    def test_delete_removes_dependencies(self, client: TestClient, session):
+        """Test deleting a task drops its dependency edges"""
+        from app.models import TaskDependency
+        from sqlmodel import select
+
+        first = self._create(client, "First")
+        second = self._create(client, "Second")
+        client.post(f"/tasks/{second}/dependencies", json={"depends_on_id": first})
+
+        client.delete(f"/tasks/{first}")
+        assert client.get(f"/tasks/{second}/dependencies").json() == []
+        assert session.exec(select(TaskDependency)).all() == []
+
+
+class TestStandup:
+    """Test the database-backed standup endpoint"""
+
+    def test_standup_for_date(self, client: TestClient, session):
+        """Test the report covers tasks completed the day before"""
+        from app.models import Task
+
+        session.add(Task(title="Shipped login", status="completed", updated_at=datetime(2024, 5, 9, 15, 0)))
+        session.add(Task(title="Build signup", status="in_progress"))
+        session.add(Task(title="Await review", status="todo", tags="blocked"))
+        session.commit()
+
+        response = client.get("/standup?date=2024-05-10")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["date"] == "2024-05-10"
+        assert data["completed"] == ["Shipped login"]
+        assert data["in_progress"] == ["Build signup"]
+        assert data["blocked"] == ["Await review"]
+        assert data["blockers_count"] == 1
+        assert "Shipped login" in data["report"]
+
+    def test_standup_invalid_date(self, client: TestClient):
+        """Test an invalid date is rejected"""
+        assert client.get("/standup?date=yesterday").status_code == 422
+
 
 class TestGetTaskById:
     """Test retrieving a specific task"""
@@ -0,0 +1,480 @@
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import SQLModel, create_engine, Session, StaticPool, select
+
+from app.main import app
+from app.database import (
+    get_session, get_write_batcher, WriteBatcher, archive_closed_tasks, TaskArchiver,
+    refresh_priority_index, rebuild_priority_index, top_prioritized_tasks, standup_tasks,
+    WorkloadRecorder, fingerprint
+)
+from app.models import Task, TaskArchive, TaskPriorityEntry
+
+
+@pytest.fixture(name="engine")
+def engine_fixture():
+    """Create an in-memory engine shared across threads"""
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    return engine
+
+
+class TestWriteBatcher:
+    """Test group-commit write batching"""
+
+    def test_concurrent_operations_are_committed_together(self, engine):
+        """Test concurrent submissions share batches and all commit"""
+        batcher = WriteBatcher(engine, max_latency_ms=50, max_batch_size=8)
+        batcher.start()
+        results = []
+
+        def submit(i):
+            task = batcher.submit(lambda s: _add(s, f"Task {i}"))
+            results.append(task.id)
+
+        threads = [threading.Thread(target=submit, args=(i,)) for i in range(16)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        batcher.stop()
+
+        with Session(engine) as session:
+            assert len(session.exec(select(Task)).all()) == 16
+
+        assert sorted(results) == list(range(1, 17))
+        assert batcher.stats()["batches"] < 16
+
+    def test_failing_operation_does_not_affect_batch(self, engine):
+        """Test a failing operation gets its own error and others commit"""
+        batcher = WriteBatcher(engine, max_latency_ms=50)
+        batcher.start()
+        errors = []
+
+        def fail(session):
+            _add(session, "Doomed")
+            raise ValueError("boom")
+
+        def submit(op):
+            try:
+                batcher.submit(op)
+            except ValueError as e:
+                errors.append(str(e))
+
+        ops = [lambda s: _add(s, "A"), fail, lambda s: _add(s, "B")]
+        threads = [threading.Thread(target=submit, args=(op,)) for op in ops]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        batcher.stop()
+
+        with Session(engine) as session:
+            titles = sorted(t.title for t in session.exec(select(Task)).all())
+
+        assert errors == ["boom"]
+        assert titles == ["A", "B"]
+
+    def test_base_exception_does_not_kill_worker(self, engine):
+        """Test an operation raising a BaseException fails its caller and the worker keeps running"""
+        class Abort(BaseException):
+            pass
+
+        def abort(session):
+            raise Abort()
+
+        batcher = WriteBatcher(engine, max_latency_ms=1)
+        batcher.start()
+        try:
+            with pytest.raises(RuntimeError) as error:
+                batcher.submit(abort)
+            assert isinstance(error.value.__cause__, Abort)
+            assert batcher.running
+            assert batcher.submit(lambda s: _add(s, "After")).id is not None
+        finally:
+            batcher.stop()
+
+    def test_stop_during_submits_loses_nothing(self, tmp_path):
+        """Test submissions racing with stop are committed by the worker or inline"""
+        # Inline submits run concurrently, so each needs its own connection
+        engine = create_engine(f"sqlite:///{tmp_path / 'tasks.db'}", connect_args={"check_same_thread": False})
+        SQLModel.metadata.create_all(engine)
+        batcher = WriteBatcher(engine, max_latency_ms=1)
+        batcher.start()
+        threads = [
+            threading.Thread(target=batcher.submit, args=(lambda s, i=i: _add(s, f"Task {i}"),))
+            for i in range(40)
+        ]
+        for i, t in enumerate(threads):
+            t.start()
+            if i == 20:
+                batcher.stop()
+        for t in threads:
+            t.join(5)
+
+        assert not any(t.is_alive() for t in threads)
+        with Session(engine) as session:
+            assert len(session.exec(select(Task)).all()) == 40
+        stats = batcher.stats()
+        assert stats["operations"] == 40
+        assert stats["queue_depth"] == 0
+
+    def test_submit_without_worker_runs_inline(self, engine):
+        """Test submit commits immediately when the worker is not running"""
+        batcher = WriteBatcher(engine)
+        task = batcher.submit(lambda s: _add(s, "Inline"))
+        assert task.id is not None
+        assert batcher.stats()["operations"] == 1
+
+    def test_api_uses_batcher(self, engine):
+        """Test task endpoints route writes through the batcher"""
+        batcher = WriteBatcher(engine, max_latency_ms=1)
+        batcher.start()
+
+        def get_session_override():
+            with Session(engine) as session:
+                yield session
+
+        app.dependency_overrides[get_session] = get_session_override
+        app.dependency_overrides[get_write_batcher] = lambda: batcher
+        try:
+            client = TestClient(app)
+            created = client.post("/tasks/", json={"title": "Batched"})
+            assert created.status_code == 201
+            task_id = created.json()["id"]
+
+            updated = client.put(f"/tasks/{task_id}", json={"status": "completed"})
+            assert updated.json()["status"] == "completed"
+
+            assert client.put("/tasks/999", json={"title": "x"}).status_code == 404
+            assert client.delete(f"/tasks/{task_id}").status_code == 204
+            assert client.get(f"/tasks/{task_id}").status_code == 404
+        finally:
+            app.dependency_overrides.clear()
+            batcher.stop()
+
+
+class TestArchive:
+    """Test archival of closed tasks"""
+
+    def _seed(self, session: Session):
+        old = datetime.now(timezone.utc) - timedelta(days=60)
+        for title, status, updated_at in [
+            ("Old done", "completed", old),
+            ("Old cancelled", "cancelled", old),
+            ("Old open", "todo", old),
+            ("Fresh done", "completed", datetime.now(timezone.utc)),
+        ]:
+            session.add(Task(title=title, status=status, updated_at=updated_at))
+        session.commit()
+
+    def test_archive_moves_only_old_closed_tasks(self, session: Session):
+        """Test only closed tasks past the cutoff are archived"""
+        self._seed(session)
+
+        archived = archive_closed_tasks(session, timedelta(days=30), batch_size=1)
+
+        assert archived == 2
+        hot = sorted(t.title for t in session.exec(select(Task)).all())
+        cold = sorted(t.title for t in session.exec(select(TaskArchive)).all())
+        assert hot == ["Fresh done", "Old open"]
+        assert cold == ["Old cancelled", "Old done"]
+        assert all(t.archived_at is not None for t in session.exec(select(TaskArchive)).all())
+
+    def test_archive_respects_max_batches(self, session: Session):
+        """Test a run can be bounded to a number of batches"""
+        self._seed(session)
+        assert archive_closed_tasks(session, timedelta(days=30), batch_size=1, max_batches=1) == 1
+
+    def test_archiver_run_once(self, engine):
+        """Test the background archiver tracks archived counts"""
+        with Session(engine) as session:
+            self._seed(session)
+
+        archiver = TaskArchiver(engine, older_than=timedelta(days=30))
+        assert archiver.run_once() == 2
+        assert archiver.run_once() == 0
+        assert archiver.total_archived == 2
+
+    def test_archiver_logs_failed_runs(self, caplog):
+        """Test a failing background run is logged and kept as last_error"""
+        import time
+
+        broken = create_engine("sqlite:///:memory:", poolclass=StaticPool)
+        archiver = TaskArchiver(broken, older_than=timedelta(days=30), interval_seconds=60)
+        archiver.start()
+        deadline = time.monotonic() + 5
+        while archiver.last_error is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        archiver.stop()
+
+        assert "no such table" in str(archiver.last_error)
+        assert "Archiving closed tasks failed" in caplog.text
+
+
+class TestPriorityRank:
+    """Test the stored numeric priority rank"""
+
+    def test_rank_follows_priority(self, session: Session):
+        """Test priority_rank is kept in sync on insert and update"""
+        task = Task(title="Ranked", priority="low")
+        session.add(task)
+        session.commit()
+        assert task.priority_rank == 1
+
+        task.priority = "urgent"
+        session.add(task)
+        session.commit()
+        assert task.priority_rank == 4
+
+    def test_priority_sort_uses_index(self, session: Session):
+        """Test the top-N by priority query is read in index order"""
+        plan = session.connection().exec_driver_sql(
+            "EXPLAIN QUERY PLAN SELECT * FROM task "
+            "ORDER BY priority_rank DESC, due_date, id LIMIT 5"
+        ).all()
+        details = " ".join(row[-1] for row in plan)
+        assert "ix_task_rank_due_id" in details
+        assert "TEMP B-TREE" not in details
+
+
+# The task table as created by the first release
+BASELINE_TASK_TABLE = (
+    "CREATE TABLE task (title VARCHAR(200) NOT NULL, description VARCHAR(1000), "
+    "status VARCHAR(11) NOT NULL, priority VARCHAR(6) NOT NULL, due_date DATETIME, "
+    "tags VARCHAR(200), id INTEGER NOT NULL, created_at DATETIME NOT NULL, "
+    "updated_at DATETIME NOT NULL, PRIMARY KEY (id))"
+)
+
+
+class TestSchemaMigration:
+    """Test databases created by an older schema are upgraded in place"""
+
+    def test_baseline_database_is_migrated(self):
+        """Test missing columns are added and backfilled and indexes created, idempotently"""
+        from app.database import create_db_and_tables
+
+        engine = create_engine("sqlite:///:memory:", poolclass=StaticPool)
+        with engine.begin() as connection:
+            connection.exec_driver_sql(BASELINE_TASK_TABLE)
+            connection.exec_driver_sql(
+                "INSERT INTO task (title, status, priority, id, created_at, updated_at) "
+                "VALUES ('Old', 'TODO', 'HIGH', 1, '2024-01-01', '2024-01-01')"
+            )
+
+        create_db_and_tables(engine)
+        create_db_and_tables(engine)
+
+        with engine.connect() as connection:
+            ranks = connection.exec_driver_sql("SELECT priority_rank FROM task").scalars().all()
+            indexes = {row[1] for row in connection.exec_driver_sql("PRAGMA index_list(task)")}
+            dependency_indexes = {row[1] for row in connection.exec_driver_sql("PRAGMA index_list(task_dependency)")}
+        assert ranks == [3]
+        assert {"ix_task_rank_due_id", "ix_task_status_rank_due_id", "ix_task_due_id"} <= indexes
+        assert "ix_task_dependency_depends_on_id" in dependency_indexes
+
+        with Session(engine) as session:
+            task = session.exec(select(Task)).one()
+        assert (task.title, task.priority_rank, task.effort_hours) == ("Old", 3, None)
+
+
+class TestPriorityIndex:
+    """Test the incrementally maintained priority index"""
+
+    def test_index_follows_writes(self, session: Session):
+        """Test entries are added, updated and removed with their task"""
+        task = Task(title="Indexed", priority="high")
+        session.add(task)
+        session.commit()
+        assert session.get(TaskPriorityEntry, task.id).score == 75
+
+        task.status = "in_progress"
+        session.add(task)
+        session.commit()
+        session.expire_all()
+        assert session.get(TaskPriorityEntry, task.id).score == 95
+
+        task.status = "completed"
+        session.add(task)
+        session.commit()
+        session.expire_all()
+        assert session.get(TaskPriorityEntry, task.id) is None
+
+        other = Task(title="Deleted")
+        session.add(other)
+        session.commit()
+        session.delete(other)
+        session.commit()
+        assert session.exec(select(TaskPriorityEntry)).all() == []
+
+    def test_index_skips_unscored_updates(self, session: Session):
+        """Test an update that changes no scoring field leaves the entry alone"""
+        task = Task(title="Indexed", priority="high")
+        session.add(task)
+        session.commit()
+        session.get(TaskPriorityEntry, task.id).score = -1
+        session.commit()
+
+        task.title = "Renamed"
+        session.add(task)
+        session.commit()
+        session.expire_all()
+        assert session.get(TaskPriorityEntry, task.id).score == -1
+
+        task.priority = "urgent"
+        session.add(task)
+        session.commit()
+        session.expire_all()
+        assert session.get(TaskPriorityEntry, task.id).score == 100
+
+    def test_refresh_rescores_only_passed_boundaries(self, session: Session):
+        """Test only tasks whose urgency bucket changed are re-scored"""
+        now = datetime.now()
+        session.add(Task(title="Due in 20 days", priority="low", due_date=now + timedelta(days=20)))
+        session.add(Task(title="No due date", priority="low"))
+        session.commit()
+
+        assert refresh_priority_index(session, now) == 0
+        assert refresh_priority_index(session, now + timedelta(days=6)) == 1
+        entries = {e.task_id: e.score for e in session.exec(select(TaskPriorityEntry)).all()}
+        assert sorted(entries.values()) == [25, 35]
+        assert refresh_priority_index(session, now + timedelta(days=6)) == 0
+
+    def test_top_matches_prioritizer(self, session: Session):
+        """Test the top-k read agrees with TaskPrioritizerSkill"""
+        from app.skills import TaskPrioritizerSkill
+
+        now = datetime.now()
+        for i in range(20):
+            session.add(Task(
+                title=f"Task {i}",
+                priority=["low", "medium", "high", "urgent"][i % 4],
+                status=["todo", "in_progress", "completed"][i % 3],
+                due_date=now + timedelta(days=i % 9 - 2, hours=3) if i % 2 else None,
+                tags="blocked" if i % 5 == 0 else None,
+            ))
+        session.commit()
+        assert rebuild_priority_index(session) == 14
+
+        top = top_prioritized_tasks(session, 5)
+        open_tasks = [
+            t.model_dump() for t in session.exec(select(Task).order_by(Task.id)).all()
+            if t.status != "completed"
+        ]
+        expected = TaskPrioritizerSkill().prioritize_top_k(open_tasks, 5)["prioritized_tasks"]
+
+        assert [t.id for t, _ in top] == [t["id"] for t in expected]
+        assert [score for _, score in top] == [t["priority_score"] for t in expected]
+
+
+class TestStandupTasks:
+    """Test standup task selection by time window"""
+
+    def test_window_and_groups(self, session: Session):
+        """Test only tasks completed the previous day are reported"""
+        day = datetime(2024, 5, 10).date()
+        for title, status, updated_at, tags in [
+            ("Shipped", "completed", datetime(2024, 5, 9, 23, 59), None),
+            ("Too early", "completed", datetime(2024, 5, 8, 23, 59), None),
+            ("Too late", "completed", datetime(2024, 5, 10, 0, 0), None),
+            ("Coding", "in_progress", datetime(2024, 5, 1), "backend"),
+            ("Stuck", "in_progress", datetime(2024, 5, 1), "blocked"),
+            ("Waiting", "todo", datetime(2024, 5, 1), "Blocked"),
+        ]:
+            session.add(Task(title=title, status=status, updated_at=updated_at, tags=tags))
+        session.add(TaskArchive(
+            id=100, title="Archived ship", status="completed",
+            created_at=datetime(2024, 5, 1), updated_at=datetime(2024, 5, 9, 8, 0)
+        ))
+        session.commit()
+
+        tasks = standup_tasks(session, day)
+
+        assert sorted(tasks["completed"]) == ["Archived ship", "Shipped"]
+        assert tasks["in_progress"] == ["Coding"]
+        assert sorted(tasks["blocked"]) == ["Stuck", "Waiting"]
+        assert tasks["counts"] == {"completed": 2, "in_progress": 1, "blocked": 2}
+
+        limited = standup_tasks(session, day, limit=1)
+        assert len(limited["completed"]) == 1
+        assert limited["counts"]["completed"] == 2
+
+    def test_completed_window_uses_index(self, session: Session):
+        """Test the completed window is a range scan on (status, updated_at)"""
+        plan = session.connection().exec_driver_sql(
+            "EXPLAIN QUERY PLAN SELECT title FROM task "
+            "WHERE status = 'COMPLETED' AND updated_at >= '2024-05-09' AND updated_at < '2024-05-10'"
+        ).all()
+        assert "ix_task_status_updated" in " ".join(row[-1] for row in plan)
+
+
+def _add(session: Session, title: str) -> Task:
+    task = Task(title=title)
+    session.add(task)
+    return task
+
+
+class TestWorkloadRecorder:
+    """Test workload capture from engine events"""
+
+    def test_fingerprint_normalizes_values(self):
+        """Test that statements differing only in values share a fingerprint"""
+        first = fingerprint("SELECT * FROM task WHERE id IN (1, 2, 3) AND title = 'a'")
+        second = fingerprint("SELECT * FROM task\n WHERE id IN (?, ?)  AND title = 'it''s' -- comment")
+
+        assert first == second == "SELECT * FROM task WHERE id IN (?+) AND title = ?"
+        assert fingerprint("INSERT INTO t (a, b) VALUES (?, ?), (?, ?)") == "INSERT INTO t (a, b) VALUES (?+)"
+
+    def test_records_statements_by_fingerprint(self, engine):
+        """Test counts, latency and replayable samples per fingerprint"""
+        recorder = WorkloadRecorder(engine)
+        recorder.attach()
+        with Session(engine) as session:
+            session.add(Task(title="Recorded"))
+            session.commit()
+            for task_id in (1, 2, 3):
+                session.exec(select(Task).where(Task.id == task_id)).all()
+        recorder.detach()
+
+        with Session(engine) as session:
+            session.exec(select(Task)).all()
+
+        reads = [e for e in recorder.snapshot() if e["kind"] == "read" and "WHERE task.id" in e["fingerprint"]]
+        assert len(reads) == 1
+        assert reads[0]["count"] == 3
+        assert reads[0]["total_ms"] >= reads[0]["max_ms"] > 0
+        assert len(reads[0]["params"]) == reads[0]["statement"].count("?")
+        assert any(e["kind"] == "write" and e["rows_written"] == 1 for e in recorder.snapshot())
+        assert recorder.stats()["statements"] == sum(e["count"] for e in recorder.snapshot())
+
+    def test_limits_fingerprints(self):
+        """Test that new fingerprints past the limit are counted as dropped"""
+        recorder = WorkloadRecorder(None, max_fingerprints=1)
+        recorder.record("SELECT 1", [], 0.1)
+        recorder.record("SELECT * FROM task", [], 0.1)
+
+        assert recorder.stats() == {"fingerprints": 1, "statements": 1, "dropped": 1}
+
+
+class TestLayering:
+    """Test the database layer stands on its own"""
+
+    def test_imports_without_skills(self):
+        """Test importing app.database loads no skill module"""
+        import subprocess
+        import sys
+
+        loaded = subprocess.run(
+            [sys.executable, "-c",
+             "import sys, app.database; print(sorted(m for m in sys.modules if m.startswith('app.skills')))"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+
+        assert loaded == "[]"
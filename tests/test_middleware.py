@@ -0,0 +1,98 @@
+import asyncio
+
+import httpx
+from fastapi import FastAPI
+
+from app.middleware import AdmissionController, AdmissionControlMiddleware, ConcurrencyBudget
+
+
+def _make_app(controller: AdmissionController) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(AdmissionControlMiddleware, controller=controller)
+
+    @app.get("/slow")
+    async def slow_read():
+        await asyncio.sleep(0.1)
+        return {"ok": True}
+
+    @app.post("/slow")
+    async def slow_write():
+        await asyncio.sleep(0.1)
+        return {"ok": True}
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    return app
+
+
+async def _fire(app: FastAPI, requests):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await asyncio.gather(*(client.request(method, path) for method, path in requests))
+
+
+class TestConcurrencyBudget:
+    """Test the bounded concurrency budget"""
+
+    def test_release_hands_slot_to_waiter(self):
+        """Test a queued request is admitted when a slot frees up"""
+        async def scenario():
+            budget = ConcurrencyBudget("test", limit=1, queue_size=1, queue_timeout_ms=1000)
+            assert await budget.acquire()
+            waiter = asyncio.ensure_future(budget.acquire())
+            await asyncio.sleep(0)
+            assert budget.queue_depth == 1
+            budget.release()
+            assert await waiter
+            assert budget.active == 1
+
+        asyncio.run(scenario())
+
+    def test_queue_timeout_sheds(self):
+        """Test a request waiting past its deadline is shed"""
+        async def scenario():
+            budget = ConcurrencyBudget("test", limit=1, queue_size=1, queue_timeout_ms=10)
+            assert await budget.acquire()
+            assert not await budget.acquire()
+            assert budget.shed_timeout == 1
+            assert budget.queue_depth == 0
+
+        asyncio.run(scenario())
+
+
+class TestAdmissionControlMiddleware:
+    """Test load shedding middleware"""
+
+    def test_queue_full_returns_503(self):
+        """Test overflow requests get a fast 503 with Retry-After"""
+        controller = AdmissionController(read_limit=1, queue_size=1, retry_after_seconds=3)
+        responses = asyncio.run(_fire(_make_app(controller), [("GET", "/slow")] * 3))
+
+        codes = sorted(r.status_code for r in responses)
+        assert codes == [200, 200, 503]
+        shed = next(r for r in responses if r.status_code == 503)
+        assert shed.headers["Retry-After"] == "3"
+        assert controller.stats()["read"]["shed_queue_full"] == 1
+
+    def test_reads_and_writes_have_separate_budgets(self):
+        """Test a saturated write budget does not shed reads"""
+        controller = AdmissionController(read_limit=1, write_limit=1, queue_size=0)
+        responses = asyncio.run(_fire(_make_app(controller), [("POST", "/slow"), ("GET", "/slow")]))
+
+        assert [r.status_code for r in responses] == [200, 200]
+
+    def test_route_limits_and_exempt_paths(self):
+        """Test per-route budgets and exempt paths"""
+        controller = AdmissionController(
+            read_limit=10, queue_size=0,
+            route_limits={"/slow": 1}, exempt_paths=["/health"]
+        )
+        responses = asyncio.run(_fire(
+            _make_app(controller),
+            [("GET", "/slow"), ("GET", "/slow"), ("GET", "/health")]
+        ))
+
+        assert sorted(r.status_code for r in responses) == [200, 200, 503]
+        assert controller.stats()["routes"]["/slow"]["shed_total"] == 1
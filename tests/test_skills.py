@@ -1,3 +1,4 @@
+import os
 import pytest
 from datetime import datetime, timedelta
 from app.skills import (
@@ -46,6 +47,207 @@ except:
         result = reviewer.review_file("test.txt")
         assert "error" in result
 
+    def test_review_directory_parallel_matches_serial(self, tmp_path):
+        """Test the process pool returns the serial results in path order"""
+        for i in range(6):
+            package = tmp_path / f"pkg{i % 2}"
+            package.mkdir(exist_ok=True)
+            (package / f"mod{i}.py").write_text("def f(a, b, c, d, e, f):\n    pass\n" * (i + 1))
+        (tmp_path / "broken.py").write_text("def broken(:\n")
+
+        reviewer = CodeReviewSkill()
+        serial = reviewer.review_directory(str(tmp_path))
+        parallel = reviewer.review_directory(str(tmp_path), max_workers=2)
+
+        assert parallel == serial
+        assert serial["files_reviewed"] == 7
+        assert [r["file"] for r in serial["results"]] == sorted(r["file"] for r in serial["results"])
+
+    def test_review_cache_skips_unchanged_files(self, tmp_path, monkeypatch):
+        """Test unchanged files are served from the cache and edits are re-reviewed"""
+        from app.skills import code_review
+        from app.skills.code_review import ReviewCache
+        from app.skills.disk_cache import DiskCache
+
+        source = tmp_path / "src"
+        source.mkdir()
+        old, new = source / "old.py", source / "new.py"
+        old.write_text("def f(a, b, c, d, e, f):\n    pass\n")
+        new.write_text("x = 1\n")
+        os.utime(old, (1_000_000_000, 1_000_000_000))
+
+        cache = ReviewCache(DiskCache(str(tmp_path / "reviews.sqlite3")))
+        first = CodeReviewSkill(cache).review_directory(str(source))
+
+        reviewed = []
+        original = CodeReviewSkill._review_content
+
+        def counting(self, content):
+            reviewed.append(content)
+            return original(self, content)
+
+        monkeypatch.setattr(CodeReviewSkill, "_review_content", counting)
+        # The recently written file is validated by hash, the old one by stat
+        assert CodeReviewSkill(cache).review_directory(str(source)) == first
+        assert reviewed == []
+
+        new.write_text("try:\n    pass\nexcept:\n    pass\n")
+        second = CodeReviewSkill(cache).review_directory(str(source))
+        assert reviewed == [new.read_text()]
+        assert any(i["type"] == "bare_except" for r in second["results"] for i in r["issues"])
+
+        monkeypatch.setattr(code_review, "RULES_VERSION", code_review.RULES_VERSION + 1)
+        CodeReviewSkill(cache).review_directory(str(source))
+        assert len(reviewed) == 3
+
+    def test_rules_can_be_toggled_and_timed(self, tmp_path):
+        """Test disabled rules are skipped and enabled ones report their cost"""
+        test_file = tmp_path / "mod.py"
+        test_file.write_text("def f():\n    try:\n        pass\n    except:\n        pass\n")
+
+        reviewer = CodeReviewSkill(disabled_rules=["missing_docstring"], timed=True)
+        result = reviewer.review_file(str(test_file))
+
+        assert [i["type"] for i in result["issues"]] == ["bare_except"]
+        report = {row["rule"]: row for row in reviewer.rule_report()}
+        assert "missing_docstring" not in report
+        assert report["bare_except"]["calls"] == 1
+        assert report["bare_except"]["issues"] == 1
+
+        with pytest.raises(ValueError):
+            CodeReviewSkill(enabled_rules=["no_such_rule"])
+
+    def test_iter_python_files_prunes_excluded_paths(self, tmp_path):
+        """Test environment dirs, gitignore patterns, globs and large files are skipped"""
+        from app.skills.source_tree import iter_python_files
+
+        for rel in [
+            "app/main.py", "app/gen/out.py", "app/keep.py", "app/api_pb2.py", "app/big.py",
+            ".venv/lib/site.py", "node_modules/x/y.py", "build/lib/z.py", "scratch.tmp.py",
+            "docs/conf.py",
+        ]:
+            path = tmp_path / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text("x = 1\n")
+        (tmp_path / "app" / "big.py").write_text("x = 1\n" * 1000)
+        (tmp_path / ".gitignore").write_text("# generated\n*.tmp.py\n/docs/\n")
+        (tmp_path / "app" / ".gitignore").write_text("gen/\n*.py\n!main.py\n!keep.py\n!api_pb2.py\n!big.py\n")
+
+        found = [
+            os.path.relpath(path, tmp_path)
+            for path in iter_python_files(str(tmp_path), exclude=["*_pb2.py"], max_file_size=1000)
+        ]
+
+        assert found == [os.path.join("app", "keep.py"), os.path.join("app", "main.py")]
+
+    def test_iter_review_directory_streams_all_results(self, tmp_path):
+        """Test the generator yields the same results as review_directory, inline and pooled"""
+        import types
+
+        for i in range(10):
+            (tmp_path / f"mod{i}.py").write_text("def f(a, b, c, d, e, f):\n    pass\n" * (i + 1))
+        (tmp_path / "node_modules").mkdir()
+        (tmp_path / "node_modules" / "vendored.py").write_text("x = 1\n")
+
+        reviewer = CodeReviewSkill()
+        expected = reviewer.review_directory(str(tmp_path))["results"]
+        stream = reviewer.iter_review_directory(str(tmp_path), batch_size=3)
+        assert isinstance(stream, types.GeneratorType)
+
+        by_file = lambda results: sorted(results, key=lambda r: r["file"])
+        assert by_file(stream) == expected
+        assert by_file(reviewer.iter_review_directory(str(tmp_path), max_workers=2, batch_size=3)) == expected
+        assert len(expected) == 10
+
+    def test_parse_unified_diff(self):
+        """Test added line ranges are read from hunks, not from content lines"""
+        from app.skills.code_review import parse_unified_diff
+
+        diff = (
+            "diff --git a/app/x.py b/app/x.py\n"
+            "--- a/app/x.py\n"
+            "+++ b/app/x.py\n"
+            "@@ -1,4 +1,5 @@\n"
+            " keep\n"
+            "-old\n"
+            "+new\n"
+            "++++ looks like a header\n"
+            " keep\n"
+            " keep\n"
+            "@@ -20,0 +21 @@\n"
+            "+tail\n"
+            "--- a/gone.py\n"
+            "+++ /dev/null\n"
+            "@@ -1 +0,0 @@\n"
+            "-bye\n"
+        )
+
+        assert parse_unified_diff(diff) == {"app/x.py": [(2, 3), (21, 21)]}
+
+    def test_review_diff_reports_only_changed_lines(self, tmp_path):
+        """Test a base ref review covers changed files and their changed lines only"""
+        import subprocess
+
+        repo = _git_repo(tmp_path, "repo", "Ana", [])
+        (tmp_path / "repo" / "old.py").write_text("def a(p1, p2, p3, p4, p5, p6):\n    pass\n")
+        (tmp_path / "repo" / "untouched.py").write_text("def b():\n    pass\n")
+        subprocess.run(["git", "-C", repo, "add", "-A"], check=True)
+        _git_repo_commit(repo, "Ana", datetime(2024, 5, 1, 12), "Initial")
+
+        (tmp_path / "repo" / "old.py").write_text(
+            "def a(p1, p2, p3, p4, p5, p6):\n    pass\n\n\n"
+            "def c():\n    try:\n        pass\n    except:\n        pass\n"
+        )
+
+        result = CodeReviewSkill().review_diff(base_ref="HEAD", repo_path=repo)
+
+        assert result["files_reviewed"] == 1
+        reviewed = result["results"][0]
+        assert reviewed["file"].endswith("old.py")
+        assert reviewed["changed_lines"] == [(3, 9)]
+        assert sorted(i["type"] for i in reviewed["issues"]) == ["bare_except", "missing_docstring"]
+
+        assert "error" in CodeReviewSkill().review_diff(base_ref="no-such-ref", repo_path=repo)
+
+    def test_engine_dispatches_nodes_and_lines_once(self):
+        """Test custom rules see each subscribed node and line exactly once"""
+        import ast
+        from app.skills.review_rules import Rule, RuleRegistry, ReviewEngine, issue
+
+        seen = []
+        rules = RuleRegistry()
+
+        @rules.register
+        class Calls(Rule):
+            name = "calls"
+            node_types = (ast.Call,)
+
+            def check_node(self, node):
+                seen.append(("call", node.lineno))
+                yield issue(self.name, "low", node.lineno, "call")
+
+        @rules.register
+        class Statements(Rule):
+            name = "statements"
+            node_types = (ast.stmt,)
+            checks_lines = True
+
+            def check_node(self, node):
+                seen.append((type(node).__name__, node.lineno))
+                return ()
+
+            def check_line(self, lineno, line, previous):
+                seen.append(("line", lineno))
+                return ()
+
+        issues = ReviewEngine(rules.select()).review("x = f()\nif x:\n    g()\n")
+
+        assert [i["line"] for i in issues] == [1, 3]
+        assert sorted(seen) == sorted([
+            ("call", 1), ("call", 3), ("Assign", 1), ("If", 2), ("Expr", 3),
+            ("line", 1), ("line", 2), ("line", 3), ("line", 4),
+        ])
+
 
 class TestDatabaseOptimizerSkill:
     """Test Database Optimizer Skill"""
@@ -93,6 +295,260 @@ class TestDatabaseOptimizerSkill:
         assert any(r["type"] == "missing_limit" for r in result["recommendations"])
 
 
+@pytest.fixture(name="task_engine")
+def task_engine_fixture():
+    """In-memory engine holding enough tasks for SQLite to prefer indexes"""
+    from sqlmodel import SQLModel, Session, StaticPool, create_engine
+    from app.models import Task
+
+    engine = create_engine(
+        "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        for i in range(2000):
+            session.add(Task(
+                title=f"Task {i}",
+                status=["todo", "in_progress", "completed"][i % 3],
+                priority=["low", "medium", "high", "urgent"][i % 4],
+                due_date=datetime(2024, 1, 1) + timedelta(hours=i),
+            ))
+        session.commit()
+    return engine
+
+
+class TestQueryPlanAnalysis:
+    """Test plan-based query analysis against a real schema"""
+
+    def test_indexed_query_has_no_findings(self, task_engine):
+        """Test a query served by an index"""
+        result = DatabaseOptimizerSkill().analyze_query_plan(
+            "SELECT id FROM task WHERE status = ? ORDER BY priority_rank DESC, due_date, id LIMIT 20",
+            task_engine, params=("TODO",)
+        )
+
+        assert result["status"] == "analyzed"
+        assert result["recommendations"] == []
+        assert "ix_task_status_rank_due_id" in result["indexes_used"]
+        assert result["timing"]["rows"] == 20
+
+    def test_full_scan_and_temp_btree(self, task_engine):
+        """Test detecting a table scan and a sort without an index"""
+        result = DatabaseOptimizerSkill().analyze_query_plan(
+            "SELECT * FROM task WHERE description = 'x' ORDER BY created_at", task_engine
+        )
+        findings = {r["type"]: r for r in result["recommendations"]}
+
+        assert findings["full_scan"]["severity"] == "high"
+        assert "CREATE INDEX" in findings["full_scan"]["example"]
+        assert findings["temp_btree"]["example"].endswith("ON task (description, created_at)")
+        assert "(description) followed by the sort columns (created_at)" in findings["temp_btree"]["recommendation"]
+
+    def test_function_defeats_index(self, task_engine):
+        """Test detecting an index the plan cannot use"""
+        result = DatabaseOptimizerSkill().analyze_query_plan(
+            "SELECT id FROM task WHERE LOWER(status) = 'todo'", task_engine
+        )
+
+        assert any(r["type"] == "unused_index" for r in result["recommendations"])
+
+    def test_limit_without_filter_is_not_flagged_high(self, task_engine):
+        """Test a scan that stops at LIMIT"""
+        result = DatabaseOptimizerSkill().analyze_query_plan("SELECT id FROM task LIMIT 10", task_engine)
+
+        assert all(r["severity"] == "low" for r in result["recommendations"])
+
+    def test_copy_leaves_database_untouched(self, task_engine):
+        """Test that timing a write does not change the source database"""
+        from sqlmodel import Session, select
+        from app.models import Task
+
+        DatabaseOptimizerSkill().analyze_query_plan("DELETE FROM task", task_engine)
+
+        with Session(task_engine) as session:
+            assert len(session.exec(select(Task.id)).all()) == 2000
+
+    def test_engine_stays_usable_without_copy(self, task_engine):
+        """Test analyzing an engine in place returns its connection to the pool"""
+        from sqlmodel import Session, select
+        from app.models import Task
+
+        for _ in range(2):
+            result = DatabaseOptimizerSkill().analyze_query_plan(
+                "SELECT id FROM task WHERE id = 1", task_engine, copy=False
+            )
+            assert result["status"] == "analyzed"
+
+        with Session(task_engine) as session:
+            assert session.exec(select(Task.id).where(Task.id == 1)).one() == 1
+
+    def test_invalid_query_returns_error(self, task_engine):
+        """Test analyzing a query against a missing table"""
+        results = DatabaseOptimizerSkill().analyze_query_plans(
+            ["SELECT * FROM missing", "SELECT id FROM task WHERE id = 1"], task_engine
+        )
+
+        assert "error" in results[0]
+        assert results[1]["status"] == "analyzed"
+
+
+class TestIndexAdvisor:
+    """Test workload-driven index advice"""
+
+    WORKLOAD = [
+        {
+            "fingerprint": "SELECT id, title FROM task ORDER BY title LIMIT ?",
+            "statement": "SELECT id, title FROM task ORDER BY title LIMIT ?",
+            "params": [20], "count": 100, "kind": "read",
+        },
+        {
+            "fingerprint": "UPDATE task SET title = ? WHERE id = ?",
+            "statement": "UPDATE task SET title = ? WHERE id = ?",
+            "params": ["Renamed", 1], "count": 10, "kind": "write",
+        },
+    ]
+
+    def test_recommends_measured_index(self, task_engine):
+        """Test that a candidate is built, timed before/after and costed"""
+        result = DatabaseOptimizerSkill().advise_indexes(self.WORKLOAD, task_engine, runs=3)
+        candidate = result["candidates"][0]
+
+        assert result["replayed"] == 2
+        assert candidate["columns"][0] == "title"
+        assert candidate["ddl"] in result["recommended"]
+        assert candidate["size_bytes"] > 0
+        read = next(s for s in candidate["statements"] if s["kind"] == "read")
+        assert read["uses_index"] and read["after_ms"] < read["before_ms"]
+        assert candidate["write_amplification"]["writes"] == 10
+        assert candidate["write_amplification"]["btrees_per_row"]["after"] == \
+            candidate["write_amplification"]["btrees_per_row"]["before"] + 1
+
+    def test_leaves_database_untouched(self, task_engine):
+        """Test that candidates are only built on the copy"""
+        from sqlalchemy import inspect
+
+        DatabaseOptimizerSkill().advise_indexes(self.WORKLOAD, task_engine, runs=1)
+
+        assert not any(ix["column_names"][0] == "title" for ix in inspect(task_engine).get_indexes("task"))
+
+    def test_skips_unreplayable_statements(self, task_engine):
+        """Test that missing tables and parameters are reported, not raised"""
+        workload = [
+            {"statement": "SELECT * FROM missing", "params": [], "count": 1},
+            {"statement": "SELECT * FROM task WHERE id = ?", "params": [], "count": 1},
+            {"statement": "BEGIN", "params": [], "count": 5},
+        ]
+        result = DatabaseOptimizerSkill().advise_indexes(workload, task_engine)
+
+        assert result["replayed"] == 0
+        assert len(result["skipped"]) == 2
+        assert result["candidates"] == []
+
+
+class TestSQLModelScanner:
+    """Test the AST scanner for SQLModel access patterns"""
+
+    def test_detects_queries_and_commits_in_loops(self):
+        """Test N+1 queries and per-item commits with their lines"""
+        code = (
+            "def load(session, ids):\n"
+            "    for task_id in ids:\n"
+            "        task = session.get(Task, task_id)\n"
+            "        session.commit()\n"
+            "    return [session.exec(select(Task).where(Task.id == i)).one() for i in ids]\n"
+        )
+        result = DatabaseOptimizerSkill().analyze_sqlmodel_code(code)
+        found = [(r["type"], r["line"]) for r in result["recommendations"] if "line" in r]
+
+        assert found == [("n_plus_one", 3), ("commit_in_loop", 4), ("n_plus_one", 5)]
+
+    def test_detects_python_filtering(self):
+        """Test rows loaded with .all() and filtered or counted in Python"""
+        code = (
+            "def todo(session):\n"
+            "    tasks = session.exec(select(Task)).all()\n"
+            "    total = len(session.execute(select(Task)).scalars().all())\n"
+            "    return [t for t in tasks if t.status == 'todo'], total\n"
+        )
+        result = DatabaseOptimizerSkill().analyze_sqlmodel_code(code)
+        found = [(r["type"], r["line"]) for r in result["recommendations"] if "line" in r]
+
+        assert found == [("python_filtering", 3), ("python_filtering", 4)]
+
+    def test_ignores_batches_and_bounded_loops(self):
+        """Test that batch loops, fixed-size loops and per-item sessions are not reported"""
+        code = (
+            "def archive(session, engine, operations):\n"
+            "    while True:\n"
+            "        ids = session.exec(select(Task.id).limit(500)).all()\n"
+            "        session.commit()\n"
+            "        if len(ids) < 500:\n"
+            "            break\n"
+            "    for model in (Task, TaskArchive):\n"
+            "        session.exec(select(model)).all()\n"
+            "    for operation in operations:\n"
+            "        with Session(engine) as own:\n"
+            "            operation(own)\n"
+            "            own.commit()\n"
+        )
+        result = DatabaseOptimizerSkill().analyze_sqlmodel_code(code)
+
+        assert not any("line" in r for r in result["recommendations"])
+
+    def test_detects_per_item_while_loop(self):
+        """Test that a while loop fetching one item per iteration is reported"""
+        code = (
+            "def drain(session, queue):\n"
+            "    while queue:\n"
+            "        task = session.get(Task, queue.pop())\n"
+            "        session.commit()\n"
+        )
+        result = DatabaseOptimizerSkill().analyze_sqlmodel_code(code)
+        found = [(r["type"], r["line"]) for r in result["recommendations"] if "line" in r]
+
+        assert found == [("n_plus_one", 3), ("commit_in_loop", 4)]
+
+    def test_unparsable_files_do_not_stop_the_scan(self, tmp_path, monkeypatch):
+        """Test a file ast.parse rejects with ValueError is reported and the scan goes on"""
+        import ast
+
+        (tmp_path / "a_nulls.py").write_bytes(b"def f(session):\n    session.get(Task, 1)\x00\n")
+        (tmp_path / "b_loop.py").write_text("def load(session, ids):\n    return [session.get(Task, i) for i in ids]\n")
+        parse = ast.parse
+
+        def strict_parse(source, *args, **kwargs):
+            if "\x00" in source:
+                raise ValueError("source code string cannot contain null bytes")
+            return parse(source, *args, **kwargs)
+
+        monkeypatch.setattr(ast, "parse", strict_parse)
+        result = DatabaseOptimizerSkill().scan_codebase(str(tmp_path))
+
+        assert [os.path.basename(e["file"]) for e in result["errors"]] == ["a_nulls.py"]
+        assert result["by_type"] == {"n_plus_one": 1}
+
+    def test_scan_codebase_in_parallel(self, tmp_path):
+        """Test scanning a package with a process pool"""
+        package = tmp_path / "pkg"
+        package.mkdir()
+        for i in range(6):
+            (package / f"module_{i}.py").write_text(
+                "def load(session, ids):\n    return [session.get(Task, i) for i in ids]\n"
+            )
+        (package / "broken.py").write_text("def broken(session:\n    session.get(Task, 1)\n")
+        (package / "plain.py").write_text("def plain(:\n")
+
+        optimizer = DatabaseOptimizerSkill()
+        serial = optimizer.scan_codebase(str(package))
+        parallel = optimizer.scan_codebase(str(package), max_workers=2)
+
+        assert serial["files_scanned"] == 8
+        assert serial["by_type"] == {"n_plus_one": 6}
+        # Files that never touch a session are not parsed
+        assert [os.path.basename(e["file"]) for e in serial["errors"]] == ["broken.py"]
+        assert parallel["findings"] == serial["findings"]
+
+
 class TestTestGeneratorSkill:
     """Test Test Generator Skill"""
 
@@ -155,17 +611,35 @@ class TestStandupReporterSkill:
         assert result["in_progress_count"] == 1
         assert "Daily Standup Report" in result["report"]
 
+    def test_blocked_tasks_come_from_tags(self):
+        """Test blocked tasks are detected by tag, since it is not a status"""
+        reporter = StandupReporterSkill()
+        tasks = [
+            {"title": "Waiting on API keys", "status": "in_progress", "tags": "Blocked,infra"},
+            {"title": "Old blocker", "status": "cancelled", "tags": "blocked"},
+            {"title": "Write tests", "status": "in_progress", "tags": None},
+        ]
+
+        result = reporter.generate_from_task_list(tasks)
+
+        assert result["blockers_count"] == 1
+        assert result["in_progress_count"] == 1
+        assert "Waiting on API keys" in result["report"].split("Blockers:")[1]
+
     def test_format_report(self):
         """Test report formatting"""
         reporter = StandupReporterSkill()
-        reporter.report["yesterday"] = ["Task 1", "Task 2"]
-        reporter.report["blockers"] = ["No blockers"]
+        report = reporter.builder.build(datetime(2024, 5, 10).date(), ["Task 1", "Task 2"], [], [])
 
-        formatted = reporter._format_report()
+        formatted = reporter.builder.render(report)
 
         assert "Yesterday:" in formatted
         assert "Today:" in formatted
         assert "Blockers:" in formatted
+        assert "   • No blockers" in formatted
+        summary = reporter.builder.render_text(report, "Commit Summary", "Highlights")
+        assert summary.startswith("📅 Commit Summary - 2024-05-10")
+        assert "Highlights:" in summary
 
     def test_clean_commit_message(self):
         """Test cleaning commit messages"""
@@ -178,6 +652,248 @@ class TestStandupReporterSkill:
         assert cleaned == "New feature"
 
 
+class TestStandupBatch:
+    """Test the stateless report builder and batch generation"""
+
+    def _tasks_by_user(self, day):
+        completed_at = datetime.combine(day - timedelta(days=1), datetime.min.time()).isoformat()
+        return {
+            f"user{i}": [
+                {"title": f"Shipped {i}", "status": "completed", "updated_at": completed_at},
+                {"title": f"Building {i}", "status": "in_progress", "tags": "blocked" if i % 2 else None},
+            ]
+            for i in range(12)
+        }
+
+    def test_render_formats(self):
+        """Test one report renders as text, Markdown and NDJSON"""
+        import json
+        from app.skills.standup_builder import StandupReportBuilder
+
+        builder = StandupReportBuilder()
+        report = builder.build(datetime(2024, 5, 10).date(), ["Shipped login"], [], ["Waiting on keys"], user="ana")
+
+        text = builder.render(report)
+        assert text.startswith("📅 Daily Standup Report (ana) - 2024-05-10")
+        assert "   • Continue ongoing tasks" in text
+        assert "### Blockers\n\n- Waiting on keys" in builder.render(report, "markdown")
+        assert json.loads(builder.render(report, "ndjson"))["yesterday"] == ["Shipped login"]
+        with pytest.raises(ValueError):
+            builder.render(report, "html")
+
+    def test_batch_streams_every_user(self):
+        """Test pooled batch output matches inline output"""
+        import json
+
+        day = datetime(2024, 5, 10).date()
+        reporter = StandupReporterSkill()
+        tasks_by_user = self._tasks_by_user(day)
+
+        inline = list(reporter.generate_batch(tasks_by_user, day, max_workers=1))
+        pooled = list(reporter.generate_batch(tasks_by_user, day, max_workers=2))
+
+        assert sorted(inline) == sorted(pooled)
+        assert all(line.endswith("\n") for line in pooled)
+        reports = {r["user"]: r for r in map(json.loads, pooled)}
+        assert len(reports) == 12
+        assert reports["user1"]["blockers"] == ["Building 1"]
+        assert reports["user2"]["today"] == ["Building 2"]
+        assert reports["user2"]["yesterday"] == ["Shipped 2"]
+
+        markdown = "".join(reporter.generate_batch(tasks_by_user, day, fmt="markdown", max_workers=1))
+        assert markdown.count("## user") == 12
+
+
+class TestMultiRepoStandup:
+    """Test concurrent git standup collection"""
+
+    def test_reports_are_merged_per_author(self, tmp_path):
+        """Test commits from several repos are grouped by author"""
+        day = (datetime.now() - timedelta(days=1)).replace(hour=12, minute=0, second=0, microsecond=0)
+        api = _git_repo(tmp_path, "api", "Ana", [
+            ("Ana", day - timedelta(days=3), "old work"),
+            ("Ana", day, "feat: add login"),
+            ("Bo (ops)", day, "fix: WIP deploy script"),
+        ])
+        web = _git_repo(tmp_path, "web", "Bo (ops)", [
+            ("Ana", day, "Update navbar"),
+            ("Bo (ops)", day, "Tune cache headers"),
+        ])
+
+        result = StandupReporterSkill().generate_team_reports(
+            [api, web, str(tmp_path / "missing")], day=day.date()
+        )
+
+        assert sorted(result["reports"]) == ["Ana", "Bo (ops)"]
+        assert result["reports"]["Ana"]["total_commits"] == 2
+        assert result["reports"]["Ana"]["repositories"] == ["api", "web"]
+        assert result["total_commits"] == 4
+        assert "Add login (api)" in result["reports"]["Ana"]["report"]
+        assert "Potential blocker" in result["reports"]["Bo (ops)"]["report"]
+        assert [e["repo"] for e in result["errors"]] == [str(tmp_path / "missing")]
+
+        mine = StandupReporterSkill().generate_team_reports([api, web], day=day.date(), current_user=True)
+        assert {a: r["total_commits"] for a, r in mine["reports"].items()} == {"Ana": 1, "Bo (ops)": 1}
+
+    def test_yesterday_commits_filter_by_configured_author(self, tmp_path):
+        """Test the author filter uses the resolved user.name, not a literal $(...)"""
+        yesterday = (datetime.now() - timedelta(days=1)).replace(hour=12, minute=0, second=0, microsecond=0)
+        repo = _git_repo(tmp_path, "svc", "Ana", [
+            ("Ana", yesterday, "Mine"),
+            ("Bo", yesterday, "Theirs"),
+        ])
+
+        assert StandupReporterSkill()._get_yesterday_commits(repo) == ["Mine"]
+
+    def test_timeout_is_reported(self, tmp_path):
+        """Test a repository exceeding the timeout is reported as an error"""
+        import asyncio
+        from app.skills.git_collector import GitCommitCollector
+
+        repo = _git_repo(tmp_path, "slow", "Ana", [])
+        result = asyncio.run(GitCommitCollector(timeout=0).collect([repo], datetime.now().date()))
+
+        assert result["commits"] == []
+        assert "timed out" in result["errors"][0]["error"]
+
+
+class TestCommitPipeline:
+    """Test the streaming commit pipeline"""
+
+    def test_combined_blocker_matcher(self):
+        """Test one pattern flags the same messages as the keyword list"""
+        from app.skills.standup_reporter import BLOCKER_KEYWORDS, BLOCKER_PATTERN
+
+        for message in ["WIP: draft", "Fix the Bug", "tissue paper", "Ship it", "FIXME later", ""]:
+            expected = any(keyword in message.lower() for keyword in BLOCKER_KEYWORDS)
+            assert (BLOCKER_PATTERN.search(message) is not None) == expected
+
+    def test_weekly_summary(self, tmp_path):
+        """Test a date range is summarized in one streaming pass"""
+        base = datetime.now().replace(hour=12, minute=0, second=0, microsecond=0) - timedelta(days=10)
+        commits = [("Ana", base, "old")] + [
+            ("Ana" if i % 3 else "Bo", base + timedelta(days=4 + i % 5), f"feat: change {i}")
+            for i in range(25)
+        ] + [("Bo", base + timedelta(days=9), "WIP: blocked on review")]
+        repo = _git_repo(tmp_path, "svc", "Ana", commits)
+
+        result = StandupReporterSkill().generate_summary(
+            repo, since=(base + timedelta(days=3)).date(), until=(base + timedelta(days=9)).date(), max_items=5
+        )
+
+        assert result["total_commits"] == 26
+        assert result["blockers_count"] == 1
+        assert result["commits_by_author"] == {"Ana": 16, "Bo": 10}
+        assert "...and 21 more commit(s)" in result["report"]
+        assert "Commit Summary" in result["report"]
+
+    def test_stream_can_stop_early(self, tmp_path):
+        """Test closing the stream early stops git cleanly"""
+        from app.skills.git_collector import iter_git_log
+
+        now = datetime.now().replace(microsecond=0)
+        repo = _git_repo(tmp_path, "svc", "Ana", [("Ana", now, f"Commit {i}") for i in range(5)])
+
+        stream = iter_git_log(repo, now.date())
+        assert next(stream)["subject"] == "Commit 4"
+        stream.close()
+
+        assert StandupReporterSkill().generate_summary(str(tmp_path / "missing")).get("error")
+
+
+class TestCommitCache:
+    """Test the HEAD-keyed commit cache"""
+
+    def _drive(self, steps):
+        """Run read_commits steps, recording the git subcommands used"""
+        import subprocess
+
+        commands = []
+        try:
+            command = next(steps)
+            while True:
+                commands.append(command[3])
+                result = subprocess.run(command, capture_output=True, text=True)
+                command = steps.send((result.returncode, result.stdout, result.stderr))
+        except StopIteration as done:
+            return [c["subject"] for c in done.value], commands
+
+    def test_disk_cache_evicts_least_recently_used(self, tmp_path):
+        """Test entries over the count or size limit are evicted LRU first"""
+        from app.skills.disk_cache import DiskCache
+
+        cache = DiskCache(str(tmp_path / "cache.sqlite3"), max_entries=2)
+        cache.set("a", {"n": 1})
+        cache.set("b", [1, 2])
+        assert cache.get("a") == {"n": 1}
+        cache.set("c", "x")
+
+        assert cache.get("b") is None
+        assert cache.stats()["evictions"] == 1
+        assert DiskCache(str(tmp_path / "cache.sqlite3")).get("c") == "x"
+
+        small = DiskCache(str(tmp_path / "small.sqlite3"), max_bytes=10)
+        small.set("big", "x" * 20)
+        assert small.stats()["entries"] == 0
+
+    def test_disk_cache_usage_tracks_writes(self, tmp_path):
+        """Test the stored entry count and size follow replaces, deletes and other processes' writes"""
+        from app.skills.disk_cache import DiskCache
+
+        path = str(tmp_path / "cache.sqlite3")
+        cache, other = DiskCache(path, max_bytes=12), DiskCache(path, max_bytes=12)
+        cache.set("a", "xxxx")
+        cache.set("a", "xx")
+        other.set("b", "yyy")
+        assert cache.stats()["entries"] == 2
+        assert cache.stats()["bytes"] == len('"xx"') + len('"yyy"')
+
+        cache.set("c", "zzzz")
+        assert cache.get("a") is None
+        cache.delete("b")
+        assert other.stats()["entries"] == 1
+        assert other.stats()["bytes"] == len('"zzzz"')
+        other.clear()
+        assert (cache.stats()["entries"], cache.stats()["bytes"]) == (0, 0)
+
+    def test_unchanged_head_costs_one_rev_parse(self, tmp_path):
+        """Test a repeat read is served from the cache and extended incrementally"""
+        import subprocess
+        from app.skills.disk_cache import DiskCache
+        from app.skills.git_collector import CommitCache, read_commits
+
+        now = datetime.now().replace(microsecond=0)
+        repo = _git_repo(tmp_path, "svc", "Ana", [("Ana", now, "First"), ("Ana", now, "Second")])
+        cache = CommitCache(DiskCache(str(tmp_path / "commits.sqlite3")))
+
+        assert self._drive(read_commits(repo, now.date(), [], cache)) == (["Second", "First"], ["rev-parse", "log"])
+        assert self._drive(read_commits(repo, now.date(), [], cache)) == (["Second", "First"], ["rev-parse"])
+
+        _git_repo_commit(repo, "Ana", now, "Third")
+        subjects, commands = self._drive(read_commits(repo, now.date(), [], cache))
+        assert subjects == ["Third", "Second", "First"]
+        assert commands == ["rev-parse", "merge-base", "log"]
+
+        subprocess.run(["git", "-C", repo, "reset", "-q", "--hard", "HEAD~2"], check=True)
+        _git_repo_commit(repo, "Ana", now, "Rewritten")
+        subjects, _ = self._drive(read_commits(repo, now.date(), [], cache))
+        assert subjects == ["Rewritten", "First"]
+
+    def test_skill_uses_cache(self, tmp_path):
+        """Test the reporter reads through an injected cache"""
+        from app.skills.disk_cache import DiskCache
+        from app.skills.git_collector import CommitCache
+
+        yesterday = (datetime.now() - timedelta(days=1)).replace(hour=12, minute=0, second=0, microsecond=0)
+        repo = _git_repo(tmp_path, "svc", "Ana", [("Ana", yesterday, "Cached work")])
+        cache = CommitCache(DiskCache(str(tmp_path / "commits.sqlite3")))
+        reporter = StandupReporterSkill(commit_cache=cache)
+
+        assert reporter._get_yesterday_commits(repo) == ["Cached work"]
+        assert reporter._get_yesterday_commits(repo) == ["Cached work"]
+        assert cache.cache.stats()["hits"] == 1
+
+
 class TestTaskPrioritizerSkill:
     """Test Task Prioritizer Skill"""
 
@@ -292,3 +1008,371 @@ class TestTaskPrioritizerSkill:
         assert prioritizer._is_overdue(future_date) is False
 
         assert prioritizer._is_overdue(None) is False
+
+
+class TestBatchPriorityScorer:
+    """Test the columnar batch scoring engine"""
+
+    def _tasks(self):
+        now = datetime.now()
+        offsets = [-3, 0, 1, 2, 5, 10, 30]
+        tasks = []
+        for i, days in enumerate(offsets * 3):
+            due = now + timedelta(days=days, hours=12)
+            tasks.append({
+                "id": i,
+                "title": f"Task {i}",
+                "priority": ["low", "medium", "high", "urgent", "weird"][i % 5],
+                "status": "in_progress" if i % 4 == 0 else "todo",
+                "due_date": [due.isoformat(), due, due.astimezone().isoformat(), None][i % 4],
+                "tags": ["urgent,critical", "blocked", "", None][i % 4],
+                "description": ["ASAP before the deadline", "", None][i % 3],
+            })
+        tasks.append({"id": 99, "title": "Bad date", "due_date": "not-a-date"})
+        return tasks
+
+    @pytest.mark.parametrize("use_numpy", [True, False])
+    def test_matches_scalar_scores(self, use_numpy):
+        """Test batch scores equal the per-task scorer exactly"""
+        from app.skills.task_scoring import BatchPriorityScorer, np
+
+        if use_numpy and np is None:
+            pytest.skip("NumPy not installed")
+
+        prioritizer = TaskPrioritizerSkill()
+        tasks = self._tasks()
+
+        expected = [prioritizer._calculate_priority_score(t) for t in tasks]
+        scores = BatchPriorityScorer(prioritizer.priority_scores, use_numpy=use_numpy).score(tasks)
+
+        assert scores == expected
+
+    def test_shared_scorer_matches_skill(self):
+        """Test the scorer the priority index uses agrees with the skill"""
+        from app.models.scoring import score_task
+
+        prioritizer = TaskPrioritizerSkill()
+        now = datetime.now()
+
+        for task in self._tasks():
+            assert score_task(task, now) == prioritizer._calculate_priority_score(task, now)
+
+    def test_score_tasks(self):
+        """Test the skill exposes batch scoring"""
+        prioritizer = TaskPrioritizerSkill()
+        assert prioritizer.score_tasks([]) == []
+        assert prioritizer.score_tasks([{"priority": "urgent", "status": "in_progress"}]) == [120.0]
+
+
+class TestTopKPrioritization:
+    """Test streaming top-k prioritization"""
+
+    def _tasks(self):
+        now = datetime.now()
+        return [
+            {
+                "id": i,
+                "title": f"Task {i}",
+                "priority": ["low", "medium", "high", "urgent"][i % 4],
+                "status": "in_progress" if i % 5 == 0 else "todo",
+                "due_date": (now + timedelta(days=(i % 7) - 2, hours=12)).isoformat() if i % 3 else None,
+                "tags": "blocked" if i % 6 == 0 else "",
+            }
+            for i in range(40)
+        ]
+
+    def test_matches_full_prioritization(self):
+        """Test top-k equals the head of the full sort, ties included"""
+        prioritizer = TaskPrioritizerSkill()
+        tasks = self._tasks()
+
+        full = prioritizer.prioritize_tasks(tasks)
+        top = prioritizer.prioritize_top_k(iter(tasks), k=7)
+
+        assert top["prioritized_tasks"] == full["prioritized_tasks"][:7]
+        assert top["recommendations"] == full["recommendations"]
+        assert top["total_tasks"] == len(tasks)
+
+    def test_counters_from_single_pass(self):
+        """Test counters are collected while streaming"""
+        prioritizer = TaskPrioritizerSkill()
+        result = prioritizer.prioritize_top_k((t for t in self._tasks()), k=3)
+
+        assert len(result["prioritized_tasks"]) == 3
+        assert result["counters"]["in_progress"] == 8
+        assert result["counters"]["blocked"] == 7
+        assert result["counters"]["urgent_high"] == 20
+
+    def test_empty_input(self):
+        """Test an empty stream"""
+        result = TaskPrioritizerSkill().prioritize_top_k([], k=5)
+        assert result["prioritized_tasks"] == []
+        assert result["recommendations"] == ["No tasks to prioritize"]
+
+
+class TestSinglePassPrioritization:
+    """Test prioritization against one shared reference clock"""
+
+    def test_reference_clock_is_shared(self):
+        """Test scores and overdue flags use the supplied clock"""
+        prioritizer = TaskPrioritizerSkill()
+        now = datetime(2024, 3, 10, 9, 0)
+        tasks = [
+            {"id": 1, "title": "Due in an hour", "priority": "low", "due_date": "2024-03-10T10:00:00"},
+            {"id": 2, "title": "Due an hour ago", "priority": "low", "due_date": "2024-03-10T08:00:00"},
+            {"id": 3, "title": "Due in two weeks", "priority": "high", "due_date": "2024-03-24T09:00:00"},
+        ]
+
+        result = prioritizer.prioritize_tasks(tasks, now=now)
+        scores = {t["id"]: t["priority_score"] for t in result["prioritized_tasks"]}
+
+        assert scores == {1: 25 + 45, 2: 25 + 50, 3: 75 + 10}
+        assert "1 overdue task(s)" in result["recommendations"][1]
+        assert prioritizer._is_overdue(tasks[1]["due_date"], now=now) is True
+        assert prioritizer._calculate_urgency_score(tasks[0]["due_date"], now=now) == 45
+
+    def test_aware_and_naive_due_dates(self):
+        """Test timezone-aware due dates are compared on the same instant"""
+        from datetime import timezone
+
+        prioritizer = TaskPrioritizerSkill()
+        now = datetime(2024, 3, 10, 12, 0, tzinfo=timezone.utc)
+        task = {"title": "Aware", "priority": "medium", "due_date": "2024-03-10T11:00:00Z"}
+
+        assert prioritizer._calculate_priority_score(task, now=now) == 100
+
+    def test_score_with_transition(self):
+        """Test the next urgency bucket boundary is reported"""
+        prioritizer = TaskPrioritizerSkill()
+        now = datetime(2024, 3, 1, 12, 0)
+        due = datetime(2024, 3, 20, 12, 0)
+
+        score, transition = prioritizer.score_with_transition({"priority": "low", "due_date": due}, now=now)
+        assert score == 30
+        assert transition == due - timedelta(days=15)
+
+        _, transition = prioritizer.score_with_transition({"due_date": due}, now=due + timedelta(hours=1))
+        assert transition is None
+        assert prioritizer.score_with_transition({"priority": "low"}, now=now) == (25, None)
+
+
+class TestTaskScheduling:
+    """Test dependency-aware scheduling"""
+
+    def _tasks(self):
+        return [
+            {"id": 1, "title": "Design", "priority": "medium", "effort_hours": 2},
+            {"id": 2, "title": "Backend", "priority": "medium", "effort_hours": 5},
+            {"id": 3, "title": "Frontend", "priority": "medium", "effort_hours": 3},
+            {"id": 4, "title": "Release", "priority": "medium", "effort_hours": 1},
+            {"id": 5, "title": "Docs", "priority": "low"},
+        ]
+
+    def test_topological_order_and_critical_path(self):
+        """Test tasks follow their dependencies and the longest chain is critical"""
+        dependencies = [(2, 1), (3, 1), (4, 2), (4, 3), (4, 99)]
+        result = TaskPrioritizerSkill().schedule_tasks(self._tasks(), dependencies)
+
+        order = [t["id"] for t in result["schedule"]]
+        assert order.index(1) < order.index(2) < order.index(4)
+        assert order.index(3) < order.index(4)
+        assert result["status"] == "scheduled"
+        assert result["total_dependencies"] == 4
+        assert result["critical_path"] == [1, 2, 4]
+        assert result["project_duration"] == 8
+
+        by_id = {t["id"]: t for t in result["schedule"]}
+        assert by_id[3]["slack"] == 2
+        assert by_id[3]["earliest_start"] == 2
+        assert by_id[3]["latest_start"] == 4
+        assert by_id[5]["slack"] == 7
+        assert by_id[4]["ready"] is False
+
+    def test_topological_ties_follow_input_order(self):
+        """Test roots keep id order and released tasks keep dependency order, duplicates included"""
+        from app.skills.task_scheduling import DependencyGraph
+
+        dependencies = [(5, 0), (2, 0), (7, 0), (2, 0), (3, 0), (9, 0), (8, 0)]
+        graph = DependencyGraph(list(range(10)), dependencies)
+
+        assert graph.edge_count == 6
+        assert graph.topological_order() == [0, 1, 4, 6, 5, 2, 7, 3, 9, 8]
+
+    def test_blocking_tasks_gain_priority(self):
+        """Test tasks that block others are scored higher"""
+        tasks = self._tasks()
+        result = TaskPrioritizerSkill().schedule_tasks(tasks, [(2, 1), (3, 1), (4, 2), (4, 3)])
+        base = TaskPrioritizerSkill()._calculate_priority_score(tasks[0])
+        by_id = {t["id"]: t for t in result["schedule"]}
+
+        assert by_id[1]["blocks"] == 2
+        assert by_id[1]["priority_score"] > by_id[3]["priority_score"] > base
+
+    def test_cycles_are_reported(self):
+        """Test cycle members and their dependents are left unscheduled"""
+        dependencies = [(2, 1), (3, 2), (2, 3), (4, 3)]
+        result = TaskPrioritizerSkill().schedule_tasks(self._tasks(), dependencies)
+
+        assert result["status"] == "cycle_detected"
+        assert result["cycles"] == [[2, 3]]
+        assert sorted(result["unschedulable"]) == [2, 3, 4]
+        assert [t["id"] for t in result["schedule"]] == [1, 5]
+
+    def test_long_chain_does_not_recurse(self):
+        """Test deep graphs are handled without hitting the recursion limit"""
+        n = 20000
+        tasks = [{"id": i, "title": f"Task {i}"} for i in range(n)]
+        dependencies = [(i + 1, i) for i in range(n - 1)] + [(0, n - 1)]
+        result = TaskPrioritizerSkill().schedule_tasks(tasks, dependencies)
+
+        assert len(result["cycles"]) == 1
+        assert len(result["cycles"][0]) == n
+
+
+class TestPartitionedPrioritization:
+    """Test parallel prioritization of independent task sets"""
+
+    def _tasks(self):
+        return [
+            {"id": i, "title": f"Task {i}", "team": f"team-{i % 3}",
+             "priority": ["low", "medium", "high", "urgent"][i % 4],
+             "status": "in_progress" if i % 5 == 0 else "todo",
+             "tags": "bug,urgent" if i % 2 else "feature"}
+            for i in range(30)
+        ]
+
+    def test_partition_tasks(self):
+        """Test tasks are grouped by field, tag or key function"""
+        tasks = self._tasks()
+        by_team = TaskPrioritizerSkill.partition_tasks(tasks)
+        by_tag = TaskPrioritizerSkill.partition_tasks(tasks, by="tags")
+        by_parity = TaskPrioritizerSkill.partition_tasks(tasks, by=lambda t: t["id"] % 2)
+
+        assert sorted(by_team) == ["team-0", "team-1", "team-2"]
+        assert sorted(by_tag) == ["bug", "feature", "urgent"]
+        assert len(by_tag["bug"]) == 15
+        assert len(by_parity[0]) == 15
+
+    def test_matches_serial_prioritization(self):
+        """Test pooled results equal prioritize_tasks on each partition"""
+        prioritizer = TaskPrioritizerSkill()
+        now = datetime.now()
+        partitions = prioritizer.partition_tasks(self._tasks())
+
+        for max_workers in (1, 2):
+            results = dict(prioritizer.prioritize_partitions(
+                partitions, max_workers=max_workers, chunk_size=1, now=now
+            ))
+            assert sorted(results) == sorted(partitions)
+            for key, tasks in partitions.items():
+                assert results[key] == prioritizer.prioritize_tasks(tasks, now)
+
+    def test_workers_use_custom_priority_scores(self):
+        """Test pooled workers score with the caller's priority weights"""
+        prioritizer = TaskPrioritizerSkill()
+        prioritizer.priority_scores = {"low": 90, "medium": 10, "high": 40, "urgent": 60}
+        now = datetime.now()
+        partitions = prioritizer.partition_tasks(self._tasks())
+
+        results = dict(prioritizer.prioritize_partitions(partitions, max_workers=2, chunk_size=1, now=now))
+
+        for key, tasks in partitions.items():
+            assert results[key] == prioritizer.prioritize_tasks(tasks, now)
+        top = results["team-0"]["prioritized_tasks"][0]
+        assert top["priority"] == "low"
+
+
+class TestCapacityPlanning:
+    """Test the effort-aware daily capacity planner"""
+
+    def test_knapsack_is_optimal(self):
+        """Test the exact solver matches brute force on small instances"""
+        import itertools
+        import random
+        from app.skills.task_scheduling import select_within_capacity
+
+        rng = random.Random(3)
+        for _ in range(50):
+            n = rng.randint(1, 8)
+            values = [rng.randint(-5, 40) for _ in range(n)]
+            weights = [rng.randint(0, 10) for _ in range(n)]
+            capacity = rng.randint(0, 20)
+
+            best = max(
+                sum(values[i] for i in subset)
+                for r in range(n + 1)
+                for subset in itertools.combinations(range(n), r)
+                if sum(weights[i] for i in subset) <= capacity
+            )
+            result = select_within_capacity(values, weights, capacity)
+            assert result["method"] == "knapsack"
+            assert result["value"] == best
+            assert result["weight"] <= capacity
+            assert result["upper_bound"] >= best
+
+    def test_greedy_fallback_respects_bound(self):
+        """Test large instances fall back to greedy within the LP bound"""
+        from app.skills.task_scheduling import select_within_capacity
+
+        values = [10, 9, 8, 30]
+        weights = [1, 1, 1, 10]
+        result = select_within_capacity(values, weights, 10, cell_limit=1)
+
+        assert result["method"] == "greedy"
+        assert result["chosen"] == [3]
+        assert result["value"] <= result["upper_bound"]
+
+    def test_effort_changes_the_plan(self):
+        """Test short tasks are preferred over one long task of similar score"""
+        tasks = [
+            {"id": 1, "title": "Big migration", "priority": "urgent", "effort_hours": 16},
+            {"id": 2, "title": "Fix typo", "priority": "medium", "effort_hours": 0.25},
+            {"id": 3, "title": "Review PR", "priority": "high", "effort_hours": 1},
+            {"id": 4, "title": "Write report", "priority": "high", "effort_hours": 6},
+            {"id": 5, "title": "Done", "priority": "urgent", "status": "completed", "effort_hours": 1},
+        ]
+        result = TaskPrioritizerSkill().plan_daily_capacity(tasks, capacity_hours=8)
+
+        plan = result["plans"][0]
+        assert [t["id"] for t in plan["tasks"]] == [3, 4, 2]
+        assert plan["planned_hours"] == 7.25
+        assert result["deferred_tasks"] == 1
+        assert result["capacity_assessment"].startswith("⚠️")
+
+    def test_per_assignee_capacity(self):
+        """Test each assignee is planned against their own capacity"""
+        tasks = [
+            {"id": i, "title": f"Task {i}", "assignee": ["ana", "bo"][i % 2], "effort_hours": 2}
+            for i in range(10)
+        ]
+        result = TaskPrioritizerSkill().plan_daily_capacity(tasks, capacities={"ana": 4, "bo": 8})
+        planned = {plan["assignee"]: len(plan["tasks"]) for plan in result["plans"]}
+
+        assert planned == {"ana": 2, "bo": 4}
+        assert result["total_planned_hours"] == 12
+
+
+def _git_repo(tmp_path, name, user, commits):
+    import subprocess
+
+    path = tmp_path / name
+    path.mkdir()
+    subprocess.run(["git", "init", "-q", str(path)], check=True)
+    subprocess.run(["git", "-C", str(path), "config", "user.name", user], check=True)
+    subprocess.run(["git", "-C", str(path), "config", "user.email", f"{user}@example.com"], check=True)
+    for author, when, message in commits:
+        _git_repo_commit(path, author, when, message)
+    return str(path)
+
+
+def _git_repo_commit(path, author, when, message):
+    import os
+    import subprocess
+
+    env = {
+        "GIT_AUTHOR_NAME": author, "GIT_AUTHOR_EMAIL": "a@example.com",
+        "GIT_COMMITTER_NAME": author, "GIT_COMMITTER_EMAIL": "a@example.com",
+        "GIT_AUTHOR_DATE": when.isoformat(), "GIT_COMMITTER_DATE": when.isoformat(),
+        "PATH": os.environ["PATH"],
+    }
+    subprocess.run(["git", "-C", str(path), "commit", "-q", "--allow-empty", "-m", message], check=True, env=env)